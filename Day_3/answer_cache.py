@@ -0,0 +1,115 @@
+import re
+import time
+import threading
+import numpy as np
+from collections import OrderedDict
+from langchain_core.embeddings import Embeddings
+from typing import NamedTuple, Optional, Tuple
+
+TTL_SECONDS = 24 * 60 * 60
+MAX_ENTRIES = 1000
+SIMILARITY_THRESHOLD = 0.92
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip().strip("?!. ").lower()
+
+
+class CacheEntry(NamedTuple):
+    answer: str
+    vector: Optional[np.ndarray]
+    expires_at: float
+
+
+class AnswerCache:
+    """
+    Answers keyed by (document hash, normalized question, normalized history), with two tiers:
+    an exact match on the key, then an embedding-similarity match on the question among entries
+    for the same document and history. Entries expire after `ttl` seconds and the least recently
+    used ones are evicted beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        embeddings: Optional[Embeddings] = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: float = TTL_SECONDS,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _embed(self, question: str) -> Optional[np.ndarray]:
+        if self.embeddings is None:
+            return None
+
+        # embed_documents rather than embed_query: it goes through CachedEmbeddings, so the
+        # vector computed on lookup is reused for free when the answer is stored
+        vector = np.asarray(self.embeddings.embed_documents([question])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, doc_key: str, question: str, history: str) -> Optional[str]:
+        key = (doc_key, normalize_text(question), normalize_text(history))
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry.answer
+
+        vector = self._embed(key[1]) if self.threshold < 1 else None
+        if vector is not None:
+            with self._lock:
+                candidates = [
+                    (candidate_key, candidate)
+                    for candidate_key, candidate in self._entries.items()
+                    if candidate_key[0] == doc_key and candidate_key[2] == key[2]
+                    and candidate.vector is not None and candidate.expires_at > now
+                ]
+                if candidates:
+                    similarities = np.stack([candidate.vector for _, candidate in candidates]) @ vector
+                    best = int(np.argmax(similarities))
+                    if similarities[best] >= self.threshold:
+                        best_key, best_entry = candidates[best]
+                        self._entries.move_to_end(best_key)
+                        self.semantic_hits += 1
+                        return best_entry.answer
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, doc_key: str, question: str, history: str, answer: str):
+        key = (doc_key, normalize_text(question), normalize_text(history))
+        entry = CacheEntry(answer, self._embed(key[1]), time.time() + self.ttl)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            now = time.time()
+            for expired_key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+                del self._entries[expired_key]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        hits = self.exact_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
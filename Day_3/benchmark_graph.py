@@ -0,0 +1,104 @@
+"""
+Offline benchmark of the PDF RAG graph: fake chat model and embeddings with fixed latency, and a
+synthetic document indexed through the real ingestion, retrieval and answer cache code. What is
+left is the overhead of the graph itself, so runs on different commits can be compared.
+
+    python benchmark_graph.py --sessions 64 --concurrency 8 --model-latency 0.05
+
+Every session streams two turns like the Streamlit UI: a question drawn from a pool of
+--distinct-questions (repeats are answer cache hits), then a follow-up with history.
+"""
+
+import os
+import re
+import json
+import time
+import tempfile
+
+# Nothing below reaches a provider, the key only has to pass the import-time check
+os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "embeddings.sqlite3"))
+
+import main
+import paths
+from common.vector_index import PdfIndex
+from common.ingestion import ingest_documents
+from langchain_core.documents import Document
+from common.numpy_vector_store import NumpyVectorStore
+from common.benchmark_harness import LatencyFakeChatModel, LatencyFakeEmbeddings, benchmark, benchmark_parser
+
+QUESTION = re.compile(r"Question:\s*(.+)")
+TOPICS = [
+    "pricing", "warranty", "installation", "maintenance", "safety", "returns", "shipping", "support",
+    "battery", "charging", "cleaning", "storage", "accessories", "updates", "troubleshooting", "specifications",
+]
+
+
+def fake_reply(prompt: str) -> str:
+    match = QUESTION.search(prompt)
+    question = match.group(1).strip() if match else ""
+    if "Decide if you can answer" in prompt and "document" not in question.lower():
+        return f"Happy to help with that. You asked: {question}"
+    if "Decide if you can answer" in prompt:
+        return "RAG"
+    return f"According to the document, {question.rstrip('?').lower()} is covered in its own section with step by step guidance."
+
+
+def document_chunks(filler_chunks: int):
+    for topic in TOPICS:
+        yield Document(page_content=f"Section on {topic}: the {topic} policy applies for two years, see the {topic} table for details.")
+    for i in range(filler_chunks):
+        yield Document(page_content=f"Page {i}: " + " ".join(f"word{(i * 7 + j) % 997}" for j in range(150)))
+
+
+def install_fakes(args) -> dict:
+    """
+    Swap the chat model, the embeddings and the PDF index for offline fakes. Returns setup timings.
+    """
+
+    model = LatencyFakeChatModel(reply=fake_reply, latency=args.model_latency, token_latency=args.token_latency)
+    embeddings = LatencyFakeEmbeddings(latency=args.embedding_latency)
+    setup = {}
+
+    def open_pdf_index(pdf_path, embeddings):
+        started = time.perf_counter()
+        pdf_index = PdfIndex("benchmark-document", NumpyVectorStore(embeddings))
+        pdf_index.stats = ingest_documents(pdf_index.vector_store, document_chunks(args.document_chunks))
+        pdf_index._finish()
+        setup["index_build_s"] = round(time.perf_counter() - started, 4)
+        setup["index_chunks"] = len(pdf_index.vector_store)
+        return pdf_index
+
+    main.init_chat_model = lambda *_, **__: model
+    main.GoogleGenerativeAIEmbeddings = lambda *_, **__: embeddings
+    main.open_pdf_index = open_pdf_index
+    return setup
+
+
+def run_session(graph, i: int, distinct_questions: int):
+    # Same calls as the Streamlit UI, history included
+    topic = TOPICS[i % distinct_questions % len(TOPICS)]
+    question = f"What does the document say about {topic}?" if i % distinct_questions < len(TOPICS) else f"Hello, question {i % distinct_questions}?"
+
+    result = {}
+    answer = "".join(main.stream_answer(graph, {"question": question, "history": ""}, result))
+    assert result.get("answer"), result
+
+    history = f"user: {question}\nassistant: {answer or result['answer']}"
+    result = {}
+    for _ in main.stream_answer(graph, {"question": f"Thanks, and the {topic} table?", "history": history}, result):
+        pass
+    assert result.get("answer"), result
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser("Offline benchmark of the PDF RAG graph.")
+    parser.add_argument("--document-chunks", type=int, default=200, help="filler chunks indexed next to the topic sections")
+    parser.add_argument("--distinct-questions", type=int, default=24, help="size of the pool first questions are drawn from")
+    args = parser.parse_args()
+
+    setup = install_fakes(args)
+    graph = main.build_pdf_rag_graph("benchmark.pdf")
+
+    report = benchmark("pdf_rag", args, lambda i: run_session(graph, i, args.distinct_questions), extra=setup)
+    print(json.dumps(report, indent=2))
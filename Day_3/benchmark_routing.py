@@ -0,0 +1,47 @@
+"""
+Offline benchmark of the local pre-router against a labelled set of questions about an uploaded PDF.
+Reports how many LLM router calls it saves, how accurate its decisions are and how long they take.
+
+    python benchmark_routing.py
+"""
+
+import json
+import paths
+from routing import PRE_ROUTER
+from common.benchmark_harness import benchmark_pre_router
+
+LABELLED_MESSAGES = [
+    ("What does the document say about the return policy?", "rag"),
+    ("Summarize this PDF in three points", "rag"),
+    ("According to the manual, how often should the filter be replaced?", "rag"),
+    ("What is on page 12?", "rag"),
+    ("Which section covers safety instructions?", "rag"),
+    ("What are the conclusions of the report?", "rag"),
+    ("Is overtime pay mentioned anywhere?", "rag"),
+    ("What does table 3 show?", "rag"),
+    ("How do I reset the device to factory settings?", "rag"),
+    ("What is the warranty period?", "rag"),
+    ("Hi there!", "direct"),
+    ("Thanks a lot", "direct"),
+    ("How are you?", "direct"),
+    ("What is 2 + 2?", "direct"),
+    ("Who was the first president of the United States?", "direct"),
+    ("Can you say that again more simply?", "direct"),
+    ("Tell me a fun fact", "direct"),
+    ("What did I ask you before?", "direct"),
+    ("Translate hello into French", "direct"),
+    ("Good morning", "direct"),
+    # Mention a document noun or task word without being about the upload
+    ("Summarize what you just said", "direct"),
+    ("Can you repeat what you mentioned earlier?", "direct"),
+    ("Can you make a table of the capitals of Europe?", "direct"),
+    ("What is a good file format for images?", "direct"),
+    ("How do I write a research paper?", "direct"),
+    ("tell me a joke about a page boy", "direct"),
+    ("Which chapter of Harry Potter is the best?", "direct"),
+    ("What is a summary of the French revolution?", "direct"),
+]
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_pre_router(PRE_ROUTER, LABELLED_MESSAGES), indent=2))
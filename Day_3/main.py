@@ -1,16 +1,20 @@
 import os
+import paths
 import asyncio
 from dotenv import load_dotenv
+from routing import PRE_ROUTER
+from answer_cache import AnswerCache
+from common.retrieval import HybridRetriever
 from langchain.prompts import PromptTemplate
 from langchain_core.documents import Document
 from typing_extensions import List, TypedDict
 from langchain_openai import OpenAIEmbeddings
+from common.vector_index import open_pdf_index
 from langchain.chat_models import init_chat_model
 from langgraph.graph import START, END, StateGraph
-from langchain_core.vectorstores import InMemoryVectorStore
-from langchain_community.document_loaders import PyPDFLoader
+from common.embedding_cache import CachedEmbeddings
+from common.instrumentation import METRICS, instrument
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 
 load_dotenv()
@@ -23,6 +27,12 @@ if not GOOGLE_API_KEY:
 # if not OPENAI_API_KEY:
 #     raise ValueError("OPENAI_API_KEY not found in environment variables.")
 
+class PdfIndexError(RuntimeError):
+    """
+    Indexing the PDF failed, answers would come from a partial or empty index.
+    """
+
+
 class State(TypedDict):
     route: str
     context: List[Document]
@@ -67,6 +77,39 @@ def format_history(history: str) -> str:
     messages = history.strip().split("\n")
     return "\n".join(messages[-3:])
 
+def stream_answer(graph, inputs: dict, result: dict):
+    """
+    Yield answer tokens as the model produces them. The final graph state is stored in `result`.
+    """
+
+    router_text = ""
+    router_answering = False
+
+    for mode, chunk in graph.stream(inputs, stream_mode=["messages", "values"]):
+        if mode == "values":
+            result.update(chunk)
+            continue
+
+        message, metadata = chunk
+        if not isinstance(message.content, str) or not message.content:
+            continue
+
+        node = metadata.get("langgraph_node")
+        if node == "rag":
+            yield message.content
+        elif node == "llm_router":
+            # The router either answers directly or replies with the single word "RAG":
+            # hold its tokens back until they can no longer spell that word
+            if router_answering:
+                yield message.content
+                continue
+
+            router_text += message.content
+            if not "rag".startswith(router_text.strip().lower()):
+                router_answering = True
+                yield router_text
+
+
 def build_pdf_rag_graph(pdf_path: str):
     try:
         asyncio.get_running_loop()
@@ -75,20 +118,38 @@ def build_pdf_rag_graph(pdf_path: str):
         asyncio.set_event_loop(loop)
 
     model = init_chat_model("gemini-2.5-flash", model_provider="google_genai")
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001")
+    embeddings = CachedEmbeddings(GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001"))
     # model = init_chat_model("gpt-4o-mini", model_provider="openai")
-    # embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    # embeddings = CachedEmbeddings(OpenAIEmbeddings(model="text-embedding-3-small"))
+
+    pdf_index = open_pdf_index(pdf_path, embeddings)
+    retriever = HybridRetriever(pdf_index.vector_store)
+    answer_cache = AnswerCache(embeddings)
+
+    def cache_lookup_node(state: State):
+        answer = answer_cache.get(pdf_index.key, state["question"], format_history(state["history"]))
+        METRICS.record_cache("answer", answer is not None)
+        if answer is not None:
+            state["route"] = "cached"
+            state["answer"] = answer
+        else:
+            state["route"] = "miss"
 
-    loader = PyPDFLoader(pdf_path)
-    docs = loader.load()
+        return state
 
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    all_splits = text_splitter.split_documents(docs)
+    def cache_store_node(state: State):
+        # Answers over a partially indexed PDF may miss pages, don't keep them around
+        if pdf_index.ready and not pdf_index.error:
+            answer_cache.put(pdf_index.key, state["question"], format_history(state["history"]), state["answer"])
 
-    vector_store = InMemoryVectorStore(embeddings)
-    _ = vector_store.add_documents(all_splits)
+        return state
 
     def llm_router_node(state: State):
+        # Questions that clearly refer to the document skip the LLM router
+        if PRE_ROUTER.route(state["question"]) == "rag":
+            state["route"] = "rag"
+            return state
+
         message = llm_router_prompt.invoke({
             "question": state["question"],
             "history": format_history(state["history"])
@@ -106,7 +167,12 @@ def build_pdf_rag_graph(pdf_path: str):
         return state
 
     def rag_node(state: State):
-        retrieved_docs = vector_store.similarity_search(state["question"])
+        # Large PDFs are still being indexed in the background: answer from the pages embedded so far
+        pdf_index.wait_for_chunks()
+        if pdf_index.error:
+            raise PdfIndexError(f"Indexing the PDF failed: {pdf_index.error}") from pdf_index.error
+        with METRICS.timer("retrieval_seconds", source="pdf", mode=retriever.mode):
+            retrieved_docs = retriever.search(state["question"])
         docs_context_content = "\n\n".join(doc.page_content for doc in retrieved_docs)
 
         messages = rag_prompt.invoke({
@@ -120,18 +186,29 @@ def build_pdf_rag_graph(pdf_path: str):
         return state
         
     graph_builder = StateGraph(State)
+    graph_builder.add_node("cache_lookup", cache_lookup_node)
     graph_builder.add_node("llm_router", llm_router_node)
     graph_builder.add_node("rag", rag_node)
+    graph_builder.add_node("cache_store", cache_store_node)
 
-    graph_builder.add_edge(START, "llm_router")
+    graph_builder.add_edge(START, "cache_lookup")
+    graph_builder.add_conditional_edges(
+        "cache_lookup",
+        lambda s: s["route"],
+        {
+            "cached": END,
+            "miss": "llm_router"
+        }
+    )
     graph_builder.add_conditional_edges(
         "llm_router",
         lambda s: s["route"],
         {
             "rag": "rag",
-            "direct": END
+            "direct": "cache_store"
         }
     )
-    graph_builder.add_edge("rag", END)
+    graph_builder.add_edge("rag", "cache_store")
+    graph_builder.add_edge("cache_store", END)
 
-    return graph_builder.compile()
+    return instrument(graph_builder.compile(), "pdf_rag")
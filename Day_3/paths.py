@@ -0,0 +1,11 @@
+"""
+Puts the repository root on sys.path so the shared modules under common/ can be imported,
+whether the app is started from its own directory or from elsewhere.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
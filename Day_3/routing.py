@@ -0,0 +1,51 @@
+import re
+import paths
+from common.pre_router import PreRouter
+
+# Only "rag" can be decided locally: a direct route needs the LLM router's answer anyway.
+# A document noun alone is not enough: "make a table of capitals", "a good file format" and
+# "write a research paper" are general questions, so a rule needs the message to point at the upload.
+DOCUMENT_NOUN = re.compile(
+    r"\b(document|doc|pdf|file|manual|report|paper|brochure|page|section|chapter|table|figure|appendix|clause)s?\b",
+    re.IGNORECASE,
+)
+# "the document", "this pdf", "in the uploaded file", "according to the manual"
+DOCUMENT_REFERENCE = re.compile(
+    r"\b(the|this|that|uploaded|attached)\s+((uploaded|attached)\s+)?(document|doc|pdf|file|manual|report|paper|brochure)s?\b",
+    re.IGNORECASE,
+)
+# "page 12", "table 3", "section 4.2"
+NUMBERED_PART = re.compile(r"\b(page|section|chapter|table|figure|appendix|clause)\s+\d", re.IGNORECASE)
+# "summarize what you just said" is about the chat, a task word counts only next to a document noun
+DOCUMENT_TASK = re.compile(r"\b(according to|summari[sz]e|summary of|mentioned|stated|described|listed|does it say)\b", re.IGNORECASE)
+
+ROUTER_RULES = [
+    ("rag", [DOCUMENT_REFERENCE]),
+    ("rag", [NUMBERED_PART]),
+    ("rag", [DOCUMENT_TASK, DOCUMENT_NOUN]),
+]
+
+ROUTER_EXAMPLES = {
+    "rag": [
+        "what does the document say about pricing",
+        "summarize the pdf",
+        "what is the warranty period in this manual",
+        "which steps are listed for installation",
+        "what are the key findings of the report",
+        "who is the author of the paper",
+        "what is the refund policy",
+        "how do i reset the device",
+    ],
+    "direct": [
+        "hi",
+        "hello there",
+        "thanks",
+        "how are you",
+        "what is the capital of france",
+        "tell me a joke",
+        "what did i just ask you",
+        "can you repeat that",
+    ],
+}
+
+PRE_ROUTER = PreRouter(ROUTER_RULES, ROUTER_EXAMPLES, decisive_labels=["rag"], threshold=0.4, margin=0.2)
@@ -0,0 +1,38 @@
+import os
+import pytest
+import tempfile
+
+# Nothing in the tests reaches a provider, the key only has to pass the import-time check
+os.environ.setdefault("GOOGLE_API_KEY", "offline-tests")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "embeddings.sqlite3"))
+
+import main
+from common.vector_index import PdfIndex
+from common.numpy_vector_store import NumpyVectorStore
+from common.benchmark_harness import LatencyFakeChatModel, LatencyFakeEmbeddings
+
+
+@pytest.fixture
+def embeddings():
+    return LatencyFakeEmbeddings()
+
+
+@pytest.fixture
+def pdf_index(embeddings):
+    """An empty index whose ingestion hasn't finished, the test finishes it."""
+
+    return PdfIndex("test-document", NumpyVectorStore(embeddings))
+
+
+@pytest.fixture
+def build_graph(monkeypatch, embeddings, pdf_index):
+    """Builds the PDF RAG graph over `pdf_index`, with a fake model answering `reply(prompt)`."""
+
+    def build(reply=lambda prompt: "RAG"):
+        model = LatencyFakeChatModel(reply=reply)
+        monkeypatch.setattr(main, "init_chat_model", lambda *_, **__: model)
+        monkeypatch.setattr(main, "GoogleGenerativeAIEmbeddings", lambda *_, **__: embeddings)
+        monkeypatch.setattr(main, "open_pdf_index", lambda *_: pdf_index)
+        return main.build_pdf_rag_graph("test.pdf")
+
+    return build
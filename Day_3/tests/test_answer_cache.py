@@ -0,0 +1,66 @@
+from test_pdf_rag_graph import ask
+from answer_cache import AnswerCache
+from langchain_core.documents import Document
+
+
+class TestAnswerCache:
+    """Exact and semantic tiers of the answer cache."""
+
+    def test_exact_tier_ignores_case_and_punctuation(self):
+        cache = AnswerCache()
+        cache.put("doc", "What is the warranty period?", "", "Two years.")
+
+        assert cache.get("doc", "  what is the WARRANTY period ", "") == "Two years."
+        assert cache.stats()["exact_hits"] == 1
+
+    def test_semantic_tier_matches_similar_questions(self, embeddings):
+        cache = AnswerCache(embeddings, threshold=0.75)
+        cache.put("doc", "What is the warranty period?", "", "Two years.")
+
+        assert cache.get("doc", "What's the warranty period?", "") == "Two years."
+        assert cache.get("doc", "How do I clean the filter?", "") is None
+        assert cache.stats()["semantic_hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_key_includes_document_and_history(self, embeddings):
+        cache = AnswerCache(embeddings, threshold=0.75)
+        cache.put("doc", "What is the warranty period?", "", "Two years.")
+
+        assert cache.get("other-doc", "What is the warranty period?", "") is None
+        assert cache.get("doc", "What is the warranty period?", "user: hi") is None
+
+    def test_expiry_and_eviction(self):
+        cache = AnswerCache(ttl=0)
+        cache.put("doc", "question", "", "answer")
+        assert cache.get("doc", "question", "") is None
+
+        cache = AnswerCache(max_entries=2)
+        for question in ["first", "second", "third"]:
+            cache.put("doc", question, "", question)
+        assert cache.get("doc", "first", "") is None and cache.get("doc", "third", "") == "third"
+
+
+class TestCachedGraph:
+    """The graph answers repeated questions from the cache."""
+
+    def test_repeated_question_skips_the_model(self, build_graph, pdf_index):
+        pdf_index.vector_store.add_documents([Document(page_content="The warranty lasts two years.")])
+        pdf_index._finish()
+        calls = []
+        graph = build_graph(lambda prompt: calls.append(prompt) or ("Two years." if "warranty lasts" in prompt else "RAG"))
+
+        first = ask(graph, "What does the document say about the warranty?")
+        second = ask(graph, "What does the document say about the warranty?")
+
+        assert first["answer"] == second["answer"] == "Two years."
+        assert second["route"] == "cached" and len(calls) == 1
+
+    def test_answers_over_a_partial_index_are_not_cached(self, build_graph, pdf_index):
+        """While ingestion is still running the answer may miss pages, so it is asked again."""
+
+        pdf_index.vector_store.add_documents([Document(page_content="The warranty lasts two years.")])
+        pdf_index._on_progress(pdf_index.stats)
+        graph = build_graph(lambda prompt: "Two years.")
+
+        ask(graph, "What does the document say about the warranty?")
+
+        assert ask(graph, "What does the document say about the warranty?")["route"] != "cached"
@@ -0,0 +1,40 @@
+import main
+import pytest
+from langchain_core.documents import Document
+
+
+def ask(graph, question: str, history: str = "") -> dict:
+    result = {}
+    for _ in main.stream_answer(graph, {"question": question, "history": history}, result):
+        pass
+    return result
+
+
+class TestPdfRagGraph:
+    """Answering over a PDF index that is built in the background."""
+
+    def test_answers_from_the_indexed_pages(self, build_graph, pdf_index):
+        """A document question is answered from the retrieved chunks."""
+
+        pdf_index.vector_store.add_documents([Document(page_content="The warranty lasts two years.")])
+        pdf_index._finish()
+        graph = build_graph(lambda prompt: "Two years." if "warranty lasts" in prompt else "RAG")
+
+        assert ask(graph, "What does the document say about the warranty?")["answer"] == "Two years."
+
+    def test_failed_ingestion_is_reported(self, build_graph, pdf_index):
+        """A failed ingestion raises instead of answering from a partial or empty index."""
+
+        pdf_index._finish(OSError("broken PDF"))
+        graph = build_graph(lambda prompt: "I don't know.")
+
+        with pytest.raises(main.PdfIndexError, match="broken PDF"):
+            ask(graph, "What does the document say about the warranty?")
+
+    def test_failed_ingestion_still_answers_chat(self, build_graph, pdf_index):
+        """Questions the router answers directly don't need the index."""
+
+        pdf_index._finish(OSError("broken PDF"))
+        graph = build_graph(lambda prompt: "Hello!")
+
+        assert ask(graph, "Hi there")["answer"] == "Hello!"
@@ -0,0 +1,29 @@
+import pytest
+from routing import PRE_ROUTER
+
+
+class TestPreRouter:
+    """Only messages pointing at the uploaded document are routed to RAG without the LLM."""
+
+    @pytest.mark.parametrize("message", [
+        "What does the document say about the return policy?",
+        "Summarize this PDF in three points",
+        "According to the manual, how often should the filter be replaced?",
+        "What is on page 12?",
+        "Which steps are listed in the installation section?",
+    ])
+    def test_document_questions_go_to_rag(self, message):
+        assert PRE_ROUTER.classify(message) == ("rag", "rule")
+
+    @pytest.mark.parametrize("message", [
+        "Summarize what you just said",
+        "Can you repeat what you mentioned earlier?",
+        "Can you make a table of the capitals of Europe?",
+        "What is a good file format for images?",
+        "How do I write a research paper?",
+        "tell me a joke about a page boy",
+    ])
+    def test_chat_and_general_questions_go_to_the_llm_router(self, message):
+        """A document noun or task word alone doesn't decide the route."""
+
+        assert PRE_ROUTER.classify(message)[0] is None
@@ -1,13 +1,20 @@
 import os
+import hashlib
 import tempfile
 import streamlit as st
-from main import build_pdf_rag_graph
+from main import PdfIndexError, build_pdf_rag_graph, stream_answer
+
+
+@st.cache_resource(show_spinner="Indexing PDF...")
+def get_pdf_rag_graph(pdf_path: str):
+    return build_pdf_rag_graph(pdf_path)
 
 
 # Upload pdf interface
 with st.sidebar:
     uploaded_file = st.file_uploader("Upload a PDF", type=["pdf"])
-    if uploaded_file:
+    pdf_digest = hashlib.sha256(uploaded_file.getvalue()).hexdigest() if uploaded_file else None
+    if uploaded_file and st.session_state.get("pdf_digest") != pdf_digest:
         temp_dir = tempfile.mkdtemp()
         temp_path = os.path.join(temp_dir, uploaded_file.name)
         
@@ -15,6 +22,7 @@ with st.sidebar:
             f.write(uploaded_file.read())
 
         st.session_state["pdf_path"] = temp_path
+        st.session_state["pdf_digest"] = pdf_digest
 
 
 # Initialize and load previous messages
@@ -34,19 +42,32 @@ if user_input and "pdf_path" in st.session_state:
     with st.chat_message('user'):
         st.text(user_input)
 
-    with st.spinner("Thinking..."):
-        if len(st.session_state['message_history']) > 1:
-            history_messages = st.session_state['message_history'][-3:]
-            history_text = "\n".join([f"{m['role']}: {m['content']}" for m in history_messages])
-        else:
-            history_text = ""
-            
-        graph = build_pdf_rag_graph(st.session_state["pdf_path"])
-        state = graph.invoke({ "question": user_input, "history": history_text })
+    if len(st.session_state['message_history']) > 1:
+        history_messages = st.session_state['message_history'][-3:]
+        history_text = "\n".join([f"{m['role']}: {m['content']}" for m in history_messages])
+    else:
+        history_text = ""
+
+    graph = get_pdf_rag_graph(st.session_state["pdf_path"])
 
-    st.session_state['message_history'].append({'role': 'assistant', 'content': state["answer"]})
     with st.chat_message('assistant'):
-        st.text(state["answer"])  
+        placeholder = st.empty()
+        placeholder.text("Thinking...")
+
+        answer = ""
+        state = {}
+        try:
+            for token in stream_answer(graph, { "question": user_input, "history": history_text }, state):
+                answer += token
+                placeholder.text(answer)
+            placeholder.text(state["answer"])
+        except PdfIndexError as e:
+            # The cached graph holds the failed index, drop it so the next question indexes the PDF again
+            get_pdf_rag_graph.clear(st.session_state["pdf_path"])
+            state["answer"] = f"{e}. Please ask again or upload the PDF again."
+            placeholder.error(state["answer"])
+
+    st.session_state['message_history'].append({'role': 'assistant', 'content': state["answer"]})
 
 elif user_input:
     st.warning("Please upload a PDF first!")
@@ -0,0 +1,70 @@
+"""
+Offline benchmark of the flight/weather fan-out in build_graph. The lookups are replaced by stubs
+with artificial latency, so the planning phase should take about as long as the slowest branch,
+not the sum of both.
+
+    python benchmark_fanout.py --flight-latency 0.3 --weather-latency 0.2
+"""
+
+import os
+import json
+import time
+import argparse
+
+# Every model-backed node is stubbed below, the key only has to pass the import-time check
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+from main import build_graph
+from langgraph.checkpoint.memory import InMemorySaver
+from schemas import DesignationInfo, DesignationSummary
+
+
+def sleeping_node(latency: float, update: dict):
+    def node(state):
+        time.sleep(latency)
+        return update
+
+    return node
+
+
+def run_benchmark(flight_latency: float, weather_latency: float, runs: int = 5) -> dict:
+    designation_info = DesignationInfo(
+        found=True,
+        name="Paris",
+        summary=DesignationSummary(package_duration="5 days", price="$1000", meals=None, highlights=None),
+    )
+    graph = build_graph({
+        "llm_router": sleeping_node(0, {"casual_answer": None}),
+        "destination_info_node": sleeping_node(0, {"designation_info": designation_info}),
+        "flight_info_node": sleeping_node(flight_latency, {"flight_info": "flight price is $2000."}),
+        "weather_info_node": sleeping_node(weather_latency, {"weather_info": "weather is rainy."}),
+        "budget_planner_node": sleeping_node(0, {"budget_info": "around $3000"}),
+    }, checkpointer=InMemorySaver())
+
+    timings = []
+    for run in range(runs):
+        config = {"configurable": {"thread_id": f"benchmark-{run}"}}
+        started = time.perf_counter()
+        state = graph.invoke({"query": "Plan a 5 day trip to Paris", "history": ""}, config)
+        timings.append(time.perf_counter() - started)
+        assert state["flight_info"] and state["weather_info"] and state["budget_info"]
+
+    timings.sort()
+    return {
+        "flight_latency_s": flight_latency,
+        "weather_latency_s": weather_latency,
+        "sequential_lower_bound_s": flight_latency + weather_latency,
+        "parallel_lower_bound_s": max(flight_latency, weather_latency),
+        "median_wall_time_s": round(timings[len(timings) // 2], 4),
+        "runs": runs,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--flight-latency", type=float, default=0.3)
+    parser.add_argument("--weather-latency", type=float, default=0.2)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.flight_latency, args.weather_latency, args.runs), indent=2))
@@ -0,0 +1,140 @@
+"""
+Offline benchmark of the travel planner graph: fake chat model and embeddings with fixed latency,
+a synthetic travel guide indexed through the real ingestion and retrieval code, and the HTTP
+flight and weather providers talking to the local stub server. What is left is the overhead of
+the graph itself, so runs on different commits can be compared.
+
+    python benchmark_graph.py --sessions 64 --concurrency 8 --model-latency 0.05 --mode async
+
+Prints one JSON report (see benchmark_harness.benchmark). run_benchmarks.py at the repository
+root runs this next to the Day_3 and pet-grooming benchmarks.
+"""
+
+import os
+import json
+import time
+import tempfile
+import itertools
+
+# Nothing below reaches a provider, the key only has to pass the import-time check
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "embeddings.sqlite3"))
+
+import main
+import nodes
+import paths
+import providers
+import travel_guide
+from langgraph.types import Command
+from common.vector_index import PdfIndex
+from checkpointer import get_checkpointer
+from common.retrieval import HybridRetriever
+from stub_providers import start_stub_server
+from common.ingestion import ingest_documents
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+from load_test import DAYS, DESTINATIONS, fake_reply
+from schemas import DesignationInfo, RouterDecision
+from langgraph.checkpoint.memory import InMemorySaver
+from common.numpy_vector_store import NumpyVectorStore
+from prompts import designation_info_prompt, llm_router_prompt
+from common.benchmark_harness import LatencyFakeChatModel, LatencyFakeEmbeddings, benchmark, benchmark_parser
+
+
+def guide_documents(filler_chunks: int):
+    for destination in DESTINATIONS:
+        yield Document(page_content=f"{destination}: {DAYS} day package, $1000, breakfast included, old town walking tour, food market.")
+    for i in range(filler_chunks):
+        yield Document(page_content=f"Travel tip {i}: " + " ".join(f"word{(i * 7 + j) % 997}" for j in range(150)))
+
+
+def install_fakes(args) -> dict:
+    """
+    Swap every external dependency of the graph for an offline fake. Returns setup timings.
+    """
+
+    model = LatencyFakeChatModel(reply=fake_reply, latency=args.model_latency, token_latency=args.token_latency)
+    embeddings = LatencyFakeEmbeddings(latency=args.embedding_latency)
+
+    def parse(schema):
+        return RunnableLambda(lambda message: schema.model_validate_json(message.content))
+
+    nodes.model = model
+    nodes.LLM_ROUTER_CHAIN = llm_router_prompt | model | parse(RouterDecision)
+    nodes.DESIGNATION_INFO_CHAIN = designation_info_prompt | model | parse(DesignationInfo)
+
+    started = time.perf_counter()
+    pdf_index = PdfIndex("benchmark-guide", NumpyVectorStore(embeddings))
+    pdf_index.stats = ingest_documents(pdf_index.vector_store, guide_documents(args.guide_chunks))
+    pdf_index._finish()
+    retriever = HybridRetriever(pdf_index.vector_store)
+    index_seconds = time.perf_counter() - started
+
+    travel_guide.open_travel_guide = lambda: (pdf_index, retriever)
+    main.open_travel_guide = travel_guide.open_travel_guide
+
+    server = start_stub_server(latency=args.service_latency)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    providers.FLIGHT_PROVIDER = providers.HttpFlightProvider(base_url)
+    providers.WEATHER_PROVIDER = providers.HttpWeatherProvider(base_url)
+
+    return {"index_build_s": round(index_seconds, 4), "index_chunks": len(pdf_index.vector_store)}
+
+
+def run_sync_session(graph, thread_id: str, destination: str):
+    # Same calls as the Streamlit UI: stream the budget, then stream the itinerary after approval
+    config = {"configurable": {"thread_id": thread_id}}
+    result = {}
+    budget = "".join(main.stream_graph(graph, {"query": f"Plan a {DAYS} day trip to {destination}", "history": ""}, config, result))
+    assert "__interrupt__" in result, result
+
+    result = {}
+    resume = Command(resume={"user_feedback": "proceed", "history": budget})
+    # A speculative itinerary arrives in the final state without streamed tokens
+    for _ in main.stream_graph(graph, resume, config, result):
+        pass
+    assert result.get("itinerary"), result
+
+
+async def run_async_session(graph, thread_id: str, destination: str):
+    reply, waiting = await main.arun_turn(graph, thread_id, f"Plan a {DAYS} day trip to {destination}", "")
+    assert waiting, reply
+    reply, waiting = await main.arun_turn(graph, thread_id, "proceed", reply, waiting_for_approval=True)
+    assert not waiting and reply, reply
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser("Offline benchmark of the travel planner graph.")
+    parser.add_argument("--mode", choices=["sync", "async"], default="async")
+    parser.add_argument("--service-latency", type=float, default=0.02, help="latency of the stub flight and weather providers")
+    parser.add_argument("--checkpointer", choices=["memory", "sqlite"], default="sqlite")
+    parser.add_argument("--guide-chunks", type=int, default=200, help="filler chunks indexed next to the destinations")
+    parser.add_argument("--speculative", action="store_true")
+    args = parser.parse_args()
+
+    setup = install_fakes(args)
+    nodes.SPECULATOR.enabled = args.speculative
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.checkpointer == "sqlite":
+            checkpointer = get_checkpointer(os.path.join(tmp, "checkpoints.sqlite3"))
+        else:
+            checkpointer = InMemorySaver()
+        graph = main.build_graph(use_async=args.mode == "async", checkpointer=checkpointer)
+
+        # Warmup and measured sessions must not share thread ids
+        run = itertools.count()
+
+        if args.mode == "async":
+            async def session(i):
+                await run_async_session(graph, f"benchmark-{next(run)}", DESTINATIONS[i % len(DESTINATIONS)])
+        else:
+            def session(i):
+                run_sync_session(graph, f"benchmark-{next(run)}", DESTINATIONS[i % len(DESTINATIONS)])
+
+        report = benchmark("travel_planner", args, session, extra=setup)
+        report["providers"] = {"flights": providers.FLIGHT_PROVIDER.stats(), "weather": providers.WEATHER_PROVIDER.stats()}
+        if args.speculative:
+            report["speculation"] = nodes.SPECULATOR.stats()
+
+    print(json.dumps(report, indent=2))
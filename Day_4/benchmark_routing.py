@@ -0,0 +1,40 @@
+"""
+Offline benchmark of the local pre-router against a labelled set of travel-planner messages.
+Reports how many LLM router calls it saves, how accurate its decisions are and how long they take.
+
+    python benchmark_routing.py
+"""
+
+import json
+import paths
+from routing import PRE_ROUTER
+from common.benchmark_harness import benchmark_pre_router
+
+LABELLED_MESSAGES = [
+    ("Plan a 4 day trip to Karachi", "PLANNING"),
+    ("I want a 7-day vacation in Paris", "PLANNING"),
+    ("Can you plan a holiday to London for 5 days?", "PLANNING"),
+    ("Going to Tokyo for two weeks, what's my budget?", "PLANNING"),
+    ("Make an itinerary for 3 days in Istanbul", "PLANNING"),
+    ("We want to visit Bali for 10 nights", "PLANNING"),
+    ("Trip to Dubai, 6 days please", "PLANNING"),
+    ("plan 5 days in rome", "PLANNING"),
+    ("I'm thinking of a week long getaway to Lisbon", "PLANNING"),
+    ("Travel plan for Madrid, 8 days", "PLANNING"),
+    ("Hello!", "CASUAL"),
+    ("How are you doing today?", "CASUAL"),
+    ("Thanks, that was helpful", "CASUAL"),
+    ("I want to plan a trip to Paris", "CASUAL"),
+    ("I have 5 days of leave, any ideas?", "CASUAL"),
+    ("I want to go on a vacation", "CASUAL"),
+    ("What's the capital of France?", "CASUAL"),
+    ("Tell me something interesting", "CASUAL"),
+    ("Who built you?", "CASUAL"),
+    ("What is the weather in Lahore today?", "CASUAL"),
+    ("I spent 3 days in Paris last year, it was great", "CASUAL"),
+    ("Can you recommend a good book?", "CASUAL"),
+]
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_pre_router(PRE_ROUTER, LABELLED_MESSAGES), indent=2))
@@ -0,0 +1,210 @@
+import os
+import time
+import zlib
+import sqlite3
+import asyncio
+import threading
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from typing import Any, AsyncIterator, Optional, Sequence, Tuple
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+
+CHECKPOINT_DB_PATH = os.getenv(
+    "CHECKPOINT_DB_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "generative-ai-learning", "travel-planner-checkpoints.sqlite3"),
+)
+CHECKPOINTS_PER_THREAD = int(os.getenv("CHECKPOINTS_PER_THREAD", "3"))
+THREAD_TTL_SECONDS = float(os.getenv("CHECKPOINT_THREAD_TTL_SECONDS", str(7 * 24 * 3600)))
+# Idle threads are swept once every this many checkpoint writes, not on every one
+SWEEP_EVERY = 500
+
+
+class CompressedSerializer(SerializerProtocol):
+    """
+    LangGraph's msgpack serialization, zlib-compressed when the payload is large enough to benefit.
+    Budgets and itineraries are kilobytes of prose, small channel updates are left as they are.
+    """
+
+    def __init__(self, serde: Optional[SerializerProtocol] = None, min_size: int = 512, level: int = 6):
+        self.serde = serde or JsonPlusSerializer()
+        self.min_size = min_size
+        self.level = level
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(obj)
+        if len(data) >= self.min_size:
+            compressed = zlib.compress(data, self.level)
+            if len(compressed) < len(data):
+                return f"zlib+{type_}", compressed
+        return type_, data
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.startswith("zlib+"):
+            return self.serde.loads_typed((type_[len("zlib+"):], zlib.decompress(payload)))
+        return self.serde.loads_typed(data)
+
+
+class PruningSqliteSaver(SqliteSaver):
+    """
+    SQLite (WAL) checkpointer that keeps only the newest `keep_last` checkpoints of each thread,
+    and drops whole threads that have been idle for longer than `thread_ttl` seconds.
+
+    The latest checkpoint and its pending writes are all an interrupted run needs to resume, so
+    a "proceed?" conversation survives a restart as long as its thread id is known.
+
+    The async methods run the sync ones in a worker thread, so the same saver also serves
+    graphs built with `use_async=True`.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        keep_last: int = CHECKPOINTS_PER_THREAD,
+        thread_ttl: float = THREAD_TTL_SECONDS,
+    ):
+        super().__init__(conn, serde=serde or CompressedSerializer())
+        self.keep_last = keep_last
+        self.thread_ttl = thread_ttl
+        self._puts = 0
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+
+        super().setup()
+        self.conn.executescript(
+            """
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS thread_activity (
+                thread_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS thread_activity_updated_at ON thread_activity (updated_at);
+            """
+        )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) VALUES (?, ?)",
+                (thread_id, time.time()),
+            )
+            # Checkpoint ids are time-ordered (uuid6), the newest sort last
+            cur.execute(
+                """
+                DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+                    SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+                    ORDER BY checkpoint_id DESC LIMIT ?
+                )
+                """,
+                (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_last),
+            )
+            cur.execute(
+                """
+                DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+                    SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+                )
+                """,
+                (thread_id, checkpoint_ns, thread_id, checkpoint_ns),
+            )
+
+        self._puts += 1
+        if self._puts % SWEEP_EVERY == 0:
+            self.prune_idle_threads()
+
+        return next_config
+
+    def prune_idle_threads(self, max_idle: Optional[float] = None) -> int:
+        """
+        Delete every thread that has not been written for `max_idle` seconds (default `thread_ttl`).
+
+        Returns:
+            int: The number of threads deleted.
+        """
+
+        cutoff = time.time() - (self.thread_ttl if max_idle is None else max_idle)
+        with self.cursor() as cur:
+            cur.execute("SELECT thread_id FROM thread_activity WHERE updated_at < ?", (cutoff,))
+            thread_ids = [row[0] for row in cur.fetchall()]
+            for thread_id in thread_ids:
+                cur.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                cur.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            cur.execute("DELETE FROM thread_activity WHERE updated_at < ?", (cutoff,))
+        return len(thread_ids)
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+_lock = threading.Lock()
+_checkpointer: Optional[PruningSqliteSaver] = None
+
+
+def get_checkpointer(path: str = CHECKPOINT_DB_PATH) -> PruningSqliteSaver:
+    """
+    Checkpointer shared by every graph of the process, so all sessions write through one connection.
+    """
+
+    global _checkpointer
+    with _lock:
+        if _checkpointer is None:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            _checkpointer = PruningSqliteSaver(conn)
+            _checkpointer.setup()
+
+        return _checkpointer
@@ -0,0 +1,175 @@
+import re
+import time
+import threading
+from schemas import DesignationInfo
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+TTL_SECONDS = 24 * 60 * 60
+MAX_ENTRIES = 500
+
+# "to Paris", "in new york", "visit the Maldives": the words after a travel preposition, in any case
+TRAVEL_PREPOSITIONS = {"to", "in", "for", "visit", "visiting", "around", "explore"}
+WORD = re.compile(r"[\w'-]+")
+MAX_NAME_WORDS = 3
+CAPITALIZED = re.compile(r"\b[A-Z][\w'-]*")
+# Words that don't name a place
+NOT_PLACES = {
+    "i", "january", "february", "march", "april", "may", "june", "july", "august", "september",
+    "october", "november", "december", "monday", "tuesday", "wednesday", "thursday", "friday",
+    "saturday", "sunday",
+}
+# Words that end a place name: "to paris for 5 days", "to go to rome", "in london cost"
+NAME_ENDS = NOT_PLACES | TRAVEL_PREPOSITIONS | {
+    "the", "a", "an", "my", "our", "me", "us", "it", "there", "with", "on", "at", "from", "by",
+    "and", "or", "next", "this", "that", "during", "over", "until", "please", "now", "soon", "then",
+    "today", "tomorrow", "day", "days", "week", "weeks", "night", "nights", "month", "weekend",
+    "trip", "holiday", "vacation", "itinerary", "budget", "cost", "costs", "plan", "go", "going",
+    "travel", "fly", "see", "stay", "spend", "have", "get", "know", "make", "be", "is", "are",
+}
+# "Rome instead of Paris", "compare Paris and Rome", "Georgia the US state": more than one place
+# or a place the name alone doesn't pin down
+QUALIFIERS = re.compile(
+    r"\b(?:instead|rather|compare[ds]?|comparing|versus|vs|or|state|country|province|county|region)\b",
+    re.IGNORECASE,
+)
+# "Paris, Texas", "Georgia (the country)", "paris and rome" right after the name
+QUALIFIED_NAME = re.compile(
+    r"\s*(?:\(|,\s*\w|(?:&|\s(?:and|then|plus)\s+)(?!(?:back|for|with|in|on|from|next|this|a|an|my|our|i|we|me)\b)\w)",
+    re.IGNORECASE,
+)
+# "with Sara", "with my sister Ana and Ali": people travelling along, not places
+COMPANIONS = re.compile(r"\bwith\s+(?:my\s+\w+\s+)?[A-Z][\w'-]*(?:\s*(?:,|and|&)\s*[A-Z][\w'-]*)*")
+
+
+class Mention(NamedTuple):
+    name: str
+    end: int
+
+
+def destination_mentions(query: str) -> List[Mention]:
+    """
+    The place names after travel prepositions: up to MAX_NAME_WORDS words, ended by a word of
+    NAME_ENDS, a number or punctuation.
+    """
+
+    words = list(WORD.finditer(query))
+    mentions = []
+    for i, word in enumerate(words):
+        if word.group().lower() not in TRAVEL_PREPOSITIONS:
+            continue
+
+        name = []
+        j = i + 1
+        if j < len(words) and words[j].group().lower() == "the" and not query[word.end():words[j].start()].strip():
+            j += 1
+        while j < len(words) and len(name) < MAX_NAME_WORDS:
+            text = words[j].group()
+            previous_end = name[-1].end() if name else words[j - 1].end()
+            if query[previous_end:words[j].start()].strip() or text.lower() in NAME_ENDS or text[0].isdigit():
+                break
+            name.append(words[j])
+            j += 1
+
+        if name:
+            mentions.append(Mention(normalize_destination(" ".join(w.group() for w in name)), name[-1].end()))
+    return mentions
+
+
+def normalize_destination(name: str) -> str:
+    return re.sub(r"[^\w\s'-]", "", re.sub(r"\s+", " ", name or "")).strip().lower()
+
+
+class CacheEntry(NamedTuple):
+    info: DesignationInfo
+    expires_at: float
+
+
+class DesignationCache:
+    """
+    Validated DesignationInfo keyed by (guide version, normalized destination name), so repeated
+    requests for a destination skip both the guide retrieval and the structured-output call.
+
+    The destination is read from the query before any LLM call: the one name after a travel
+    preposition, in any case. A query with no such name, a second one, another capitalized word
+    that isn't a companion ("with Sara"), or a qualifier ("Paris, Texas", "instead of", "compare")
+    is a miss and is not cached. Entries expire after
+    `ttl` seconds and the least recently used ones are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, ttl: float = TTL_SECONDS, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _destination(self, query: str) -> Optional[str]:
+        # Only an unambiguous query has a key: a wrong hit would plan the trip for another place
+        if QUALIFIERS.search(query):
+            return None
+
+        mentions = destination_mentions(query)
+        names = {mention.name for mention in mentions}
+        if len(names) != 1 or any(QUALIFIED_NAME.match(query, mention.end) for mention in mentions):
+            return None
+
+        destination = names.pop()
+        companions = [(m.start(), m.end()) for m in COMPANIONS.finditer(query)]
+        for word in CAPITALIZED.finditer(query):
+            before = query[:word.start()].rstrip()
+            sentence_start = not before or before[-1] in ".!?"
+            companion = any(start <= word.start() < end for start, end in companions)
+            if not (sentence_start or companion or word.group().lower() in NOT_PLACES or word.group().lower() in destination.split()):
+                return None
+
+        return destination
+
+    def get(self, guide_version: str, query: str) -> Optional[DesignationInfo]:
+        destination = self._destination(query)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get((guide_version, destination)) if destination else None
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end((guide_version, destination))
+                self.hits += 1
+                # Nodes write into the state they get, keep the cached model untouched
+                return entry.info.model_copy(deep=True)
+
+            self.misses += 1
+            return None
+
+    def put(self, guide_version: str, query: str, info: DesignationInfo):
+        destination = self._destination(query)
+        if destination is None:
+            return
+
+        names = {destination}
+        if info.found and info.name:
+            names.add(normalize_destination(info.name))
+
+        entry = CacheEntry(info.model_copy(deep=True), time.time() + self.ttl)
+        with self._lock:
+            for name in names:
+                self._entries[(guide_version, name)] = entry
+                self._entries.move_to_end((guide_version, name))
+
+            now = time.time()
+            for expired_key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+                del self._entries[expired_key]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+DESIGNATION_CACHE = DesignationCache()
@@ -0,0 +1,180 @@
+"""
+Offline load test of the async travel planner. Every model call goes to a fake chat model with
+artificial latency, so the numbers show how throughput scales with concurrent sessions in one
+event loop, independent of any provider.
+
+    python load_test.py --latency 0.2 --concurrency 1 8 32 128 --checkpointer sqlite --speculative --think-time 1
+
+With --provider-latency, flight and weather lookups go over HTTP to a local stub provider server
+(see stub_providers.py) instead of the static providers.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+# Every model call is faked below, the key only has to pass the import-time check
+os.environ.setdefault("OPENAI_API_KEY", "offline-load-test")
+
+import main
+import nodes
+import paths
+import providers
+from checkpointer import get_checkpointer
+from stub_providers import start_stub_server
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import InMemorySaver
+from schemas import DesignationInfo, DesignationSummary, RouterDecision
+from common.benchmark_harness import LatencyFakeChatModel
+
+
+DESTINATIONS = ["Paris", "Tokyo", "Rome", "Dubai", "London", "Istanbul", "Lisbon", "Bali"]
+# Replies shaped like the real ones for each prompt of the graph, so streamed budgets and
+# speculative itineraries have realistic lengths
+QUERY = re.compile(r"User Query:\s*(.+)")
+DAYS = 5
+
+
+def _query(prompt: str) -> str:
+    match = QUERY.search(prompt)
+    return match.group(1).strip() if match else ""
+
+
+def fake_reply(prompt: str) -> str:
+    query = _query(prompt).rstrip(".?!")
+    destination = query.split()[-1] if query else "Paris"
+    if "routing assistant" in prompt:
+        return json.dumps({"status": "PLANNING", "answer": None})
+    if "travel brochure context" in prompt:
+        found = f"{destination}:" in prompt
+        return json.dumps({
+            "found": found,
+            "name": destination if found else None,
+            "summary": {
+                "package_duration": f"{DAYS} days" if found else None,
+                "price": "$1000" if found else None,
+                "meals": "Breakfast" if found else None,
+                "highlights": ["Old town walking tour", "Food market"] if found else None,
+            },
+        })
+    if "budget planner" in prompt:
+        return (
+            f"For a {DAYS}-day trip to {destination}, including flights, meals, hotel, and transport, the estimated "
+            "budget comes out to around $3,000. Would you like to proceed? If yes, reply with 'proceed' and I'll "
+            "create your detailed itinerary."
+        )
+    return " ".join(
+        f"Day {day}: breakfast at the hotel, a morning walk through {destination}, lunch at the food market and an evening tour."
+        for day in range(1, DAYS + 1)
+    )
+
+
+def install_fakes(latency: float):
+    async def router_chain(_):
+        await asyncio.sleep(latency)
+        return RouterDecision(status="PLANNING", answer=None)
+
+    async def designation_chain(inputs):
+        await asyncio.sleep(latency)
+        return DesignationInfo(
+            found=True,
+            name=inputs["query"].split()[-1],
+            summary=DesignationSummary(package_duration="5 days", price="$1000", meals="Breakfast", highlights=["Louvre"]),
+        )
+
+    async def retrieve(query, k=3):
+        return [Document(page_content="Paris: 5 day package, $1000, breakfast included, Louvre tour.")]
+
+    nodes.model = LatencyFakeChatModel(reply=fake_reply, latency=latency)
+    nodes.LLM_ROUTER_CHAIN = RunnableLambda(router_chain)
+    nodes.DESIGNATION_INFO_CHAIN = RunnableLambda(designation_chain)
+    nodes.aretrieve_destination_context = retrieve
+    nodes.guide_version = lambda: "load-test-guide"
+    main.open_travel_guide = lambda: None
+
+
+async def run_session(graph, session: str, destination: str, think_time: float = 0.0) -> float:
+    thread_id = f"load-test-{session}"
+    reply, waiting = await main.arun_turn(graph, thread_id, f"Plan a 5 day trip to {destination}", "")
+    assert waiting, reply
+
+    # The user reading the budget before replying
+    await asyncio.sleep(think_time)
+    started = time.perf_counter()
+    reply, waiting = await main.arun_turn(graph, thread_id, "proceed", "", waiting_for_approval=True)
+    assert not waiting and reply, reply
+    return time.perf_counter() - started
+
+
+async def run_load(graph, concurrency: int, sessions: int, think_time: float = 0.0) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i):
+        async with semaphore:
+            return await run_session(graph, f"{concurrency}-{i}", DESTINATIONS[i % len(DESTINATIONS)], think_time)
+
+    started = time.perf_counter()
+    proceed_latencies = sorted(await asyncio.gather(*(bounded(i) for i in range(sessions))))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "elapsed_s": round(elapsed, 3),
+        "sessions_per_s": round(sessions / elapsed, 2),
+        "median_proceed_latency_s": round(proceed_latencies[len(proceed_latencies) // 2], 3),
+    }
+
+
+async def amain(args) -> dict:
+    latency, checkpointer_kind, speculative = args.latency, args.checkpointer, args.speculative
+    install_fakes(latency)
+    nodes.SPECULATOR.enabled = speculative
+
+    if args.provider_latency is not None:
+        server = start_stub_server(latency=args.provider_latency, jitter=args.provider_jitter, error_rate=args.provider_error_rate)
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        providers.FLIGHT_PROVIDER = providers.HttpFlightProvider(base_url)
+        providers.WEATHER_PROVIDER = providers.HttpWeatherProvider(base_url)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if checkpointer_kind == "sqlite":
+            checkpointer = get_checkpointer(os.path.join(tmp, "checkpoints.sqlite3"))
+        else:
+            checkpointer = InMemorySaver()
+        graph = main.build_graph(use_async=True, checkpointer=checkpointer)
+
+        results = []
+        for concurrency in args.concurrency:
+            results.append(await run_load(graph, concurrency, concurrency * args.sessions_per_worker, args.think_time))
+
+        report = {"model_latency_s": latency, "checkpointer": checkpointer_kind, "results": results}
+        if speculative:
+            report["speculation"] = nodes.SPECULATOR.stats()
+        if args.provider_latency is not None:
+            report["providers"] = {"flights": providers.FLIGHT_PROVIDER.stats(), "weather": providers.WEATHER_PROVIDER.stats()}
+        if checkpointer_kind == "sqlite":
+            # Stays at keep_last checkpoints per thread however long the test runs
+            report["checkpoint_rows"] = checkpointer.conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--sessions-per-worker", type=int, default=3)
+    parser.add_argument("--checkpointer", choices=["memory", "sqlite"], default="sqlite")
+    parser.add_argument("--speculative", action="store_true")
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--provider-latency", type=float, default=None)
+    parser.add_argument("--provider-jitter", type=float, default=0.0)
+    parser.add_argument("--provider-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(amain(args)), indent=2))
@@ -1,17 +1,114 @@
+import paths
+import logging
 from schemas import GlobalState
+from typing import Optional, Tuple
+from langgraph.types import Command
+from checkpointer import get_checkpointer
+from travel_guide import open_travel_guide
+from common.instrumentation import instrument
 from langgraph.graph import START, END, StateGraph
-from langgraph.checkpoint.memory import InMemorySaver
-from nodes import llm_router_node, destination_info_node, flight_info_node, weather_info_node, budget_planner_node, itinerary_node
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from nodes import llm_router_node, destination_info_node, flight_info_node, weather_info_node, budget_planner_node, budget_approval_node, itinerary_node
+from nodes import allm_router_node, adestination_info_node, aflight_info_node, aweather_info_node, abudget_planner_node, aitinerary_node
+
+logger = logging.getLogger(__name__)
+
+STREAMED_NODES = ("budget_planner_node", "itinerary_node")
+
+
+def stream_graph(graph, graph_input, config: dict, result: dict, nodes=STREAMED_NODES):
+    """
+    Yield the text tokens that `nodes` generate while the graph runs. The final state,
+    including any "__interrupt__", is stored in `result`.
+    """
+
+    for mode, chunk in graph.stream(graph_input, config, stream_mode=["messages", "updates", "values"]):
+        if mode == "values":
+            result.update(chunk)
+        elif mode == "updates":
+            if "__interrupt__" in chunk:
+                result["__interrupt__"] = chunk["__interrupt__"]
+        else:
+            message, metadata = chunk
+            if metadata.get("langgraph_node") in nodes and isinstance(message.content, str):
+                yield message.content
+
+
+async def astream_graph(graph, graph_input, config: dict, result: dict, nodes=STREAMED_NODES):
+    """
+    Async variant of `stream_graph`, for graphs built with `use_async=True`.
+    """
+
+    async for mode, chunk in graph.astream(graph_input, config, stream_mode=["messages", "updates", "values"]):
+        if mode == "values":
+            result.update(chunk)
+        elif mode == "updates":
+            if "__interrupt__" in chunk:
+                result["__interrupt__"] = chunk["__interrupt__"]
+        else:
+            message, metadata = chunk
+            if metadata.get("langgraph_node") in nodes and isinstance(message.content, str):
+                yield message.content
+
+
+async def arun_turn(graph, thread_id: str, user_input: str, history: str, waiting_for_approval: bool = False) -> Tuple[str, bool]:
+    """
+    Run one chat turn of a session on a graph built with `use_async=True`, so many sessions
+    can share one event loop.
+
+    Returns:
+        Tuple[str, bool]: The assistant reply, and whether the session now waits for approval.
+    """
+
+    config = {"configurable": {"thread_id": thread_id}}
+    if waiting_for_approval:
+        graph_input = Command(resume={"user_feedback": user_input, "history": history})
+    else:
+        graph_input = {"query": user_input, "history": history}
+
+    state = await graph.ainvoke(graph_input, config)
+    if "__interrupt__" in state:
+        return state["__interrupt__"][0].value.get("budget_info", ""), True
+
+    return state.get("casual_answer") or state.get("itinerary"), False
+
+
+NODES = {
+    "llm_router": llm_router_node,
+    "destination_info_node": destination_info_node,
+    "flight_info_node": flight_info_node,
+    "weather_info_node": weather_info_node,
+    "budget_planner_node": budget_planner_node,
+    "budget_approval_node": budget_approval_node,
+    "itinerary_node": itinerary_node,
+}
+
+ASYNC_NODES = {
+    "llm_router": allm_router_node,
+    "destination_info_node": adestination_info_node,
+    "flight_info_node": aflight_info_node,
+    "weather_info_node": aweather_info_node,
+    "budget_planner_node": abudget_planner_node,
+    "budget_approval_node": budget_approval_node,
+    "itinerary_node": aitinerary_node,
+}
+
+
+def build_graph(node_overrides: Optional[dict] = None, use_async: bool = False, checkpointer: Optional[BaseCheckpointSaver] = None):
+    nodes = {**(ASYNC_NODES if use_async else NODES), **(node_overrides or {})}
+
+    if nodes["destination_info_node"] in (destination_info_node, adestination_info_node):
+        # Start loading (or indexing) the travel guide now, so the first planning request doesn't pay for it.
+        # A missing guide only affects destination lookups, chat still works without it
+        try:
+            open_travel_guide()
+        except FileNotFoundError as e:
+            logger.warning("Travel guide not found (%s), destinations will be looked up without it", e)
 
-def build_graph():
     graph_builder = StateGraph(GlobalState)
     
-    graph_builder.add_node("llm_router", llm_router_node)
-    graph_builder.add_node("destination_info_node", destination_info_node)
-    graph_builder.add_node("flight_info_node", flight_info_node)
-    graph_builder.add_node("weather_info_node", weather_info_node)
-    graph_builder.add_node("budget_planner_node", budget_planner_node)
-    graph_builder.add_node("itinerary_node", itinerary_node)
+    for name, node in nodes.items():
+        graph_builder.add_node(name, node)
     
     graph_builder.add_edge(START, "llm_router")
     graph_builder.add_conditional_edges(
@@ -22,18 +119,22 @@ def build_graph():
             "NEXT_NODE": "destination_info_node"
         }
     )
+    # Flight and weather lookups don't depend on each other: fan out to both and join before budgeting
     graph_builder.add_conditional_edges(
         "destination_info_node",
-        lambda state: "NEXT_NODE" if state.designation_info.found else "STOP",
+        lambda state: ["FLIGHT_INFO", "WEATHER_INFO"] if state.designation_info.found else "STOP",
         {
             "STOP": END,
-            "NEXT_NODE": "flight_info_node"
+            "FLIGHT_INFO": "flight_info_node",
+            "WEATHER_INFO": "weather_info_node"
         }
     )
-    graph_builder.add_edge("flight_info_node", "weather_info_node")
-    graph_builder.add_edge("weather_info_node", "budget_planner_node")
-    graph_builder.add_edge("budget_planner_node", END)
+    graph_builder.add_edge(["flight_info_node", "weather_info_node"], "budget_planner_node")
+    graph_builder.add_edge("budget_planner_node", "budget_approval_node")
+    graph_builder.add_edge("budget_approval_node", END)
     graph_builder.add_edge("itinerary_node", END)
     
-    checkpointer = InMemorySaver()
-    return graph_builder.compile(checkpointer=checkpointer)
+    # Defaults to the process-wide SQLite checkpointer, so interrupted sessions survive a restart
+    if checkpointer is None:
+        checkpointer = get_checkpointer()
+    return instrument(graph_builder.compile(checkpointer=checkpointer), "travel_planner")
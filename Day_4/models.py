@@ -1,7 +1,9 @@
 import os
+import paths
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
 from langchain.chat_models import init_chat_model
+from common.embedding_cache import CachedEmbeddings
 
 load_dotenv()
 
@@ -11,4 +13,4 @@ if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY not found in environment variables.")
 
 model = init_chat_model("gpt-4o-mini", model_provider="openai")
-embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
+embedding_model = CachedEmbeddings(OpenAIEmbeddings(model="text-embedding-3-small"))
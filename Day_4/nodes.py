@@ -1,12 +1,19 @@
+import paths
 from models import model
-from schemas import GlobalState
-from models import embedding_model
+from routing import PRE_ROUTER
+from speculation import SPECULATOR
+from typing import List, Optional, Tuple
+from common.instrumentation import METRICS
+from langchain_core.documents import Document
 from langgraph.types import interrupt, Command
+from designation_cache import DESIGNATION_CACHE
+from langchain_core.runnables import RunnableConfig
 from prompts import budget_planner_prompt, itinerary_prompt
 from chains import LLM_ROUTER_CHAIN, DESIGNATION_INFO_CHAIN
-from langchain_core.vectorstores import InMemoryVectorStore
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from schemas import DesignationInfo, GlobalState, RouterDecision
+from prompt_assembly import Section, assemble_prompt, render_designation_info
+from providers import get_flight_info, get_weather_info, aget_flight_info, aget_weather_info
+from travel_guide import guide_version, retrieve_destination_context, aretrieve_destination_context
 
 
 def format_history(history: str) -> str:
@@ -14,86 +21,179 @@ def format_history(history: str) -> str:
     return "\n".join(messages[-3:])
 
 
-def llm_router_node(state: GlobalState):
-    state.casual_answer = None 
+def budget_planner_messages(state: GlobalState):
+    return assemble_prompt("budget_planner_node", budget_planner_prompt, [
+        Section("query", state.query, priority=3),
+        Section("designation_info", render_designation_info(state.designation_info), priority=2),
+        Section("flight_info", state.flight_info, priority=2),
+        Section("history", format_history(state.history), priority=1, keep="tail"),
+    ])
+
+
+def itinerary_messages(state: GlobalState):
+    return assemble_prompt("itinerary_node", itinerary_prompt, [
+        Section("query", state.query, priority=4),
+        Section("designation_info", render_designation_info(state.designation_info), priority=3),
+        Section("flight_info", state.flight_info, priority=2),
+        Section("weather_info", state.weather_info, priority=2),
+        Section("budget_info", state.budget_info, priority=1),
+        Section("history", format_history(state.history), priority=0, keep="tail"),
+    ])
+
+
+def router_input(state: GlobalState) -> dict:
+    return {"query": state.query, "history": format_history(state.history)}
 
-    router_decision = LLM_ROUTER_CHAIN.invoke({
-        "query": state.query,
-        "history": format_history(state.history)
-    })
 
+def set_router_decision(state: GlobalState, router_decision: RouterDecision) -> GlobalState:
     if router_decision.status == "CASUAL":
         state.casual_answer = router_decision.answer
-
     return state
 
 
-def destination_info_node(state: GlobalState):
-    loader = PyPDFLoader("worldwide-travel-guide.pdf")
-    docs = loader.load()
-
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    all_splits = text_splitter.split_documents(docs)
+def cached_designation_info(state: GlobalState) -> Tuple[str, Optional[DesignationInfo]]:
+    """
+    The guide version and, for a destination seen before, its cached info. A hit skips both the
+    guide retrieval and the structured-output call.
+    """
 
-    vector_store = InMemoryVectorStore(embedding_model)
-    _ = vector_store.add_documents(all_splits)
+    version = guide_version()
+    designation_info = DESIGNATION_CACHE.get(version, state.query)
+    METRICS.record_cache("designation_info", designation_info is not None)
+    return version, designation_info
 
-    retrieved_docs = vector_store.similarity_search(state.query, k=3)
-    docs_context_content = "\n\n".join(doc.page_content for doc in retrieved_docs)
 
-    designation_info = DESIGNATION_INFO_CHAIN.invoke({
+def designation_input(state: GlobalState, retrieved_docs: List[Document]) -> dict:
+    return {
         "query": state.query,
-        "context": docs_context_content,
-        "history": format_history(state.history)
-    })
+        "context": "\n\n".join(doc.page_content for doc in retrieved_docs),
+        "history": format_history(state.history),
+    }
+
+
+def set_designation_info(state: GlobalState, designation_info: DesignationInfo, version: Optional[str] = None) -> GlobalState:
+    """
+    Store the info in the state, and in the cache when it was just generated for `version`.
+    """
+
+    if version is not None:
+        DESIGNATION_CACHE.put(version, state.query, designation_info)
 
     state.designation_info = designation_info
     if not designation_info.found:
         state.casual_answer = "Sorry, I don't have information about that city. Could you try another?"
+    return state
+
 
+def set_budget_info(state: GlobalState, config: RunnableConfig, budget_info: str) -> GlobalState:
+    state.budget_info = budget_info
+
+    # Most users approve: with SPECULATIVE_ITINERARY on, the itinerary is written while they read the budget
+    SPECULATOR.start(config["configurable"]["thread_id"], model, itinerary_messages(state))
     return state
 
 
+def llm_router_node(state: GlobalState):
+    state.casual_answer = None 
+
+    # Confident PLANNING messages skip the LLM router, everything else still goes through it
+    if PRE_ROUTER.route(state.query) == "PLANNING":
+        return state
+
+    return set_router_decision(state, LLM_ROUTER_CHAIN.invoke(router_input(state)))
+
+
+def destination_info_node(state: GlobalState):
+    version, designation_info = cached_designation_info(state)
+    if designation_info is not None:
+        return set_designation_info(state, designation_info)
+
+    with METRICS.timer("retrieval_seconds", source="travel_guide"):
+        retrieved_docs = retrieve_destination_context(state.query, k=3)
+    designation_info = DESIGNATION_INFO_CHAIN.invoke(designation_input(state, retrieved_docs))
+    return set_designation_info(state, designation_info, version)
+
+
+# Flight and weather run as parallel branches: each returns only the key it owns,
+# since two branches writing the whole state in the same step would conflict
 def flight_info_node(state: GlobalState):
-    state.flight_info = "flight price is $2000."
-    return state
+    return {"flight_info": get_flight_info(state.designation_info.name)}
 
 
 def weather_info_node(state: GlobalState):
-    state.weather_info = "weather is rainy."
-    return state
+    return {"weather_info": get_weather_info(state.designation_info.name)}
 
 
-def budget_planner_node(state: GlobalState):
-    messages = budget_planner_prompt.invoke({
-        "designation_info": state.designation_info,
-        "flight_info": state.flight_info,
-        "query": state.query,
-        "history": format_history(state.history)
-    })
+def budget_planner_node(state: GlobalState, config: RunnableConfig):
+    response = model.invoke(budget_planner_messages(state))
+    return set_budget_info(state, config, response.content)
 
-    response = model.invoke(messages)
-    state.budget_info = response.content
 
+# Kept apart from budget_planner_node: a resumed node re-runs from the top, and this one has no LLM call to repeat.
+# It awaits nothing, so the async graph uses it as well
+def budget_approval_node(state: GlobalState, config: RunnableConfig):
     response = interrupt({ "budget_info": state.budget_info })
     user_feedback = response.get("user_feedback", "").strip().lower()
     if user_feedback == "proceed":
         return Command(goto="itinerary_node")
     else:
+        SPECULATOR.cancel(config["configurable"]["thread_id"])
         state.casual_answer = "Okay, I won’t proceed."
         return state
 
 
-def itinerary_node(state: GlobalState):
-    messages = itinerary_prompt.invoke({
-        "designation_info": state.designation_info,
-        "weather_info": state.weather_info,
-        "flight_info": state.flight_info,
-        "budget_info": state.budget_info,
-        "query": state.query,
-        "history": format_history(state.history)
-    })
+def itinerary_node(state: GlobalState, config: RunnableConfig):
+    messages = itinerary_messages(state)
+
+    itinerary = SPECULATOR.take(config["configurable"]["thread_id"], messages)
+    if itinerary is None:
+        itinerary = model.invoke(messages).content
+
+    state.itinerary = itinerary
+    return state
+
+
+# Async variants of the nodes above, for running many sessions in one event loop (graph.ainvoke / astream).
+# Only the model, chain and provider calls differ
+async def allm_router_node(state: GlobalState):
+    state.casual_answer = None 
+
+    if PRE_ROUTER.route(state.query) == "PLANNING":
+        return state
+
+    return set_router_decision(state, await LLM_ROUTER_CHAIN.ainvoke(router_input(state)))
+
+
+async def adestination_info_node(state: GlobalState):
+    version, designation_info = cached_designation_info(state)
+    if designation_info is not None:
+        return set_designation_info(state, designation_info)
+
+    with METRICS.timer("retrieval_seconds", source="travel_guide"):
+        retrieved_docs = await aretrieve_destination_context(state.query, k=3)
+    designation_info = await DESIGNATION_INFO_CHAIN.ainvoke(designation_input(state, retrieved_docs))
+    return set_designation_info(state, designation_info, version)
+
+
+async def aflight_info_node(state: GlobalState):
+    return {"flight_info": await aget_flight_info(state.designation_info.name)}
+
+
+async def aweather_info_node(state: GlobalState):
+    return {"weather_info": await aget_weather_info(state.designation_info.name)}
+
+
+async def abudget_planner_node(state: GlobalState, config: RunnableConfig):
+    response = await model.ainvoke(budget_planner_messages(state))
+    return set_budget_info(state, config, response.content)
+
+
+async def aitinerary_node(state: GlobalState, config: RunnableConfig):
+    messages = itinerary_messages(state)
+
+    itinerary = await SPECULATOR.atake(config["configurable"]["thread_id"], messages)
+    if itinerary is None:
+        itinerary = (await model.ainvoke(messages)).content
 
-    response = model.invoke(messages)
-    state.itinerary = response.content
+    state.itinerary = itinerary
     return state
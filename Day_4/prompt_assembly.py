@@ -0,0 +1,132 @@
+import os
+import logging
+from schemas import DesignationInfo
+from langchain_core.prompts import PromptTemplate
+from typing import Dict, List, NamedTuple, Optional
+from langchain_core.prompt_values import PromptValue
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2000"))
+TOKENIZER_MODEL = "gpt-4o-mini"
+# Fallback when the tokenizer can't be loaded (e.g. offline): a rough average for English text
+CHARS_PER_TOKEN = 4
+
+
+def load_encoding():
+    """
+    The tokenizer of TOKENIZER_MODEL, or None when it can't be loaded. tiktoken downloads its
+    tables on first use, so this runs once at import and requests only read ENCODING.
+    """
+
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+    except Exception as e:
+        logger.warning("tiktoken unavailable (%s), estimating tokens as %d characters each", e, CHARS_PER_TOKEN)
+        return None
+
+
+ENCODING = load_encoding()
+
+
+def count_tokens(text: str) -> int:
+    if ENCODING is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(ENCODING.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    """
+    Cut `text` down to `max_tokens`, keeping its beginning ("head") or its end ("tail").
+    """
+
+    if max_tokens <= 0:
+        return ""
+
+    if ENCODING is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        return text[-max_chars:] if keep == "tail" else text[:max_chars]
+
+    tokens = ENCODING.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return ENCODING.decode(tokens[-max_tokens:] if keep == "tail" else tokens[:max_tokens])
+
+
+def render_designation_info(info: Optional[DesignationInfo]) -> str:
+    """
+    One line per known field instead of the pydantic repr, whose field names, quotes and Nones
+    cost tokens without telling the model anything.
+    """
+
+    if info is None:
+        return ""
+
+    summary = info.summary
+    fields = [
+        ("Destination", info.name),
+        ("Package duration", summary.package_duration),
+        ("Price", summary.price),
+        ("Meals", summary.meals),
+        ("Highlights", "; ".join(summary.highlights) if summary.highlights else None),
+    ]
+    return "\n".join(f"{label}: {value}" for label, value in fields if value)
+
+
+class Section(NamedTuple):
+    """
+    One input variable of a prompt. Lower `priority` is trimmed first, and `keep` says which
+    end of the text survives trimming: "tail" for history, where the latest messages matter.
+    """
+
+    name: str
+    text: str
+    priority: int
+    keep: str = "head"
+
+
+_template_tokens: Dict[int, int] = {}
+
+
+def fit_sections(sections: List[Section], budget: int, fixed_tokens: int = 0) -> Dict[str, str]:
+    """
+    Trim the lowest-priority sections until the fixed part plus every section fits in `budget`.
+    """
+
+    texts = {section.name: section.text or "" for section in sections}
+    counts = {name: count_tokens(text) for name, text in texts.items()}
+    overflow = fixed_tokens + sum(counts.values()) - budget
+
+    for section in sorted(sections, key=lambda s: s.priority):
+        if overflow <= 0:
+            break
+
+        trimmed = truncate_tokens(texts[section.name], counts[section.name] - overflow, section.keep)
+        trimmed_count = count_tokens(trimmed)
+        overflow -= counts[section.name] - trimmed_count
+        texts[section.name], counts[section.name] = trimmed, trimmed_count
+
+    return texts
+
+
+def assemble_prompt(node: str, prompt: PromptTemplate, sections: List[Section], budget: int = PROMPT_TOKEN_BUDGET) -> PromptValue:
+    """
+    Fill `prompt` with the sections, trimmed to the token budget, and log the input tokens of `node`.
+    """
+
+    key = id(prompt)
+    if key not in _template_tokens:
+        _template_tokens[key] = count_tokens(prompt.format(**{name: "" for name in prompt.input_variables}))
+    fixed_tokens = _template_tokens[key]
+
+    texts = fit_sections(sections, budget, fixed_tokens)
+    messages = prompt.invoke(texts)
+
+    if logger.isEnabledFor(logging.INFO):
+        section_tokens = ", ".join(f"{name}={count_tokens(text)}" for name, text in texts.items())
+        logger.info("%s input tokens: %d (template=%d, %s)", node, count_tokens(messages.to_string()), fixed_tokens, section_tokens)
+
+    return messages
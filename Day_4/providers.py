@@ -0,0 +1,301 @@
+import os
+import abc
+import time
+import httpx
+import paths
+import asyncio
+import logging
+import datetime
+import threading
+from collections import OrderedDict
+from common.instrumentation import METRICS
+from typing import Awaitable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FLIGHT_PROVIDER_URL = os.getenv("FLIGHT_PROVIDER_URL")
+WEATHER_PROVIDER_URL = os.getenv("WEATHER_PROVIDER_URL")
+TRAVEL_ORIGIN = os.getenv("TRAVEL_ORIGIN", "Karachi")
+PROVIDER_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "2"))
+CACHE_TTL_SECONDS = 15 * 60
+MAX_CACHE_ENTRIES = 10_000
+MAX_CONNECTIONS = 100
+
+
+class ProviderUnavailable(Exception):
+    pass
+
+
+# Every provider request runs on one background event loop, which owns the pooled client:
+# sync nodes (Streamlit) and async nodes (other event loops) then share the same connections
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional[httpx.AsyncClient] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="travel-providers", daemon=True).start()
+        return _loop
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    The shared client. Only use it from coroutines running on the provider loop.
+    """
+
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            timeout=PROVIDER_TIMEOUT_SECONDS,
+        )
+    return _client
+
+
+def run_on_provider_loop(coro: Awaitable):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def arun_on_provider_loop(coro: Awaitable):
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _get_loop()))
+
+
+def close_http_client():
+    global _client
+    if _client is not None:
+        run_on_provider_loop(_client.aclose())
+        _client = None
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures, so callers fail fast instead of waiting
+    for a timeout on every request. After `reset_timeout` seconds one trial request is let through:
+    success closes the breaker again, failure keeps it open for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class Provider(abc.ABC):
+    """
+    Base class of the flight and weather providers. `lookup` adds a TTL/LRU response cache,
+    coalescing of concurrent identical requests, a per-provider timeout and a circuit breaker
+    around `_request`, which subclasses must implement. All of it runs on the provider loop, so
+    no locking is needed.
+    """
+
+    name = "provider"
+
+    def __init__(self, timeout: float = PROVIDER_TIMEOUT_SECONDS, cache_ttl: float = CACHE_TTL_SECONDS, breaker: Optional[CircuitBreaker] = None):
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.breaker = breaker or CircuitBreaker()
+        self._cache: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.short_circuits = 0
+
+    @abc.abstractmethod
+    async def _request(self, key: Tuple) -> str:
+        """
+        Fetch the value for `key` from the upstream service.
+        """
+
+    async def _fetch(self, key: Tuple) -> str:
+        if not self.breaker.allow():
+            self.short_circuits += 1
+            raise ProviderUnavailable(f"{self.name} circuit is open")
+
+        try:
+            value = await asyncio.wait_for(self._request(key), self.timeout)
+        except Exception as e:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise ProviderUnavailable(f"{self.name} request failed: {e!r}") from e
+
+        self.breaker.record_success()
+        self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > MAX_CACHE_ENTRIES:
+            self._cache.popitem(last=False)
+        return value
+
+    async def lookup(self, *key) -> str:
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(key)
+            self.hits += 1
+            METRICS.record_cache(self.name, True)
+            return cached[1]
+
+        self.misses += 1
+        METRICS.record_cache(self.name, False)
+        if key not in self._in_flight:
+            self._in_flight[key] = asyncio.ensure_future(self._fetch(key))
+            self._in_flight[key].add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shield: one caller giving up must not cancel the request the others are waiting on
+        return await asyncio.shield(self._in_flight[key])
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "circuit": self.breaker.state,
+        }
+
+
+class StaticFlightProvider(Provider):
+    name = "static-flights"
+
+    async def _request(self, key: Tuple) -> str:
+        return "flight price is $2000."
+
+
+class StaticWeatherProvider(Provider):
+    name = "static-weather"
+
+    async def _request(self, key: Tuple) -> str:
+        return "weather is rainy."
+
+
+class HttpFlightProvider(Provider):
+    """
+    GET {base_url}/flights?origin=..&destination=..&date=.. returning {"airline", "price", "currency"},
+    where date is the fetch date (see `fetch_date`).
+    """
+
+    name = "http-flights"
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    async def _request(self, key: Tuple) -> str:
+        origin, destination, date = key
+        response = await get_http_client().get(
+            f"{self.base_url}/flights",
+            params={"origin": origin, "destination": destination, "date": date},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        flight = response.json()
+        return f"flight price is {flight['currency']} {flight['price']} ({flight['airline']}, {origin} to {destination} on {date})."
+
+
+class HttpWeatherProvider(Provider):
+    """
+    GET {base_url}/weather?city=..&date=.. returning {"summary", "temperature_c"},
+    where date is the fetch date (see `fetch_date`).
+    """
+
+    name = "http-weather"
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    async def _request(self, key: Tuple) -> str:
+        city, date = key
+        response = await get_http_client().get(
+            f"{self.base_url}/weather",
+            params={"city": city, "date": date},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        weather = response.json()
+        return f"weather is {weather['summary']}, around {weather['temperature_c']}°C in {city} on {date}."
+
+
+FLIGHT_PROVIDER: Provider = HttpFlightProvider(FLIGHT_PROVIDER_URL) if FLIGHT_PROVIDER_URL else StaticFlightProvider()
+WEATHER_PROVIDER: Provider = HttpWeatherProvider(WEATHER_PROVIDER_URL) if WEATHER_PROVIDER_URL else StaticWeatherProvider()
+
+
+def fetch_date() -> str:
+    """
+    The day of the lookup, not of the trip: queries give a duration but no travel date, so
+    prices and forecasts are for today. In the cache key it keeps yesterday's answers from
+    being served today.
+    """
+
+    return datetime.date.today().isoformat()
+
+
+# designation_info.name is Optional: a missing name must not become a query param or a cache key
+async def _flight_info(destination: Optional[str]) -> str:
+    if not destination:
+        return "flight information is unavailable for an unknown destination."
+
+    try:
+        return await FLIGHT_PROVIDER.lookup(TRAVEL_ORIGIN, destination, fetch_date())
+    except ProviderUnavailable as e:
+        logger.warning("%s", e)
+        return "flight information is currently unavailable."
+
+
+async def _weather_info(city: Optional[str]) -> str:
+    if not city:
+        return "weather information is unavailable for an unknown destination."
+
+    try:
+        return await WEATHER_PROVIDER.lookup(city, fetch_date())
+    except ProviderUnavailable as e:
+        logger.warning("%s", e)
+        return "weather information is currently unavailable."
+
+
+def get_flight_info(destination: Optional[str]) -> str:
+    return run_on_provider_loop(_flight_info(destination))
+
+
+def get_weather_info(city: Optional[str]) -> str:
+    return run_on_provider_loop(_weather_info(city))
+
+
+async def aget_flight_info(destination: Optional[str]) -> str:
+    return await arun_on_provider_loop(_flight_info(destination))
+
+
+async def aget_weather_info(city: Optional[str]) -> str:
+    return await arun_on_provider_loop(_weather_info(city))
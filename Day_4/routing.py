@@ -0,0 +1,39 @@
+import re
+import paths
+from common.pre_router import PreRouter
+
+# Only PLANNING can be decided locally: a CASUAL route needs the LLM router's natural reply
+DURATION = re.compile(r"\b(\d+|one|two|three|four|five|six|seven|eight|nine|ten|a|couple of)[\s-]*(days?|nights?|weeks?)\b", re.IGNORECASE)
+DESTINATION = re.compile(r"\b(to|in|for|visit|visiting|around|explore)\s+(the\s+)?[A-Z][\w'-]+")
+TRAVEL_INTENT = re.compile(r"\b(trip|travel|vacation|holiday|itinerary|visit|tour|getaway|plan|going|budget)\b", re.IGNORECASE)
+
+ROUTER_RULES = [
+    ("PLANNING", [TRAVEL_INTENT, DURATION, DESTINATION]),
+]
+
+ROUTER_EXAMPLES = {
+    "PLANNING": [
+        "plan a 5 day trip to paris",
+        "i want to visit tokyo for 7 days",
+        "make me a 3 day itinerary for istanbul",
+        "holiday in dubai for a week",
+        "what would 10 days in london cost",
+        "i am going to lahore for 4 days plan it",
+        "vacation in bali for 6 nights",
+        "plan my two week holiday in rome",
+    ],
+    "CASUAL": [
+        "hi",
+        "hello there",
+        "how are you",
+        "thanks a lot",
+        "tell me a joke",
+        "who are you",
+        "i want to go on vacation",
+        "plan a trip to paris",
+        "i have 5 days off",
+        "what can you do",
+    ],
+}
+
+PRE_ROUTER = PreRouter(ROUTER_RULES, ROUTER_EXAMPLES, decisive_labels=["PLANNING"], threshold=0.3, margin=0.15)
@@ -0,0 +1,188 @@
+import os
+import time
+import paths
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+from langchain_core.prompt_values import PromptValue
+from langchain_core.language_models import BaseChatModel
+from concurrent.futures import Future, ThreadPoolExecutor
+from common.instrumentation import METRICS, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_ITINERARY = os.getenv("SPECULATIVE_ITINERARY", "false").lower() in ("1", "true", "yes")
+MAX_WORKERS = int(os.getenv("SPECULATIVE_ITINERARY_WORKERS", "4"))
+# A budget nobody answers within this time is not worth keeping an itinerary for
+TTL_SECONDS = 30 * 60
+
+
+def prompt_fingerprint(messages: PromptValue) -> str:
+    return hashlib.sha256(messages.to_string().encode("utf-8")).hexdigest()
+
+
+class Speculation:
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.started_at = time.time()
+        self.cancelled = threading.Event()
+        self.tokens = 0
+        self.future: Optional[Future] = None
+
+
+class ItinerarySpeculator:
+    """
+    Generates the itinerary in the background while the user is still reading the budget.
+
+    `start` is called once the budget exists. `take` returns the finished (or waits for the
+    in-progress) text if it was generated from the very same prompt, otherwise None and the
+    caller generates it normally. `cancel` stops the generation between streamed chunks when
+    the user declines. Speculations are keyed by thread id and dropped after `ttl` seconds.
+
+    Outcomes are counted in `registry` as speculative_itinerary_total (by result, and by reason
+    for discarded ones) and speculative_itinerary_tokens_total (used or wasted).
+    """
+
+    def __init__(self, enabled: bool = SPECULATIVE_ITINERARY, max_workers: int = MAX_WORKERS, ttl: float = TTL_SECONDS, registry: MetricsRegistry = METRICS):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.registry = registry
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative-itinerary")
+        self._speculations: Dict[str, Speculation] = {}
+        # Reentrant: a done-callback can fire right away, in the thread that already holds it
+        self._lock = threading.RLock()
+
+        self.started = 0
+        self.hits = 0
+        self.ready_on_take = 0
+        self.discarded = 0
+        self.used_tokens = 0
+        self.wasted_tokens = 0
+
+    def _generate(self, speculation: Speculation, model: BaseChatModel, messages: PromptValue) -> Optional[str]:
+        # Streamed, so a declined budget stops the generation instead of paying for all of it
+        response = None
+        for chunk in model.stream(messages):
+            if speculation.cancelled.is_set():
+                return None
+            response = chunk if response is None else response + chunk
+            speculation.tokens += 1
+
+        if response is None:
+            return ""
+        if response.usage_metadata:
+            speculation.tokens = response.usage_metadata["output_tokens"]
+        return response.content
+
+    def _discard(self, speculation: Speculation, reason: str):
+        speculation.cancelled.set()
+        if speculation.future is not None:
+            speculation.future.cancel()
+        self.discarded += 1
+        self.registry.increment("speculative_itinerary_total", result="discarded", reason=reason)
+        if speculation.future is None or speculation.future.done():
+            self._add_wasted(speculation.tokens)
+        else:
+            # Still streaming: count what it produced once it notices the cancellation
+            speculation.future.add_done_callback(lambda _: self._add_wasted(speculation.tokens))
+
+    def _add_wasted(self, tokens: int):
+        with self._lock:
+            self.wasted_tokens += tokens
+        self.registry.increment("speculative_itinerary_tokens_total", tokens, use="wasted")
+
+    def start(self, thread_id: str, model: BaseChatModel, messages: PromptValue):
+        if not self.enabled:
+            return
+
+        speculation = Speculation(prompt_fingerprint(messages))
+        now = time.time()
+        with self._lock:
+            for stale_id in [t for t, s in self._speculations.items() if now - s.started_at > self.ttl]:
+                self._discard(self._speculations.pop(stale_id), "expired")
+
+            previous = self._speculations.get(thread_id)
+            if previous is not None:
+                if previous.fingerprint == speculation.fingerprint:
+                    return
+                self._discard(previous, "replaced")
+
+            speculation.future = self._executor.submit(self._generate, speculation, model, messages)
+            self._speculations[thread_id] = speculation
+            self.started += 1
+            self.registry.increment("speculative_itinerary_total", result="started")
+
+    def cancel(self, thread_id: str):
+        with self._lock:
+            speculation = self._speculations.pop(thread_id, None)
+            if speculation is not None:
+                self._discard(speculation, "cancelled")
+
+    def _claim(self, thread_id: str, messages: PromptValue) -> Optional[Speculation]:
+        with self._lock:
+            speculation = self._speculations.pop(thread_id, None)
+            if speculation is None:
+                return None
+            if speculation.fingerprint != prompt_fingerprint(messages):
+                self._discard(speculation, "prompt_changed")
+                return None
+            if speculation.future.done():
+                self.ready_on_take += 1
+                self.registry.increment("speculative_itinerary_ready_on_take_total")
+            return speculation
+
+    def _use(self, speculation: Speculation, text: Optional[str]) -> Optional[str]:
+        with self._lock:
+            if text is None:
+                self.discarded += 1
+                self.registry.increment("speculative_itinerary_total", result="discarded", reason="failed")
+                self._add_wasted(speculation.tokens)
+                return None
+            self.hits += 1
+            self.used_tokens += speculation.tokens
+            self.registry.increment("speculative_itinerary_total", result="hit")
+            self.registry.increment("speculative_itinerary_tokens_total", speculation.tokens, use="used")
+            return text
+
+    def take(self, thread_id: str, messages: PromptValue) -> Optional[str]:
+        speculation = self._claim(thread_id, messages)
+        if speculation is None:
+            return None
+
+        try:
+            text = speculation.future.result()
+        except Exception:
+            logger.exception("Speculative itinerary failed, generating it again")
+            text = None
+        return self._use(speculation, text)
+
+    async def atake(self, thread_id: str, messages: PromptValue) -> Optional[str]:
+        speculation = self._claim(thread_id, messages)
+        if speculation is None:
+            return None
+
+        try:
+            text = await asyncio.wrap_future(speculation.future)
+        except Exception:
+            logger.exception("Speculative itinerary failed, generating it again")
+            text = None
+        return self._use(speculation, text)
+
+    def stats(self) -> dict:
+        with self._lock:
+            resolved = self.hits + self.discarded
+            return {
+                "started": self.started,
+                "hits": self.hits,
+                "ready_on_take": self.ready_on_take,
+                "discarded": self.discarded,
+                "hit_rate": self.hits / resolved if resolved else 0.0,
+                "used_tokens": self.used_tokens,
+                "wasted_tokens": self.wasted_tokens,
+                "in_flight": len(self._speculations),
+            }
+
+
+SPECULATOR = ItinerarySpeculator()
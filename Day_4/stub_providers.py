@@ -0,0 +1,91 @@
+"""
+Local stand-ins for the flight and weather providers, with configurable latency and error rate,
+so the provider layer can be load-tested offline.
+
+    python stub_providers.py --port 8801 --latency 0.2 --jitter 0.1 --error-rate 0.05
+    FLIGHT_PROVIDER_URL=http://127.0.0.1:8801 WEATHER_PROVIDER_URL=http://127.0.0.1:8801 streamlit run ui.py
+"""
+
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WEATHER = ["sunny", "rainy", "cloudy", "windy", "snowy"]
+AIRLINES = ["PIA", "Emirates", "Qatar Airways", "Turkish Airlines"]
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like a real provider, so the client's connection pool is exercised
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        server = self.server
+
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+        if random.random() < server.error_rate:
+            return self._send(503, {"error": "stub provider failure"})
+
+        # Deterministic per route/city, so responses are stable across runs
+        seed = zlib.crc32(json.dumps(params, sort_keys=True).encode("utf-8"))
+        if url.path == "/flights":
+            return self._send(200, {
+                "airline": AIRLINES[seed % len(AIRLINES)],
+                "price": 300 + seed % 1700,
+                "currency": "USD",
+            })
+        if url.path == "/weather":
+            return self._send(200, {
+                "summary": WEATHER[seed % len(WEATHER)],
+                "temperature_c": seed % 35,
+            })
+        return self._send(404, {"error": f"unknown path {url.path}"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.1, jitter: float = 0.0, error_rate: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Serve /flights and /weather from a background thread. Port 0 picks a free port,
+    the base URL is then f"http://{host}:{server.server_port}".
+    """
+
+    server = ThreadingHTTPServer((host, port), StubProviderHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    threading.Thread(target=server.serve_forever, name="stub-providers", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8801)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.host, args.port, args.latency, args.jitter, args.error_rate)
+    print(f"Stub providers on http://{args.host}:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
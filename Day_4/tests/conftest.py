@@ -0,0 +1,32 @@
+import os
+import pytest
+import tempfile
+
+# Every model-backed node is stubbed in the tests, the key only has to pass the import-time check
+os.environ.setdefault("OPENAI_API_KEY", "offline-tests")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "embeddings.sqlite3"))
+os.environ.setdefault("CHECKPOINT_DB_PATH", os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite3"))
+
+import main
+from benchmark_fanout import sleeping_node
+from schemas import DesignationInfo, DesignationSummary
+
+
+@pytest.fixture
+def paris():
+    summary = DesignationSummary(package_duration="5 days", price="$1000", meals=None, highlights=None)
+    return DesignationInfo(found=True, name="Paris", summary=summary)
+
+
+@pytest.fixture
+def stub_nodes(paris):
+    """Overrides for every node that would reach a model, the guide or a provider."""
+
+    return {
+        "llm_router": sleeping_node(0, {"casual_answer": None}),
+        "destination_info_node": sleeping_node(0, {"designation_info": paris}),
+        "flight_info_node": sleeping_node(0, {"flight_info": "flight price is $2000."}),
+        "weather_info_node": sleeping_node(0, {"weather_info": "weather is rainy."}),
+        "budget_planner_node": sleeping_node(0, {"budget_info": "around $3000"}),
+        "itinerary_node": sleeping_node(0, {"itinerary": "Day 1: Louvre"}),
+    }
@@ -0,0 +1,87 @@
+import pytest
+import sqlite3
+from main import build_graph
+from langgraph.types import Command
+from checkpointer import CompressedSerializer, PruningSqliteSaver
+
+
+def open_saver(path, **kwargs) -> PruningSqliteSaver:
+    saver = PruningSqliteSaver(sqlite3.connect(path, check_same_thread=False), **kwargs)
+    saver.setup()
+    return saver
+
+
+def checkpoint_count(saver: PruningSqliteSaver, thread_id: str) -> int:
+    with saver.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,))
+        return cur.fetchone()[0]
+
+
+def start_trip(graph, thread_id: str):
+    return graph.invoke({"query": "Plan a 5 day trip to Paris", "history": ""}, {"configurable": {"thread_id": thread_id}})
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "checkpoints.sqlite3")
+
+
+class TestPruningSqliteSaver:
+    """Checkpoint pruning, idle-thread sweeps and resuming after a restart."""
+
+    def test_keeps_last_checkpoints(self, stub_nodes, db_path):
+        """Only the newest `keep_last` checkpoints of a thread stay in the table."""
+
+        saver = open_saver(db_path, keep_last=2)
+        graph = build_graph(stub_nodes, checkpointer=saver)
+
+        start_trip(graph, "trip")
+
+        assert checkpoint_count(saver, "trip") == 2
+        assert graph.get_state({"configurable": {"thread_id": "trip"}}).next == ("budget_approval_node",)
+
+    def test_prunes_idle_threads(self, stub_nodes, db_path):
+        """Threads idle for longer than the TTL are deleted, active ones are kept."""
+
+        saver = open_saver(db_path, thread_ttl=3600)
+        graph = build_graph(stub_nodes, checkpointer=saver)
+        start_trip(graph, "idle")
+        start_trip(graph, "active")
+        with saver.cursor() as cur:
+            cur.execute("UPDATE thread_activity SET updated_at = updated_at - 7200 WHERE thread_id = 'idle'")
+
+        assert saver.prune_idle_threads() == 1
+        assert checkpoint_count(saver, "idle") == 0
+        assert checkpoint_count(saver, "active") > 0
+
+    def test_resumes_after_restart(self, stub_nodes, db_path):
+        """A budget waiting for approval is resumed by a new process with the same thread id."""
+
+        saver = open_saver(db_path)
+        state = start_trip(build_graph(stub_nodes, checkpointer=saver), "restart")
+        assert state["__interrupt__"][0].value == {"budget_info": "around $3000"}
+        saver.conn.close()
+
+        graph = build_graph(stub_nodes, checkpointer=open_saver(db_path))
+        state = graph.invoke(Command(resume={"user_feedback": "proceed", "history": ""}), {"configurable": {"thread_id": "restart"}})
+
+        assert state["itinerary"] == "Day 1: Louvre"
+        assert state["budget_info"] == "around $3000"
+
+
+class TestCompressedSerializer:
+    """zlib compression of large checkpoint payloads."""
+
+    def test_round_trip(self):
+        """Large payloads are compressed, small ones stored as they are, and both load back."""
+
+        serde = CompressedSerializer(min_size=512)
+        large = {"itinerary": "Day 1: Louvre, Seine cruise. " * 100}
+        small = {"budget_info": "around $3000"}
+
+        large_type, large_data = serde.dumps_typed(large)
+        small_type, _ = serde.dumps_typed(small)
+
+        assert large_type.startswith("zlib+") and not small_type.startswith("zlib+")
+        assert serde.loads_typed((large_type, large_data)) == large
+        assert serde.loads_typed(serde.dumps_typed(small)) == small
@@ -0,0 +1,97 @@
+import pytest
+from designation_cache import DesignationCache
+from schemas import DesignationInfo, DesignationSummary
+
+
+def designation(name: str) -> DesignationInfo:
+    summary = DesignationSummary(package_duration="5 days", price="$1000", meals=None, highlights=None)
+    return DesignationInfo(found=True, name=name, summary=summary)
+
+
+@pytest.fixture
+def cache():
+    cache = DesignationCache()
+    cache.put("v1", "Plan a 5 day trip to Paris", designation("Paris"))
+    cache.put("v1", "I want to visit Georgia", designation("Tbilisi"))
+    return cache
+
+
+class TestDesignationCache:
+    """Lookups by the destination named in the query."""
+
+    @pytest.mark.parametrize("query", [
+        "Plan a 5 day trip to Paris",
+        "What would a week in Paris in June cost?",
+        "Paris sounds great. Plan a trip to Paris",
+    ])
+    def test_single_destination_hits(self, cache, query):
+        """A query naming only the cached destination is a hit."""
+
+        assert cache.get("v1", query).name == "Paris"
+
+    @pytest.mark.parametrize("query", [
+        "What about Rome instead of Paris?",
+        "Compare Paris and Rome for 5 days",
+        "Plan a trip to Paris, Texas",
+        "Plan a trip to Paris or Rome",
+        "Fly me to Paris from London",
+        "Plan a trip to Georgia, the US state",
+        "Plan a trip to Georgia the US state",
+        "How much is a trip to Paris (the one in Texas)?",
+    ])
+    def test_ambiguous_queries_miss(self, cache, query):
+        """Another place or a qualifier next to a cached destination is left to the LLM chain."""
+
+        assert cache.get("v1", query) is None
+
+    @pytest.mark.parametrize("query", [
+        "plan a 5 day trip to paris",
+        "what would a week in paris cost",
+        "i want to go to paris for 5 days",
+    ])
+    def test_lowercase_queries_hit(self, cache, query):
+        """The destination is matched in any case."""
+
+        assert cache.get("v1", query).name == "Paris"
+
+    @pytest.mark.parametrize("query", [
+        "plan a trip to paris and rome",
+        "plan a trip to paris, texas",
+        "plan a trip to paris then rome",
+        "what about rome instead of paris",
+    ])
+    def test_lowercase_ambiguous_queries_miss(self, cache, query):
+        """The ambiguity guards apply to lowercase queries too."""
+
+        assert cache.get("v1", query) is None
+
+    @pytest.mark.parametrize("query", [
+        "I want to go to Paris for 5 days with Sara",
+        "plan a trip to paris with my sister Ana and Ali",
+    ])
+    def test_companions_hit(self, cache, query):
+        """People travelling along are not taken for a second place."""
+
+        assert cache.get("v1", query).name == "Paris"
+
+    def test_lowercase_query_is_cached(self):
+        """A lowercase query stores its entry, and the capitalized form hits it."""
+
+        cache = DesignationCache()
+        cache.put("v1", "i want to visit tokyo for 7 days", designation("Tokyo"))
+
+        assert cache.get("v1", "Plan a trip to Tokyo").name == "Tokyo"
+
+    def test_ambiguous_queries_are_not_cached(self, cache):
+        """What the chain answers for an ambiguous query is not stored under any name."""
+
+        cache.put("v1", "Compare Rome and Milan for 5 days", designation("Rome"))
+
+        assert cache.get("v1", "Plan a trip to Rome") is None
+
+    def test_guide_version_is_part_of_the_key(self, cache):
+        """A new guide version misses, and the cached model is a copy."""
+
+        assert cache.get("v2", "Plan a trip to Paris") is None
+        cache.get("v1", "Plan a trip to Paris").name = "Changed"
+        assert cache.get("v1", "Plan a trip to Paris").name == "Paris"
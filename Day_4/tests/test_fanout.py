@@ -0,0 +1,54 @@
+import time
+from main import build_graph
+from benchmark_fanout import sleeping_node
+from langgraph.checkpoint.memory import InMemorySaver
+
+QUERY = {"query": "Plan a 5 day trip to Paris", "history": ""}
+
+
+class TestFanOut:
+    """Flight and weather lookups run as parallel branches joined before the budget."""
+
+    def test_branches_run_in_parallel(self, stub_nodes):
+        """The planning phase takes about as long as the slowest branch, not the sum of both."""
+
+        stub_nodes["flight_info_node"] = sleeping_node(0.3, {"flight_info": "flight price is $2000."})
+        stub_nodes["weather_info_node"] = sleeping_node(0.3, {"weather_info": "weather is rainy."})
+        graph = build_graph(stub_nodes, checkpointer=InMemorySaver())
+
+        started = time.perf_counter()
+        graph.invoke(QUERY, {"configurable": {"thread_id": "parallel"}})
+        elapsed = time.perf_counter() - started
+
+        assert 0.3 <= elapsed < 0.55
+
+    def test_budget_sees_both_branches(self, stub_nodes):
+        """The join waits for both keys, and the run then stops for budget approval."""
+
+        seen = {}
+
+        def budget_planner_node(state):
+            seen.update(flight_info=state.flight_info, weather_info=state.weather_info)
+            return {"budget_info": "around $3000"}
+
+        stub_nodes["flight_info_node"] = sleeping_node(0.05, {"flight_info": "flight price is $2000."})
+        stub_nodes["budget_planner_node"] = budget_planner_node
+        graph = build_graph(stub_nodes, checkpointer=InMemorySaver())
+
+        state = graph.invoke(QUERY, {"configurable": {"thread_id": "join"}})
+
+        assert seen == {"flight_info": "flight price is $2000.", "weather_info": "weather is rainy."}
+        assert state["__interrupt__"][0].value == {"budget_info": "around $3000"}
+
+    def test_destination_not_found_skips_branches(self, stub_nodes, paris):
+        """An unknown destination ends the run before either lookup."""
+
+        stub_nodes["destination_info_node"] = sleeping_node(0, {
+            "designation_info": paris.model_copy(update={"found": False}),
+            "casual_answer": "Sorry, I don't have information about that city.",
+        })
+        graph = build_graph(stub_nodes, checkpointer=InMemorySaver())
+
+        state = graph.invoke(QUERY, {"configurable": {"thread_id": "not-found"}})
+
+        assert state.get("flight_info") is None and state.get("weather_info") is None
@@ -0,0 +1,52 @@
+import nodes
+import pytest
+import asyncio
+from schemas import GlobalState
+from designation_cache import DesignationCache
+from langchain_core.runnables import RunnableLambda
+
+QUERY = "Plan a 5 day trip to Paris"
+
+
+@pytest.fixture
+def chain_calls(monkeypatch, paris):
+    """Stubs the guide and the structured-output chain, and records the chain calls."""
+
+    calls = []
+
+    def designation_chain(inputs):
+        calls.append(inputs)
+        return paris if "Paris" in inputs["query"] else paris.model_copy(update={"found": False, "name": None})
+
+    monkeypatch.setattr(nodes, "DESIGNATION_CACHE", DesignationCache())
+    monkeypatch.setattr(nodes, "DESIGNATION_INFO_CHAIN", RunnableLambda(designation_chain))
+    monkeypatch.setattr(nodes, "guide_version", lambda: "v1")
+    monkeypatch.setattr(nodes, "retrieve_destination_context", lambda query, k=3: [])
+
+    async def aretrieve(query, k=3):
+        return []
+
+    monkeypatch.setattr(nodes, "aretrieve_destination_context", aretrieve)
+    return calls
+
+
+class TestDestinationInfoNode:
+    """The sync and async destination nodes share the cache and the reply for unknown cities."""
+
+    def test_second_request_is_cached(self, chain_calls):
+        """The chain runs once per destination, the async node hits what the sync one stored."""
+
+        state = nodes.destination_info_node(GlobalState(query=QUERY, history=""))
+        cached = asyncio.run(nodes.adestination_info_node(GlobalState(query=QUERY, history="")))
+
+        assert len(chain_calls) == 1
+        assert state.designation_info.name == cached.designation_info.name == "Paris"
+        assert cached.casual_answer is None
+
+    def test_unknown_destination(self, chain_calls):
+        """A destination missing from the guide ends the plan with an apology."""
+
+        state = asyncio.run(nodes.adestination_info_node(GlobalState(query="Plan a 5 day trip to Atlantis", history="")))
+
+        assert not state.designation_info.found
+        assert state.casual_answer.startswith("Sorry")
@@ -0,0 +1,71 @@
+import pytest
+import prompt_assembly
+from langchain_core.prompts import PromptTemplate
+from prompt_assembly import Section, assemble_prompt, count_tokens, fit_sections
+
+
+@pytest.fixture(autouse=True)
+def chars_per_token(monkeypatch):
+    """Counts 4 characters per token, whether or not tiktoken could load its tables."""
+
+    monkeypatch.setattr(prompt_assembly, "ENCODING", None)
+
+
+class TestFitSections:
+    """Trimming prompt sections to a token budget, lowest priority first."""
+
+    def test_fits_untouched(self):
+        """Sections within the budget are returned as they are."""
+
+        texts = fit_sections([Section("query", "a" * 40, priority=2), Section("history", "b" * 40, priority=1)], budget=20)
+
+        assert texts == {"query": "a" * 40, "history": "b" * 40}
+
+    def test_trims_lowest_priority_first(self):
+        """Only the lowest-priority section is cut while that is enough."""
+
+        texts = fit_sections([Section("query", "a" * 40, priority=2), Section("history", "b" * 40, priority=1)], budget=15)
+
+        assert texts["query"] == "a" * 40
+        assert texts["history"] == "b" * 20
+
+    def test_trims_next_priority_when_needed(self):
+        """A budget the lowest section can't cover empties it and cuts into the next one."""
+
+        sections = [
+            Section("query", "a" * 40, priority=3),
+            Section("budget_info", "b" * 40, priority=2),
+            Section("history", "c" * 40, priority=1),
+        ]
+
+        texts = fit_sections(sections, budget=15)
+
+        assert texts == {"query": "a" * 40, "budget_info": "b" * 20, "history": ""}
+
+    def test_keeps_tail(self):
+        """History keeps its latest messages."""
+
+        history = "user: old question\nuser: latest question"
+        texts = fit_sections([Section("history", history, priority=0, keep="tail")], budget=5)
+
+        assert texts["history"] == history[-20:]
+        assert texts["history"].endswith("latest question")
+
+    def test_counts_fixed_tokens(self):
+        """The template's own tokens come out of the same budget."""
+
+        texts = fit_sections([Section("history", "b" * 40, priority=1)], budget=15, fixed_tokens=10)
+
+        assert count_tokens(texts["history"]) == 5
+
+    def test_assembled_prompt_within_budget(self):
+        """The rendered prompt, template included, fits the budget."""
+
+        prompt = PromptTemplate.from_template("Plan a trip.\nQuery: {query}\nHistory: {history}")
+        messages = assemble_prompt("test_node", prompt, [
+            Section("query", "Plan a 5 day trip to Paris", priority=2),
+            Section("history", "user: hello\n" * 200, priority=1, keep="tail"),
+        ], budget=50)
+
+        assert count_tokens(messages.to_string()) <= 50
+        assert "Plan a 5 day trip to Paris" in messages.to_string()
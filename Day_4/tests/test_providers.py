@@ -0,0 +1,38 @@
+import pytest
+import asyncio
+import providers
+from providers import Provider, StaticFlightProvider
+
+
+class TestProvider:
+    """The cached, coalescing provider base class."""
+
+    def test_incomplete_provider_fails_on_creation(self):
+        """A subclass without `_request` can't be instantiated."""
+
+        class IncompleteProvider(Provider):
+            name = "incomplete"
+
+        with pytest.raises(TypeError):
+            IncompleteProvider()
+
+    def test_lookup_is_cached(self):
+        """A repeated lookup is served from the response cache."""
+
+        provider = StaticFlightProvider()
+
+        async def lookups():
+            return [await provider.lookup("Paris"), await provider.lookup("Paris")]
+
+        assert asyncio.run(lookups()) == ["flight price is $2000."] * 2
+        assert provider.stats()["hits"] == 1 and provider.stats()["misses"] == 1
+
+    def test_unknown_destination_skips_the_lookup(self, monkeypatch):
+        """A missing destination name never reaches the provider or its cache."""
+
+        provider = StaticFlightProvider()
+        monkeypatch.setattr(providers, "FLIGHT_PROVIDER", provider)
+
+        assert "unknown destination" in providers.get_flight_info(None)
+        assert "unknown destination" in asyncio.run(providers.aget_weather_info(None))
+        assert provider.stats()["misses"] == 0
@@ -0,0 +1,38 @@
+import pytest
+from routing import PRE_ROUTER
+
+
+class TestPreRouter:
+    """Only confident PLANNING messages skip the LLM router."""
+
+    @pytest.mark.parametrize("message", [
+        "Plan a 4 day trip to Karachi",
+        "Can you plan a holiday to London for 5 days?",
+        "Going to Tokyo for two weeks, what's my budget?",
+        "We want to visit Bali for 10 nights",
+    ])
+    def test_rule_hits(self, message):
+        """Travel intent, a duration and a destination together match the rule."""
+
+        assert PRE_ROUTER.classify(message) == ("PLANNING", "rule")
+
+    @pytest.mark.parametrize("message", [
+        "plan 5 days in rome",
+        "holiday in dubai for a week",
+    ])
+    def test_centroid_fallback(self, message):
+        """Messages the rule misses, here lowercase destinations, are decided by the nearest centroid."""
+
+        assert PRE_ROUTER.classify(message) == ("PLANNING", "centroid")
+
+    @pytest.mark.parametrize("message", [
+        "Hello!",
+        "How are you doing today?",
+        "I want to plan a trip to Paris",
+        "I have 5 days of leave, any ideas?",
+        "I spent 3 days in Paris last year, it was great",
+    ])
+    def test_falls_through_to_llm_router(self, message):
+        """Casual messages, even ones the centroids recognise, and incomplete plans need the LLM router's reply."""
+
+        assert PRE_ROUTER.route(message) is None
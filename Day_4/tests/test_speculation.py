@@ -0,0 +1,113 @@
+import time
+import pytest
+import asyncio
+from speculation import ItinerarySpeculator
+from common.instrumentation import MetricsRegistry
+from langchain_core.prompts import PromptTemplate
+from common.benchmark_harness import LatencyFakeChatModel
+
+PROMPT = PromptTemplate.from_template("Write an itinerary for {query}. Budget: {budget_info}")
+ITINERARY = "Day 1: Louvre. Day 2: Versailles. Day 3: Montmartre."
+
+
+def messages(budget_info: str = "around $3000"):
+    return PROMPT.invoke({"query": "5 days in Paris", "budget_info": budget_info})
+
+
+@pytest.fixture
+def model():
+    return LatencyFakeChatModel(reply=lambda prompt: ITINERARY, latency=0.05)
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def speculator(registry):
+    return ItinerarySpeculator(enabled=True, max_workers=2, registry=registry)
+
+
+def counters(registry: MetricsRegistry, name: str) -> dict:
+    return {tuple(sorted(c["labels"].values())): c["value"] for c in registry.snapshot()["counters"].get(name, [])}
+
+
+class TestItinerarySpeculator:
+    """Background itinerary generation, used only when the final prompt matches."""
+
+    def test_hit(self, speculator, model):
+        """The same prompt takes the speculative itinerary and counts its tokens as used."""
+
+        speculator.start("trip", model, messages())
+
+        assert speculator.take("trip", messages()) == ITINERARY
+        stats = speculator.stats()
+        assert stats["hits"] == 1 and stats["discarded"] == 0
+        assert stats["used_tokens"] == len(ITINERARY.split(" "))
+        assert stats["in_flight"] == 0
+
+    def test_metrics(self, speculator, registry, model):
+        """Hits, misses and cancellations are counted on the metrics registry, tokens too."""
+
+        for thread_id in ("hit", "miss", "cancel"):
+            speculator.start(thread_id, model, messages())
+        speculator.take("hit", messages())
+        speculator.take("miss", messages("around $5000"))
+        speculator.cancel("cancel")
+        speculator._executor.shutdown(wait=True)
+
+        assert counters(registry, "speculative_itinerary_total") == {
+            ("started",): 3,
+            ("hit",): 1,
+            ("discarded", "prompt_changed"): 1,
+            ("cancelled", "discarded"): 1,
+        }
+        tokens = counters(registry, "speculative_itinerary_tokens_total")
+        assert tokens[("used",)] == len(ITINERARY.split(" "))
+        assert tokens[("wasted",)] == speculator.stats()["wasted_tokens"]
+
+    def test_miss_on_different_prompt(self, speculator, model):
+        """A prompt that changed since the budget discards the speculation."""
+
+        speculator.start("trip", model, messages())
+
+        assert speculator.take("trip", messages("around $5000")) is None
+        stats = speculator.stats()
+        assert stats["hits"] == 0 and stats["discarded"] == 1
+
+    def test_miss_without_speculation(self, speculator):
+        """A thread that never started one gets None, so the node generates normally."""
+
+        assert speculator.take("unknown", messages()) is None
+
+    def test_cancel(self, speculator):
+        """A declined budget stops the generation and the tokens produced so far count as wasted."""
+
+        slow = LatencyFakeChatModel(reply=lambda prompt: ITINERARY, token_latency=0.05)
+        speculator.start("trip", slow, messages())
+        time.sleep(0.1)
+        speculator.cancel("trip")
+
+        assert speculator.take("trip", messages()) is None
+        speculator._executor.shutdown(wait=True)
+        stats = speculator.stats()
+        assert stats["discarded"] == 1
+        assert 0 < stats["wasted_tokens"] < len(ITINERARY.split(" "))
+
+    def test_disabled(self, model):
+        """With speculation off nothing is started."""
+
+        speculator = ItinerarySpeculator(enabled=False)
+        speculator.start("trip", model, messages())
+
+        assert speculator.stats()["started"] == 0
+        assert speculator.take("trip", messages()) is None
+
+    def test_atake(self, speculator, model):
+        """The async nodes await the same speculation."""
+
+        speculator.start("trip", model, messages())
+
+        assert asyncio.run(speculator.atake("trip", messages())) == ITINERARY
+        assert speculator.stats()["hits"] == 1
@@ -0,0 +1,30 @@
+import pytest
+import travel_guide
+from main import build_graph
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+@pytest.fixture
+def missing_guide(monkeypatch, tmp_path):
+    monkeypatch.setattr(travel_guide, "TRAVEL_GUIDE_PATH", str(tmp_path / "missing.pdf"))
+
+
+class TestMissingTravelGuide:
+    """A missing guide PDF degrades destination lookups instead of failing the app."""
+
+    def test_graph_builds(self, missing_guide, stub_nodes):
+        """The graph is built and casual chat still answers."""
+
+        del stub_nodes["destination_info_node"]
+        stub_nodes["llm_router"] = lambda state: {"casual_answer": "Hello!"}
+        graph = build_graph(stub_nodes, checkpointer=InMemorySaver())
+
+        state = graph.invoke({"query": "hi", "history": ""}, {"configurable": {"thread_id": "chat"}})
+
+        assert state["casual_answer"] == "Hello!"
+
+    def test_lookups_without_guide(self, missing_guide):
+        """Retrieval returns no context and the cache uses its own version."""
+
+        assert travel_guide.guide_version() == travel_guide.NO_GUIDE
+        assert travel_guide.retrieve_destination_context("Plan a trip to Paris") == []
@@ -0,0 +1,82 @@
+import os
+import paths
+import asyncio
+import logging
+import threading
+from models import embedding_model
+from typing import List, Optional, Tuple
+from common.retrieval import HybridRetriever
+from langchain_core.documents import Document
+from common.vector_index import PdfIndex, open_pdf_index
+
+logger = logging.getLogger(__name__)
+
+TRAVEL_GUIDE_PATH = os.getenv("TRAVEL_GUIDE_PATH", "worldwide-travel-guide.pdf")
+# Version of the designation cache entries made while the guide is missing
+NO_GUIDE = "no-guide"
+
+_lock = threading.Lock()
+_current: Optional[Tuple[int, PdfIndex, HybridRetriever]] = None
+
+
+def open_travel_guide() -> Tuple[PdfIndex, HybridRetriever]:
+    """
+    Index of the travel guide, shared by every session and thread of the process.
+
+    The first call starts indexing in the background (or loads the persisted index), and the
+    index is reopened when the PDF's modification time changes. A changed file gets a new
+    content hash and is re-indexed, a touched but identical file is loaded back from disk.
+    Raises FileNotFoundError while the PDF is missing.
+    """
+
+    global _current
+    mtime = os.stat(TRAVEL_GUIDE_PATH).st_mtime_ns
+
+    with _lock:
+        if _current is None or _current[0] != mtime or _current[1].error:
+            pdf_index = open_pdf_index(TRAVEL_GUIDE_PATH, embedding_model)
+            _current = (mtime, pdf_index, HybridRetriever(pdf_index.vector_store))
+
+        return _current[1], _current[2]
+
+
+def guide_version() -> str:
+    """
+    Content address of the current travel guide, known before indexing finishes.
+    """
+
+    try:
+        pdf_index, _ = open_travel_guide()
+    except FileNotFoundError:
+        return NO_GUIDE
+    return pdf_index.key
+
+
+def retrieve_destination_context(query: str, k: int = 3) -> List[Document]:
+    try:
+        pdf_index, retriever = open_travel_guide()
+    except FileNotFoundError as e:
+        logger.warning("Travel guide not found (%s), answering without it", e)
+        return []
+
+    # Unlike Day_3, a partial guide could wrongly report a destination as not found
+    pdf_index.done.wait()
+    if pdf_index.error:
+        raise pdf_index.error
+
+    return retriever.search(query, k=k)
+
+
+async def aretrieve_destination_context(query: str, k: int = 3) -> List[Document]:
+    try:
+        pdf_index, retriever = open_travel_guide()
+    except FileNotFoundError as e:
+        logger.warning("Travel guide not found (%s), answering without it", e)
+        return []
+
+    if not pdf_index.ready:
+        await asyncio.to_thread(pdf_index.done.wait)
+    if pdf_index.error:
+        raise pdf_index.error
+
+    return await retriever.asearch(query, k=k)
@@ -1,6 +1,7 @@
+import uuid
 import streamlit as st
-from main import build_graph
 from langgraph.types import Command
+from main import build_graph, stream_graph, STREAMED_NODES
 
 
 # Initialize session state
@@ -9,9 +10,16 @@ if 'message_history' not in st.session_state:
 if 'graph' not in st.session_state:
     st.session_state['graph'] = build_graph()
 if 'thread_id' not in st.session_state:
-    st.session_state['thread_id'] = "1"
+    # Kept in the URL, so a reload or a server restart reconnects to the same checkpointed thread
+    st.session_state['thread_id'] = st.query_params.get('thread') or uuid.uuid4().hex
+    st.query_params['thread'] = st.session_state['thread_id']
 if 'waiting_for_approval' not in st.session_state:
-    st.session_state['waiting_for_approval'] = False
+    # Pick up a budget that was still waiting for approval when the session was lost
+    snapshot = st.session_state['graph'].get_state({"configurable": {"thread_id": st.session_state['thread_id']}})
+    st.session_state['waiting_for_approval'] = bool(snapshot.interrupts)
+    if snapshot.interrupts:
+        pending_budget = snapshot.interrupts[0].value.get("budget_info", "")
+        st.session_state['message_history'].append({'role': 'assistant', 'content': pending_budget})
 
 
 # Interface setup
@@ -28,34 +36,38 @@ if user_input:
     with st.chat_message('user'):
         st.markdown(user_input)
 
-    with st.spinner("Thinking..."):
-        config = {"configurable": {"thread_id": st.session_state['thread_id']}}
-        last_three_messages = st.session_state['message_history'][-3:]
-        history_text = "\n".join(
-            [f"{m['role']}: {m['content']}" for m in last_three_messages]
-        )
-
-        if st.session_state['waiting_for_approval']:
-            state = st.session_state['graph'].invoke(
-                Command(resume={"user_feedback": user_input, "history": history_text}),
-                config
-            )
-            st.session_state['waiting_for_approval'] = False
-        else:
-            state = st.session_state['graph'].invoke(
-                {"query": user_input, "history": history_text},
-                config
-            )
+    config = {"configurable": {"thread_id": st.session_state['thread_id']}}
+    last_three_messages = st.session_state['message_history'][-3:]
+    history_text = "\n".join(
+        [f"{m['role']}: {m['content']}" for m in last_three_messages]
+    )
+
+    if st.session_state['waiting_for_approval']:
+        # The budget was already shown, only the itinerary is new
+        graph_input = Command(resume={"user_feedback": user_input, "history": history_text})
+        streamed_nodes = ("itinerary_node",)
+        st.session_state['waiting_for_approval'] = False
+    else:
+        graph_input = {"query": user_input, "history": history_text}
+        streamed_nodes = STREAMED_NODES
+
+    with st.chat_message('assistant'):
+        placeholder = st.empty()
+        placeholder.markdown("Thinking...")
+
+        streamed_text = ""
+        state = {}
+        for token in stream_graph(st.session_state['graph'], graph_input, config, state, streamed_nodes):
+            streamed_text += token
+            placeholder.markdown(streamed_text)
 
         if "__interrupt__" in state:
             st.session_state['waiting_for_approval'] = True
             interrupt_data = state["__interrupt__"][0].value
-            message = interrupt_data.get("budget_info", "")
-            st.session_state['message_history'].append({'role': 'assistant', 'content': message})
-            with st.chat_message('assistant'):
-                st.markdown(message)
+            assistant_reply = interrupt_data.get("budget_info", "")
         else:
             assistant_reply = state.get("casual_answer") or state.get("itinerary")
-            st.session_state['message_history'].append({'role': 'assistant', 'content': assistant_reply})
-            with st.chat_message('assistant'):
-                st.markdown(assistant_reply)
+
+        placeholder.markdown(assistant_reply)
+
+    st.session_state['message_history'].append({'role': 'assistant', 'content': assistant_reply})
@@ -0,0 +1,4 @@
+"""
+Modules shared by the Day_3, Day_4 and pet-grooming-service apps. Each app puts the repository
+root on sys.path by importing its paths module first.
+"""
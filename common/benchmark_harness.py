@@ -0,0 +1,264 @@
+"""
+Fakes and reporting shared by the offline benchmarks (benchmark_graph.py and benchmark_routing.py
+in each app directory). Nothing here touches the network or needs an API key.
+"""
+
+import io
+import re
+import sys
+import math
+import zlib
+import time
+import asyncio
+import argparse
+import resource
+import contextlib
+from common.pre_router import PreRouter
+from common.instrumentation import METRICS
+from langchain_core.embeddings import Embeddings
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.language_models import BaseChatModel
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, get_buffer_string
+
+
+class LatencyFakeChatModel(BaseChatModel):
+    """
+    Deterministic chat model: `reply` maps the rendered prompt to the answer. Waits `latency`
+    before the first token and `token_latency` per word after it, and reports word counts as
+    token usage so the token metrics are exercised too.
+    """
+
+    reply: Callable[[str], str]
+    latency: float = 0.0
+    token_latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "latency-fake-chat-model"
+
+    def _answer(self, messages: List[BaseMessage]):
+        prompt = get_buffer_string(messages)
+        text = self.reply(prompt)
+        words = text.split(" ")
+        usage = {"input_tokens": len(prompt.split()), "output_tokens": len(words), "total_tokens": len(prompt.split()) + len(words)}
+        return words, usage
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        words, usage = self._answer(messages)
+        time.sleep(self.latency + self.token_latency * (len(words) - 1))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=" ".join(words), usage_metadata=usage))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        words, usage = self._answer(messages)
+        await asyncio.sleep(self.latency + self.token_latency * (len(words) - 1))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=" ".join(words), usage_metadata=usage))])
+
+    def _chunk(self, words: List[str], i: int, usage: dict) -> ChatGenerationChunk:
+        content = words[i] if i == 0 else " " + words[i]
+        return ChatGenerationChunk(message=AIMessageChunk(content=content, usage_metadata=usage if i == len(words) - 1 else None))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        words, usage = self._answer(messages)
+        time.sleep(self.latency)
+        for i in range(len(words)):
+            if i:
+                time.sleep(self.token_latency)
+            chunk = self._chunk(words, i, usage)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        words, usage = self._answer(messages)
+        await asyncio.sleep(self.latency)
+        for i in range(len(words)):
+            if i:
+                await asyncio.sleep(self.token_latency)
+            chunk = self._chunk(words, i, usage)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class LatencyFakeEmbeddings(Embeddings):
+    """
+    Hashed bag-of-words vectors, so texts sharing words are close, as with a real embedding model.
+    Waits `latency` per call, like one provider round trip.
+    """
+
+    def __init__(self, size: int = 256, latency: float = 0.0, model: str = "fake-embedding"):
+        self.size = size
+        self.latency = latency
+        self.model = model
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        for word in re.findall(r"\w+", text.lower()):
+            vector[zlib.crc32(word.encode("utf-8")) % self.size] += 1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency)
+        return self._embed(text)
+
+
+def benchmark_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=2, help="sessions run (and discarded) before measuring")
+    parser.add_argument("--model-latency", type=float, default=0.05)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--embedding-latency", type=float, default=0.01)
+    return parser
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_sessions(session: Callable[[int], Any], sessions: int, concurrency: int) -> List[float]:
+    """
+    Run `session(i)` for every i with at most `concurrency` at a time, on threads or, for a
+    coroutine function, on one event loop. Returns the sorted per-session latencies.
+    """
+
+    def timed(i):
+        started = time.perf_counter()
+        session(i)
+        return time.perf_counter() - started
+
+    async def atimed(i, semaphore):
+        async with semaphore:
+            started = time.perf_counter()
+            await session(i)
+            return time.perf_counter() - started
+
+    async def arun():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(atimed(i, semaphore) for i in range(sessions)))
+
+    # Apps print debugging output from their nodes, keep stdout for the JSON report
+    with contextlib.redirect_stdout(io.StringIO()):
+        if asyncio.iscoroutinefunction(session):
+            latencies = asyncio.run(arun())
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                latencies = list(executor.map(timed, range(sessions)))
+
+    return sorted(latencies)
+
+
+def _histograms(name: str, key: str) -> Dict[str, dict]:
+    series = METRICS.snapshot()["histograms"].get(name, [])
+    result = {}
+    for entry in series:
+        labels = entry["labels"]
+        label = labels.get(key, "all")
+        if labels.get("status", "ok") != "ok":
+            label = f"{label} ({labels['status']})"
+        result[label] = {q: (round(entry[q], 6) if entry[q] is not None else None) for q in ("count", "p50", "p95", "p99")}
+    return dict(sorted(result.items()))
+
+
+def _caches() -> Dict[str, dict]:
+    caches: Dict[str, dict] = {}
+    for entry in METRICS.snapshot()["counters"].get("cache_requests_total", []):
+        cache = caches.setdefault(entry["labels"]["cache"], {"hits": 0, "misses": 0})
+        cache["hits" if entry["labels"]["result"] == "hit" else "misses"] += int(entry["value"])
+    for cache in caches.values():
+        cache["hit_rate"] = round(cache["hits"] / (cache["hits"] + cache["misses"]), 4)
+    return dict(sorted(caches.items()))
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def benchmark(app: str, args: argparse.Namespace, session: Callable[[int], Any], extra: Optional[dict] = None) -> dict:
+    """
+    Warm up, run `args.sessions` sessions and report throughput, latency percentiles per session,
+    per node and per model call, cache hit rates and the peak memory of the process.
+    """
+
+    run_sessions(session, args.warmup, min(args.concurrency, max(args.warmup, 1)))
+    METRICS.reset()
+
+    started = time.perf_counter()
+    latencies = run_sessions(session, args.sessions, args.concurrency)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "app": app,
+        "settings": {key: value for key, value in vars(args).items()},
+        "elapsed_s": round(elapsed, 4),
+        "sessions_per_s": round(args.sessions / elapsed, 3),
+        "session_latency_s": {f"p{int(q * 100)}": round(percentile(latencies, q), 6) for q in (0.5, 0.95, 0.99)},
+        "graph_runs": _histograms("graph_run_seconds", "graph"),
+        "nodes": _histograms("graph_node_seconds", "node"),
+        "llm_calls": _histograms("llm_seconds", "node"),
+        "caches": _caches(),
+        "peak_rss_mb": peak_rss_mb(),
+        **(extra or {}),
+    }
+
+
+def benchmark_pre_router(pre_router: PreRouter, messages: Sequence[Tuple[str, str]], repeat: int = 1000) -> dict:
+    """
+    Score `pre_router` against (message, expected label) pairs: how many LLM router calls it
+    saves, how accurate the routes it decides are, and how long a decision takes.
+    """
+
+    decided = correct = 0
+    stages = {"rule": 0, "centroid": 0, "llm": 0}
+    mistakes = []
+
+    for text, expected in messages:
+        label, stage = pre_router.classify(text)
+        decision = label if label in pre_router.decisive_labels else None
+        if decision is None:
+            stages["llm"] += 1
+            continue
+
+        stages[stage] += 1
+        decided += 1
+        if decision == expected:
+            correct += 1
+        else:
+            mistakes.append({"message": text, "expected": expected, "decided": decision})
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text, _ in messages:
+            pre_router.classify(text)
+    per_message_us = (time.perf_counter() - started) / (repeat * len(messages)) * 1e6
+
+    return {
+        "messages": len(messages),
+        "llm_calls_saved": decided,
+        "llm_calls_saved_ratio": decided / len(messages),
+        "decision_accuracy": correct / decided if decided else None,
+        "stages": stages,
+        "mistakes": mistakes,
+        "us_per_message": round(per_message_us, 2),
+    }
+
@@ -0,0 +1,72 @@
+import re
+import math
+import heapq
+import threading
+from collections import Counter, defaultdict
+from langchain_core.documents import Document
+from typing import Dict, Iterable, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index (term -> {document position: term frequency}).
+    Documents can be appended at any time, e.g. while a PDF is still being ingested.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Document] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add_documents(self, documents: Iterable[Document]):
+        with self._lock:
+            for doc in documents:
+                position = len(self.documents)
+                terms = Counter(tokenize(doc.page_content))
+                for term, frequency in terms.items():
+                    self._postings[term][position] = frequency
+
+                # Searches don't take the lock: they only score positions below len(self._lengths),
+                # so it is bumped last, after the document and its postings are in place
+                length = sum(terms.values())
+                self.documents.append(doc)
+                self._total_length += length
+                self._lengths.append(length)
+
+    def search_with_score(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        n = len(self._lengths)
+        if n == 0:
+            return []
+
+        avg_length = self._total_length / n
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, frequency in list(postings.items()):
+                if position >= n:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[position] / avg_length)
+                scores[position] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.documents[position], score) for position, score in best]
+
+    def search(self, query: str, k: int = 4) -> List[Document]:
+        return [doc for doc, _ in self.search_with_score(query, k)]
@@ -0,0 +1,179 @@
+import time
+import random
+import asyncio
+import logging
+from pydantic import BaseModel
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from typing import Callable, Iterable, List, Optional
+from common.numpy_vector_store import NumpyVectorStore
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MAX_CONCURRENCY = 4
+MAX_RETRIES = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+
+
+class IngestionStats(BaseModel):
+    total_chunks: int = 0
+    embedded_chunks: int = 0
+    batches: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.embedded_chunks / self.elapsed if self.elapsed else 0.0
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Providers raise different types for HTTP 429 (openai.RateLimitError, google ResourceExhausted, ...),
+    so look at the status code, the class name and the message instead of importing each SDK.
+    """
+
+    status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status_code == 429:
+        return True
+
+    name = type(error).__name__
+    if name in ("RateLimitError", "ResourceExhausted", "TooManyRequests"):
+        return True
+
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message or "resource exhausted" in message
+
+
+def batched(documents: Iterable[Document], batch_size: int = BATCH_SIZE) -> Iterable[List[Document]]:
+    batch = []
+    for doc in documents:
+        batch.append(doc)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def aembed_with_retry(
+    embeddings: Embeddings,
+    texts: List[str],
+    stats: IngestionStats,
+    max_retries: int = MAX_RETRIES,
+    base_delay: float = BASE_DELAY,
+) -> List[List[float]]:
+    for attempt in range(max_retries + 1):
+        try:
+            # The sync client runs in a worker thread: provider async clients (e.g. Gemini's grpc.aio)
+            # are bound to the event loop they were created on, which is not this one
+            return await asyncio.to_thread(embeddings.embed_documents, texts)
+        except Exception as e:
+            if attempt == max_retries or not is_rate_limit_error(e):
+                raise
+
+            # Exponential backoff with full jitter, so throttled workers don't retry in lockstep
+            delay = random.uniform(0, min(MAX_DELAY, base_delay * 2 ** attempt))
+            stats.retries += 1
+            logger.warning(f"Rate limited embedding {len(texts)} chunks, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+async def aingest_documents(
+    vector_store: NumpyVectorStore,
+    documents: Iterable[Document],
+    batch_size: int = BATCH_SIZE,
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_retries: int = MAX_RETRIES,
+    base_delay: float = BASE_DELAY,
+    on_progress: Optional[Callable[[IngestionStats], None]] = None,
+) -> IngestionStats:
+    """
+    Embed documents in provider-sized batches through a bounded pool of workers and add
+    each batch to the vector store as soon as it is embedded.
+
+    `documents` may be a lazy iterator (e.g. pages streamed out of a PDF). Batches are pulled
+    from it through a bounded queue, so at most a few batches are held in memory at a time.
+
+    Args:
+        vector_store (NumpyVectorStore): Store to add the embedded chunks to.
+        documents (Iterable[Document]): Chunks to embed.
+        batch_size (int): Number of chunks sent in one embedding request.
+        max_concurrency (int): Number of embedding requests in flight at once.
+        max_retries (int): Retries per batch on rate-limit errors.
+        base_delay (float): First backoff delay in seconds, doubled on every retry.
+        on_progress (Callable): Called with the running stats after every batch.
+
+    Returns:
+        IngestionStats: Chunk, batch and retry counts plus throughput.
+    """
+
+    max_concurrency = max(1, max_concurrency)
+    stats = IngestionStats(total_chunks=len(documents) if hasattr(documents, "__len__") else 0)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * max_concurrency)
+    started = time.perf_counter()
+
+    async def producer():
+        batches = batched(documents, batch_size)
+        while True:
+            # Loading and splitting pages is blocking work, keep it off the event loop
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            if not hasattr(documents, "__len__"):
+                stats.total_chunks += len(batch)
+            await queue.put(batch)
+
+        for _ in range(max_concurrency):
+            await queue.put(None)
+
+    async def worker():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+
+            texts = [doc.page_content for doc in batch]
+            vectors = await aembed_with_retry(vector_store.embeddings, texts, stats, max_retries, base_delay)
+            vector_store.add_embeddings(
+                texts,
+                vectors,
+                [doc.metadata for doc in batch],
+                [doc.id for doc in batch] if all(doc.id for doc in batch) else None,
+            )
+
+            stats.embedded_chunks += len(batch)
+            stats.batches += 1
+            stats.elapsed = time.perf_counter() - started
+            logger.info(
+                f"Embedded {stats.embedded_chunks}/{stats.total_chunks} chunks "
+                f"({stats.chunks_per_second:.1f} chunks/s)"
+            )
+            if on_progress:
+                on_progress(stats)
+
+    tasks = [asyncio.create_task(producer())]
+    tasks += [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def ingest_documents(vector_store: NumpyVectorStore, documents: Iterable[Document], **kwargs) -> IngestionStats:
+    """
+    Synchronous wrapper around `aingest_documents` for graph builders and nodes.
+    """
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(aingest_documents(vector_store, documents, **kwargs))
+    finally:
+        loop.close()
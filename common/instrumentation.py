@@ -0,0 +1,363 @@
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from uuid import UUID
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+METRICS_PORT = os.getenv("METRICS_PORT")
+# Loopback only unless exposing the endpoint is asked for, e.g. METRICS_HOST=0.0.0.0 for a scraper
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_JSON_PATH = os.getenv("METRICS_JSON_PATH")
+METRICS_JSON_INTERVAL_SECONDS = float(os.getenv("METRICS_JSON_INTERVAL_SECONDS", "60"))
+
+# Log-spaced upper bounds from 1ms to ~2min, each 25% above the last: quantiles are read off the
+# buckets, so recording is a bisect and a few additions whatever the traffic
+LATENCY_BUCKETS = [0.001 * 1.25 ** i for i in range(53)]
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                # Interpolate linearly inside the bucket
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class MetricsRegistry:
+    """
+    Histograms and counters keyed by metric name and labels, shared by every thread of the process.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def record_cache(self, cache: str, hit: bool, **labels):
+        self.increment("cache_requests_total", cache=cache, result="hit" if hit else "miss", **labels)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "histograms": {
+                    name: [{"labels": dict(key), **histogram.summary()} for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                },
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+            }
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', f'{bound:.6g}'))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+METRICS = MetricsRegistry()
+
+
+class _RunInfo:
+    __slots__ = ("kind", "name", "node", "model", "started", "first_token")
+
+    def __init__(self, kind: str, name: str, node: Optional[str], model: Optional[str] = None):
+        self.kind = kind
+        self.name = name
+        self.node = node
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+
+
+class InstrumentationHandler(BaseCallbackHandler):
+    """
+    LangChain callback handler recording, per graph:
+
+        graph_run_seconds          wall time of a whole graph run
+        graph_node_seconds         wall time of each node
+        chain_seconds              each chain/runnable a node calls directly
+        llm_seconds                model latency, llm_ttft_seconds when streamed
+        llm_input_tokens_total     and llm_output_tokens_total, from the provider's usage data
+
+    Runs inline (no executor hop) and only keeps a small record per live run.
+    """
+
+    run_inline = True
+
+    def __init__(self, graph: str, registry: MetricsRegistry = METRICS):
+        self.graph = graph
+        self.registry = registry
+        self._runs: Dict[UUID, _RunInfo] = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, parent_run_id: Optional[UUID] = None, metadata: Optional[dict] = None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        node = (metadata or {}).get("langgraph_node")
+
+        if parent_run_id is None:
+            self._runs[run_id] = _RunInfo("graph", name or "graph", None)
+        elif node is not None and name == node:
+            self._runs[run_id] = _RunInfo("node", name, node)
+        elif name:
+            # Unnamed children are the graph's own edge functions, not calls made by the node
+            parent = self._runs.get(parent_run_id)
+            if parent is not None and parent.kind == "node":
+                self._runs[run_id] = _RunInfo("chain", name, node)
+
+    def _end_chain(self, run_id: UUID, status: str):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        elapsed = time.perf_counter() - run.started
+        if run.kind == "graph":
+            self.registry.observe("graph_run_seconds", elapsed, graph=self.graph, status=status)
+        elif run.kind == "node":
+            self.registry.observe("graph_node_seconds", elapsed, graph=self.graph, node=run.node, status=status)
+        else:
+            self.registry.observe("chain_seconds", elapsed, graph=self.graph, node=run.node, chain=run.name)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._end_chain(run_id, "ok")
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        # GraphInterrupt is raised through the node: waiting for the user is not an error
+        self._end_chain(run_id, "interrupted" if type(error).__name__ == "GraphInterrupt" else "error")
+
+    def _start_llm(self, serialized, run_id: UUID, metadata: Optional[dict], kwargs: dict):
+        metadata = metadata or {}
+        model = metadata.get("ls_model_name") or (kwargs.get("invocation_params") or {}).get("model") or (serialized or {}).get("name")
+        self._runs[run_id] = _RunInfo("llm", "llm", metadata.get("langgraph_node"), model)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs):
+        self._start_llm(serialized, run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata: Optional[dict] = None, **kwargs):
+        self._start_llm(serialized, run_id, metadata, kwargs)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None and run.first_token is None:
+            run.first_token = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        labels = {"graph": self.graph, "node": run.node, "model": run.model}
+        self.registry.observe("llm_seconds", time.perf_counter() - run.started, **labels)
+        if run.first_token is not None:
+            self.registry.observe("llm_ttft_seconds", run.first_token - run.started, **labels)
+
+        input_tokens, output_tokens = _token_usage(response)
+        if input_tokens:
+            self.registry.increment("llm_input_tokens_total", input_tokens, **labels)
+        if output_tokens:
+            self.registry.increment("llm_output_tokens_total", output_tokens, **labels)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            self.registry.increment("llm_errors_total", graph=self.graph, node=run.node, model=run.model)
+
+
+def _token_usage(response) -> Tuple[int, int]:
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+
+    if not (input_tokens or output_tokens):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens
+
+
+def instrument(graph, name: str, registry: MetricsRegistry = METRICS):
+    """
+    Return the compiled graph with an InstrumentationHandler attached to every run,
+    or the graph itself when METRICS_ENABLED is off.
+    """
+
+    if not METRICS_ENABLED:
+        return graph
+
+    start_exporters()
+    return graph.with_config(callbacks=[InstrumentationHandler(name, registry)])
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics.json":
+            body, content_type = json.dumps(self.server.registry.snapshot()).encode("utf-8"), "application/json"
+        else:
+            body, content_type = self.server.registry.render_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = METRICS_HOST, registry: MetricsRegistry = METRICS) -> ThreadingHTTPServer:
+    """
+    Serve the Prometheus text format on /metrics (and the JSON snapshot on /metrics.json).
+    """
+
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def start_json_dump(path: str, interval: float = METRICS_JSON_INTERVAL_SECONDS, registry: MetricsRegistry = METRICS) -> threading.Thread:
+    """
+    Write the JSON snapshot to `path` every `interval` seconds, replacing the file atomically.
+    """
+
+    def dump():
+        while True:
+            time.sleep(interval)
+            try:
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(registry.snapshot(), f)
+                os.replace(tmp_path, path)
+            except OSError:
+                logger.exception("Could not write metrics to %s", path)
+
+    thread = threading.Thread(target=dump, name="metrics-json-dump", daemon=True)
+    thread.start()
+    return thread
+
+
+_exporters_lock = threading.Lock()
+_exporters_started = False
+
+
+def start_exporters():
+    """
+    Start the exporters configured by METRICS_PORT, METRICS_HOST and METRICS_JSON_PATH, once per process.
+    """
+
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+        if METRICS_PORT:
+            try:
+                start_metrics_server(int(METRICS_PORT))
+            except OSError:
+                # e.g. a second Streamlit process on the same host
+                logger.exception("Could not start the metrics server on %s:%s", METRICS_HOST, METRICS_PORT)
+        if METRICS_JSON_PATH:
+            start_json_dump(METRICS_JSON_PATH)
@@ -0,0 +1,243 @@
+import os
+import json
+import uuid
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+VECTORS_FILE = "vectors.npy"
+DOCUMENTS_FILE = "documents.json"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores along the last axis, best first.
+    """
+
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+
+    if k < scores.shape[-1]:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(k), scores.shape[:-1] + (k,))
+
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1)
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Drop-in replacement for InMemoryVectorStore that keeps every embedding in one
+    contiguous, L2-normalized float32 matrix, so a query is a single matrix-vector product.
+    """
+
+    def __init__(self, embedding: Embeddings):
+        self.embedding = embedding
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._documents: List[Document] = []
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    @property
+    def matrix(self) -> np.ndarray:
+        # Read the size first: a concurrent writer publishes rows before bumping it
+        size = self._size
+        return self._vectors[:size]
+
+    @property
+    def documents(self) -> List[Document]:
+        size = self._size
+        return self._documents[:size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _append_vectors(self, vectors: np.ndarray):
+        matrix = self._vectors
+        if self._size == 0 and matrix.shape[1] != vectors.shape[1]:
+            matrix = np.empty((0, vectors.shape[1]), dtype=np.float32)
+
+        required = self._size + len(vectors)
+        if required > len(matrix) or not matrix.flags.writeable:
+            # Grow geometrically so adding documents in batches stays amortized O(n)
+            capacity = max(required, 2 * len(matrix), 64)
+            grown = np.empty((capacity, vectors.shape[1]), dtype=np.float32)
+            grown[:self._size] = matrix[:self._size]
+            matrix = grown
+
+        # Rows are written before the size is bumped, so searches running while a
+        # background ingestion adds documents only ever see fully written rows
+        matrix[self._size:required] = _normalize(vectors)
+        self._vectors = matrix
+        self._size = required
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        if not texts:
+            return []
+
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = metadatas or [{} for _ in texts]
+
+        self._ids.extend(ids)
+        self._documents.extend(
+            Document(id=doc_id, page_content=text, metadata=metadata)
+            for doc_id, text, metadata in zip(ids, texts, metadatas)
+        )
+        self._append_vectors(np.asarray(embeddings, dtype=np.float32))
+        return ids
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        return self.add_embeddings(texts, self.embedding.embed_documents(texts), metadatas, ids)
+
+    async def aadd_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        embeddings = await self.embedding.aembed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if not ids:
+            return False
+
+        to_delete = set(ids)
+        keep = [i for i, doc_id in enumerate(self._ids) if doc_id not in to_delete]
+        self._vectors = np.ascontiguousarray(self.matrix[keep])
+        self._size = len(keep)
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        return True
+
+    def get_by_ids(self, ids: List[str], /) -> List[Document]:
+        positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        return [self._documents[positions[doc_id]] for doc_id in ids if doc_id in positions]
+
+    def similarity_search_with_score_by_vector(self, embedding: List[float], k: int = 4) -> List[Tuple[Document, float]]:
+        if self._size == 0:
+            return []
+
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        scores = self.matrix @ query
+        return [(self._documents[i], float(scores[i])) for i in _top_k(scores, k)]
+
+    def batch_similarity_search_with_score_by_vector(
+        self, embeddings: List[List[float]], k: int = 4
+    ) -> List[List[Tuple[Document, float]]]:
+        if self._size == 0:
+            return [[] for _ in embeddings]
+
+        queries = _normalize(np.asarray(embeddings, dtype=np.float32))
+        scores = queries @ self.matrix.T
+        top = _top_k(scores, k)
+        return [
+            [(self._documents[i], float(row_scores[i])) for i in row_top]
+            for row_scores, row_top in zip(scores, top)
+        ]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        embedding = await self.embedding.aembed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k)
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score(query, k)]
+
+    def batch_similarity_search(self, queries: List[str], k: int = 4) -> List[List[Document]]:
+        """
+        Score several queries against the index with one matrix-matrix product.
+        """
+
+        if not queries:
+            return []
+
+        embeddings = [self.embedding.embed_query(query) for query in queries]
+        results = self.batch_similarity_search_with_score_by_vector(embeddings, k)
+        return [[doc for doc, _ in row] for row in results]
+
+    def _select_relevance_score_fn(self):
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(embedding)
+        store.add_texts(texts, metadatas, ids=kwargs.get("ids"))
+        return store
+
+    def dump(self, path: str):
+        """
+        Save the store as a directory holding the raw matrix (.npy) and the documents (.json).
+        """
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, VECTORS_FILE), np.ascontiguousarray(self.matrix))
+        with open(os.path.join(path, DOCUMENTS_FILE), "w") as f:
+            json.dump(
+                [{"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata} for doc in self._documents],
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings, mmap: bool = True) -> "NumpyVectorStore":
+        """
+        Load a dumped store. With mmap=True the matrix is memory-mapped read-only, so every
+        process that loads the same index shares one copy through the OS page cache.
+        """
+
+        store = cls(embedding)
+        store._vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r" if mmap else None)
+        store._size = len(store._vectors)
+
+        with open(os.path.join(path, DOCUMENTS_FILE)) as f:
+            for item in json.load(f):
+                store._ids.append(item["id"])
+                store._documents.append(Document(**item))
+
+        return store
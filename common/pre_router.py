@@ -0,0 +1,110 @@
+import re
+import zlib
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+from langchain_core.embeddings import Embeddings
+
+# A rule fires when every one of its patterns matches the message
+Rule = Tuple[str, Sequence[Pattern]]
+
+TOKEN_PATTERN = re.compile(r"\w+")
+HASH_DIM = 2048
+
+
+def hashed_features(text: str, dim: int = HASH_DIM) -> np.ndarray:
+    """
+    Local bag-of-words + bigram embedding (feature hashing), fast enough to run on every message.
+    """
+
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    features = np.zeros(dim, dtype=np.float32)
+    for term in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        features[zlib.crc32(term.encode()) % dim] += 1.0
+    return features
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class PreRouter:
+    """
+    Decides confident routes locally before the LLM router is called.
+
+    1. Keyword/regex rules, checked in order.
+    2. Nearest centroid over embeddings of labelled examples, computed once at construction.
+       Hashed bag-of-words features are used unless a LangChain Embeddings is given.
+
+    Only labels in `decisive_labels` are returned, i.e. routes that need nothing from the LLM
+    router's reply. Everything else returns None and should go to the LLM router.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[Rule],
+        examples: Dict[str, List[str]],
+        decisive_labels: Iterable[str],
+        embeddings: Optional[Embeddings] = None,
+        threshold: float = 0.5,
+        margin: float = 0.1,
+    ):
+        self.rules = list(rules)
+        self.decisive_labels = set(decisive_labels)
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.margin = margin
+
+        self.labels = list(examples)
+        self.centroids = _normalize(np.stack([
+            _normalize(self._embed(texts)).mean(axis=0) for texts in examples.values()
+        ])) if examples else None
+
+        self.rule_decisions = 0
+        self.centroid_decisions = 0
+        self.fallbacks = 0
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if self.embeddings is not None:
+            return np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        return np.stack([hashed_features(text) for text in texts])
+
+    def classify(self, text: str) -> Tuple[Optional[str], str]:
+        """
+        Returns the label (None when unsure) and which stage decided it: "rule", "centroid" or "llm".
+        """
+
+        for label, patterns in self.rules:
+            if all(pattern.search(text) for pattern in patterns):
+                return label, "rule"
+
+        if self.centroids is not None and len(self.labels) > 1:
+            similarities = self.centroids @ _normalize(self._embed([text]))[0]
+            second, best = np.argsort(similarities)[-2:]
+            if similarities[best] >= self.threshold and similarities[best] - similarities[second] >= self.margin:
+                return self.labels[best], "centroid"
+
+        return None, "llm"
+
+    def route(self, text: str) -> Optional[str]:
+        label, stage = self.classify(text)
+        if label not in self.decisive_labels:
+            self.fallbacks += 1
+            return None
+
+        if stage == "rule":
+            self.rule_decisions += 1
+        else:
+            self.centroid_decisions += 1
+        return label
+
+    def stats(self) -> dict:
+        decided = self.rule_decisions + self.centroid_decisions
+        total = decided + self.fallbacks
+        return {
+            "rule_decisions": self.rule_decisions,
+            "centroid_decisions": self.centroid_decisions,
+            "llm_fallbacks": self.fallbacks,
+            "llm_calls_saved": decided / total if total else 0.0,
+        }
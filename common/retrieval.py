@@ -0,0 +1,84 @@
+import os
+import threading
+from common.bm25 import BM25Index
+from typing import Dict, List, Sequence
+from langchain_core.documents import Document
+from common.numpy_vector_store import NumpyVectorStore
+
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[Document]], k: int = 4, rrf_k: int = RRF_K) -> List[Document]:
+    """
+    Merge ranked lists by summing 1 / (rrf_k + rank) per document, so neither the BM25 nor the
+    cosine score scale has to be calibrated against the other.
+    """
+
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking):
+            key = doc.id or doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+            documents.setdefault(key, doc)
+
+    best = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [documents[key] for key in best]
+
+
+class HybridRetriever:
+    """
+    Retrieves chunks from a NumpyVectorStore and a BM25 index built over the same splits.
+
+    Modes:
+        vector: cosine similarity only (one query-embedding call).
+        lexical: BM25 only, no query-embedding call at all.
+        hybrid: reciprocal-rank fusion of both.
+    """
+
+    def __init__(self, vector_store: NumpyVectorStore, mode: str = RETRIEVAL_MODE, fetch_k: int = 20):
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode {mode!r}, expected one of {RETRIEVAL_MODES}")
+
+        self.vector_store = vector_store
+        self.mode = mode
+        self.fetch_k = fetch_k
+        self.bm25 = BM25Index()
+        self._sync_lock = threading.Lock()
+
+    def _sync_bm25(self):
+        # The vector store may still be filling up in the background, index whatever is new
+        with self._sync_lock:
+            documents = self.vector_store.documents
+            if len(documents) > len(self.bm25):
+                self.bm25.add_documents(documents[len(self.bm25):])
+
+    def search(self, query: str, k: int = 4) -> List[Document]:
+        if self.mode == "vector":
+            return self.vector_store.similarity_search(query, k=k)
+
+        self._sync_bm25()
+        if self.mode == "lexical":
+            return self.bm25.search(query, k=k)
+
+        fetch_k = max(k, self.fetch_k)
+        return reciprocal_rank_fusion(
+            [self.vector_store.similarity_search(query, k=fetch_k), self.bm25.search(query, k=fetch_k)],
+            k=k,
+        )
+
+    async def asearch(self, query: str, k: int = 4) -> List[Document]:
+        if self.mode == "vector":
+            return await self.vector_store.asimilarity_search(query, k=k)
+
+        self._sync_bm25()
+        if self.mode == "lexical":
+            return self.bm25.search(query, k=k)
+
+        fetch_k = max(k, self.fetch_k)
+        return reciprocal_rank_fusion(
+            [await self.vector_store.asimilarity_search(query, k=fetch_k), self.bm25.search(query, k=fetch_k)],
+            k=k,
+        )
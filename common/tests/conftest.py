@@ -0,0 +1,32 @@
+import os
+import sys
+import pytest
+
+# The tests import the shared modules as the apps do, as the common package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from common.benchmark_harness import LatencyFakeEmbeddings
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class RecordingEmbeddings(LatencyFakeEmbeddings):
+    """Fake embeddings recording the size of every request, rate limited for the first `throttled` ones."""
+
+    def __init__(self, throttled: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.throttled = throttled
+        self.requests = []
+
+    def embed_documents(self, texts):
+        self.requests.append(len(texts))
+        if len(self.requests) <= self.throttled:
+            raise RateLimitError("429 Too Many Requests")
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def embeddings():
+    return RecordingEmbeddings()
@@ -0,0 +1,37 @@
+import time
+from common.embedding_cache import CachedEmbeddings, SQLiteEmbeddingStore, text_hash
+
+
+class TestEmbeddingCache:
+    """Chunk embeddings cached on disk per model and text."""
+
+    def test_only_misses_reach_the_provider(self, embeddings, tmp_path):
+        cached = CachedEmbeddings(embeddings, SQLiteEmbeddingStore(str(tmp_path / "cache.sqlite3")))
+
+        first = cached.embed_documents(["a", "b", "a"])
+        second = cached.embed_documents(["a", "b", "c"])
+
+        assert embeddings.requests == [2, 1]
+        assert first[0] == first[2] == second[0]
+        assert cached.stats()["hits"] == 3 and cached.stats()["misses"] == 3
+
+    def test_cache_survives_a_restart_per_model(self, embeddings, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        CachedEmbeddings(embeddings, SQLiteEmbeddingStore(path)).embed_documents(["a", "b"])
+
+        CachedEmbeddings(embeddings, SQLiteEmbeddingStore(path)).embed_documents(["a", "b"])
+        CachedEmbeddings(embeddings, SQLiteEmbeddingStore(path), model="other-model").embed_documents(["a", "b"])
+
+        assert embeddings.requests == [2, 2]
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        store = SQLiteEmbeddingStore(str(tmp_path / "cache.sqlite3"), max_entries=2)
+        store.put_many("m", {text_hash("a"): [1.0], text_hash("b"): [2.0]})
+        time.sleep(0.01)
+        # Reading "a" makes "b" the least recently used
+        store.get_many("m", [text_hash("a")])
+        time.sleep(0.01)
+        store.put_many("m", {text_hash("c"): [3.0]})
+
+        assert len(store) == 2
+        assert set(store.get_many("m", [text_hash(t) for t in "abc"])) == {text_hash("a"), text_hash("c")}
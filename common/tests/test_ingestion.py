@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from common.ingestion import ingest_documents
+from langchain_core.documents import Document
+from common.numpy_vector_store import NumpyVectorStore
+
+
+def chunks(n: int):
+    """A lazy iterator, like the pages streamed out of a PDF."""
+
+    for i in range(n):
+        yield Document(page_content=f"chunk {i} about topic{i}", metadata={"page": i})
+
+
+class TestIngestion:
+    """Batched, concurrent embedding into the vector store."""
+
+    def test_documents_are_embedded_in_batches(self, embeddings):
+        store = NumpyVectorStore(embeddings)
+        progress = []
+
+        stats = ingest_documents(store, chunks(250), batch_size=100, max_concurrency=2, on_progress=lambda s: progress.append(s.embedded_chunks))
+
+        assert sorted(embeddings.requests) == [50, 100, 100]
+        assert stats.total_chunks == stats.embedded_chunks == len(store) == 250
+        assert stats.batches == 3 and progress[-1] == 250
+        assert {doc.metadata["page"] for doc in store.documents} == set(range(250))
+        # Batches finish in any order, but every row still belongs to its document
+        for doc, vector in zip(store.documents, store.matrix):
+            assert np.allclose(vector, embeddings.embed_query(doc.page_content))
+
+    def test_rate_limits_are_retried(self, embeddings):
+        embeddings.throttled = 2
+        store = NumpyVectorStore(embeddings)
+
+        stats = ingest_documents(store, chunks(10), batch_size=10, max_concurrency=1, base_delay=0.001)
+
+        assert stats.retries == 2 and len(store) == 10
+        assert embeddings.requests == [10, 10, 10]
+
+    def test_retries_are_bounded(self, embeddings):
+        embeddings.throttled = 1
+        store = NumpyVectorStore(embeddings)
+
+        with pytest.raises(Exception, match="429"):
+            ingest_documents(store, chunks(10), batch_size=10, max_retries=0)
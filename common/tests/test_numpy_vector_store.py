@@ -0,0 +1,55 @@
+import numpy as np
+from common.numpy_vector_store import NumpyVectorStore
+
+TEXTS = [
+    "the warranty lasts two years",
+    "shipping takes five days",
+    "returns are free within thirty days",
+    "the battery charges in two hours",
+    "clean the filter every month",
+]
+
+
+class TestNumpyVectorStore:
+    """Matrix-backed similarity search."""
+
+    def test_top_k_matches_brute_force(self, embeddings):
+        """The k best documents come back best first, as a full sort of the scores would order them."""
+
+        store = NumpyVectorStore.from_texts(TEXTS, embeddings)
+        query = "how long does the warranty last"
+
+        results = store.similarity_search_with_score(query, k=3)
+        scores = np.array(embeddings.embed_documents(TEXTS)) @ np.array(embeddings.embed_query(query))
+        expected = [TEXTS[i] for i in np.argsort(-scores)[:3]]
+
+        assert [doc.page_content for doc, _ in results] == expected
+        assert results[0][0].page_content == "the warranty lasts two years"
+        assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    def test_k_larger_than_the_store(self, embeddings):
+        store = NumpyVectorStore.from_texts(TEXTS[:2], embeddings)
+
+        assert len(store.similarity_search("warranty", k=10)) == 2
+        assert NumpyVectorStore(embeddings).similarity_search("warranty") == []
+
+    def test_batch_search_matches_single_searches(self, embeddings):
+        store = NumpyVectorStore.from_texts(TEXTS, embeddings)
+        queries = ["warranty", "battery charging", "free returns"]
+
+        assert store.batch_similarity_search(queries, k=2) == [store.similarity_search(q, k=2) for q in queries]
+
+    def test_dump_and_mmap_reload(self, embeddings, tmp_path):
+        """A reloaded store is memory-mapped read-only, searches the same and can still grow."""
+
+        store = NumpyVectorStore.from_texts(TEXTS, embeddings, ids=[f"doc-{i}" for i in range(len(TEXTS))])
+        store.dump(str(tmp_path / "index"))
+        loaded = NumpyVectorStore.load(str(tmp_path / "index"), embeddings)
+
+        assert isinstance(loaded._vectors, np.memmap) and not loaded._vectors.flags.writeable
+        assert loaded.similarity_search("battery", k=2) == store.similarity_search("battery", k=2)
+        assert loaded.get_by_ids(["doc-3"])[0].page_content == TEXTS[3]
+
+        loaded.add_texts(["the warranty can be extended"])
+        assert len(loaded) == len(TEXTS) + 1
+        assert np.load(str(tmp_path / "index" / "vectors.npy")).shape[0] == len(TEXTS)
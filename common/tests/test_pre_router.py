@@ -0,0 +1,22 @@
+import re
+from common.pre_router import PreRouter
+from common.benchmark_harness import benchmark_pre_router
+
+GREETING = re.compile(r"\b(hi|hello)\b", re.IGNORECASE)
+
+
+class TestBenchmarkPreRouter:
+    """Scoring a pre-router against labelled messages."""
+
+    def test_report(self):
+        """Rule decisions are scored, undecided messages count as LLM calls."""
+
+        pre_router = PreRouter([("greeting", [GREETING])], {}, decisive_labels=["greeting"])
+        messages = [("hi there", "greeting"), ("hello, what is 2 + 2?", "question"), ("what is 2 + 2?", "question")]
+
+        report = benchmark_pre_router(pre_router, messages, repeat=1)
+
+        assert report["llm_calls_saved"] == 2
+        assert report["decision_accuracy"] == 0.5
+        assert report["stages"] == {"rule": 2, "centroid": 0, "llm": 1}
+        assert report["mistakes"] == [{"message": "hello, what is 2 + 2?", "expected": "question", "decided": "greeting"}]
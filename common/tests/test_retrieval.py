@@ -0,0 +1,82 @@
+import math
+import pytest
+from common.bm25 import BM25Index
+from langchain_core.documents import Document
+from common.numpy_vector_store import NumpyVectorStore
+from common.retrieval import HybridRetriever, reciprocal_rank_fusion
+
+DOCS = [
+    Document(id="warranty", page_content="The warranty covers defects for two years after purchase."),
+    Document(id="returns", page_content="Returns are accepted within thirty days of purchase."),
+    Document(id="battery", page_content="The battery lasts ten hours and charges in two hours."),
+    Document(id="filter", page_content="Replace the filter every month, or every two weeks with pets."),
+]
+
+
+class TestBM25:
+    """Lexical ranking over the inverted index."""
+
+    def test_rare_terms_rank_first(self):
+        index = BM25Index()
+        index.add_documents(DOCS)
+
+        assert [doc.id for doc in index.search("battery hours", k=2)] == ["battery"]
+        assert index.search("purchase warranty", k=2)[0].id == "warranty"
+        assert index.search("unknown words") == []
+
+    def test_score_matches_the_formula(self):
+        """One matching document out of two, both of length 2."""
+
+        index = BM25Index(k1=1.5, b=0.75)
+        index.add_documents([Document(page_content="red apple"), Document(page_content="green pear")])
+
+        (doc, score), = index.search_with_score("apple")
+        idf = math.log(1 + (2 - 1 + 0.5) / (1 + 0.5))
+        assert doc.page_content == "red apple"
+        assert score == pytest.approx(idf * 2.5 / (1 + 1.5))
+
+    def test_documents_can_be_appended(self):
+        index = BM25Index()
+        index.add_documents(DOCS[:2])
+        index.add_documents(DOCS[2:])
+
+        assert len(index) == 4 and index.search("filter pets")[0].id == "filter"
+
+
+class TestReciprocalRankFusion:
+    """Merging the vector and BM25 rankings."""
+
+    def test_documents_found_by_both_win(self):
+        """A document second in both rankings beats one that is first in only one."""
+
+        a, b, c, _ = DOCS
+        fused = reciprocal_rank_fusion([[a, b], [c, b]], k=3)
+
+        assert fused[0].id == "returns"
+        assert {doc.id for doc in fused[1:]} == {"warranty", "battery"}
+
+    def test_scores_sum_over_rankings(self):
+        """Documents are merged by id, and only the k best are kept."""
+
+        a, b, c, _ = DOCS
+        fused = reciprocal_rank_fusion([[a, b, c], [Document(id="warranty", page_content="copy"), c]], k=2, rrf_k=0)
+
+        # a: 1/1 + 1/1, c: 1/3 + 1/2, b: 1/2
+        assert [doc.id for doc in fused] == ["warranty", "battery"]
+        assert fused[0] is a
+
+    def test_hybrid_retriever_indexes_documents_added_later(self, embeddings):
+        """BM25 catches up with documents a background ingestion added to the vector store."""
+
+        store = NumpyVectorStore(embeddings)
+        retriever = HybridRetriever(store, mode="hybrid")
+        store.add_documents(DOCS[:2])
+        retriever.search("warranty")
+        store.add_documents(DOCS[2:])
+
+        assert retriever.search("battery charges", k=1)[0].id == "battery"
+        assert len(retriever.bm25) == 4
+
+    def test_unknown_mode(self, embeddings):
+        with pytest.raises(ValueError):
+            HybridRetriever(NumpyVectorStore(embeddings), mode="fuzzy")
@@ -0,0 +1,175 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterator, Optional
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from common.numpy_vector_store import NumpyVectorStore
+from langchain_community.document_loaders import PyPDFLoader
+from common.ingestion import IngestionStats, ingest_documents
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".index_cache")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def embedding_model_name(embeddings: Embeddings) -> str:
+    return getattr(embeddings, "model", None) or type(embeddings).__name__
+
+
+def index_key(pdf_path: str, embeddings: Embeddings, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP) -> str:
+    """
+    Content address of a PDF index: the file bytes plus every setting that changes the vectors.
+    """
+
+    settings = json.dumps({
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "embedding_model": embedding_model_name(embeddings),
+    }, sort_keys=True)
+    return hashlib.sha256(f"{file_sha256(pdf_path)}:{settings}".encode()).hexdigest()
+
+
+def iter_pdf_chunks(pdf_path: str, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP) -> Iterator[Document]:
+    """
+    Yield chunks page by page, so only one page of the PDF is held in memory at a time.
+    """
+
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    for page in PyPDFLoader(pdf_path).lazy_load():
+        yield from text_splitter.split_documents([page])
+
+
+class PdfIndex:
+    """
+    Vector store of a PDF that can be searched while a background thread is still filling it.
+    """
+
+    def __init__(self, key: str, vector_store: NumpyVectorStore):
+        self.key = key
+        self.vector_store = vector_store
+        self.stats = IngestionStats()
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+        self._has_chunks = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.done.is_set()
+
+    def wait_for_chunks(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the first chunks are searchable, or ingestion has ended.
+        """
+
+        return self._has_chunks.wait(timeout)
+
+    def _on_progress(self, stats: IngestionStats):
+        self.stats = stats
+        self._has_chunks.set()
+
+    def _finish(self, error: Optional[Exception] = None):
+        self.error = error
+        self._has_chunks.set()
+        self.done.set()
+
+
+_open_indexes: Dict[str, PdfIndex] = {}
+_open_indexes_lock = threading.Lock()
+
+
+def _publish(vector_store: NumpyVectorStore, index_path: str):
+    # Write next to the final path and rename, so a crashed build never leaves a half index behind
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    vector_store.dump(tmp_path)
+    try:
+        os.rename(tmp_path, index_path)
+    except OSError:
+        # Another process published the same index first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def open_pdf_index(
+    pdf_path: str,
+    embeddings: Embeddings,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    index_dir: str = INDEX_DIR,
+) -> PdfIndex:
+    """
+    Return the index of a PDF without waiting for it to be built.
+
+    A persisted index is memory-mapped from disk and ready immediately. Otherwise pages are
+    streamed through page -> split -> embed -> index in a background thread, the returned
+    index answers searches over the pages embedded so far, and the finished index is
+    persisted for later runs. Callers opening a PDF that is still being built share that build.
+    """
+
+    key = index_key(pdf_path, embeddings, chunk_size, chunk_overlap)
+    index_path = os.path.join(index_dir, key)
+
+    with _open_indexes_lock:
+        pdf_index = _open_indexes.get(key)
+        if pdf_index is not None:
+            return pdf_index
+
+        if os.path.isdir(index_path):
+            pdf_index = PdfIndex(key, NumpyVectorStore.load(index_path, embeddings))
+            pdf_index._finish()
+            return pdf_index
+
+        pdf_index = PdfIndex(key, NumpyVectorStore(embeddings))
+        _open_indexes[key] = pdf_index
+
+    def build():
+        try:
+            pdf_index.stats = ingest_documents(
+                pdf_index.vector_store,
+                iter_pdf_chunks(pdf_path, chunk_size, chunk_overlap),
+                on_progress=pdf_index._on_progress,
+            )
+            _publish(pdf_index.vector_store, index_path)
+            pdf_index._finish()
+        except Exception as e:
+            logger.exception(f"Failed to index {pdf_path}")
+            pdf_index._finish(e)
+        finally:
+            with _open_indexes_lock:
+                _open_indexes.pop(key, None)
+
+    threading.Thread(target=build, name=f"index-{key[:8]}", daemon=True).start()
+    return pdf_index
+
+
+def load_or_build_vector_store(
+    pdf_path: str,
+    embeddings: Embeddings,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    index_dir: str = INDEX_DIR,
+) -> NumpyVectorStore:
+    """
+    Load the vector store of a PDF from disk, or build and persist it, waiting until it is complete.
+    """
+
+    pdf_index = open_pdf_index(pdf_path, embeddings, chunk_size, chunk_overlap, index_dir)
+    pdf_index.done.wait()
+    if pdf_index.error:
+        raise pdf_index.error
+
+    return pdf_index.vector_store
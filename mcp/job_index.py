@@ -0,0 +1,147 @@
+import os
+import re
+import math
+import time
+import asyncio
+import difflib
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+INDEX_TTL_SECONDS = float(os.getenv("JOB_INDEX_TTL_SECONDS", "300"))
+# How much a match in each field counts, a title match says the most about a job
+FIELD_WEIGHTS = {"title": 3.0, "department": 2.0, "location": 2.0}
+# Words of a request like "backend roles in Lahore" that don't narrow anything down
+STOP_WORDS = {
+    "a",
+    "an",
+    "and",
+    "any",
+    "at",
+    "for",
+    "in",
+    "job",
+    "jobs",
+    "of",
+    "on",
+    "opening",
+    "openings",
+    "or",
+    "position",
+    "positions",
+    "role",
+    "roles",
+    "the",
+    "to",
+    "with",
+}
+PREFIX_MATCH = 0.8
+FUZZY_MATCH = 0.7
+FUZZY_CUTOFF = 0.75
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall((text or "").lower())
+
+
+class JobIndex:
+    """
+    Inverted index over the title, department and location of the published jobs.
+
+    Query words match index terms exactly, as a prefix ("dev" -> "developer") or fuzzily
+    ("lahor" -> "lahore"). Jobs matching more of the query words rank first, then by the sum of
+    match quality x field weight x idf.
+    """
+
+    def __init__(self, ttl: float = INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self.jobs: List[Any] = []
+        self.built_at: Optional[float] = None
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._expansions: Dict[str, List[Tuple[str, float]]] = {}
+        self._lock = asyncio.Lock()
+
+    def build(self, jobs: List[Any]):
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for doc, job in enumerate(jobs):
+            for name, weight in FIELD_WEIGHTS.items():
+                for term in tokenize(getattr(job, name, "")):
+                    postings[term][doc] = max(postings[term].get(doc, 0.0), weight)
+
+        self.jobs = jobs
+        self._postings = dict(postings)
+        self._expansions = {}
+        self.built_at = time.monotonic()
+
+    async def refresh(self, load: Callable[[], Awaitable[List[Any]]]):
+        """
+        Rebuild from `load()` when the index is older than `ttl`. Concurrent callers share one rebuild.
+        """
+
+        if self.built_at is not None and time.monotonic() - self.built_at < self.ttl:
+            return
+        async with self._lock:
+            if self.built_at is None or time.monotonic() - self.built_at >= self.ttl:
+                self.build(await load())
+
+    def _expand(self, word: str) -> List[Tuple[str, float]]:
+        # Index terms matching a query word, with the quality of the match
+        if word not in self._expansions:
+            matches = {word: 1.0} if word in self._postings else {}
+            if len(word) >= 3:
+                for term in self._postings:
+                    if term != word and term.startswith(word):
+                        matches[term] = PREFIX_MATCH
+            for term in difflib.get_close_matches(
+                word, self._postings, n=3, cutoff=FUZZY_CUTOFF
+            ):
+                ratio = difflib.SequenceMatcher(None, word, term).ratio()
+                matches.setdefault(term, FUZZY_MATCH * ratio)
+            self._expansions[word] = list(matches.items())
+        return self._expansions[word]
+
+    def search(
+        self, query: str, filters: Optional[Dict[str, str]] = None, limit: int = 10
+    ) -> List[Any]:
+        """
+        The best `limit` jobs for `query`. `filters` maps field names to text the field must contain.
+        """
+
+        filters = {
+            name: value.lower() for name, value in (filters or {}).items() if value
+        }
+        candidates = [
+            doc
+            for doc, job in enumerate(self.jobs)
+            if all(
+                value in (getattr(job, name, "") or "").lower()
+                for name, value in filters.items()
+            )
+        ]
+        tokens = tokenize(query)
+        words = [word for word in tokens if word not in STOP_WORDS] or tokens
+        if not words:
+            return [self.jobs[doc] for doc in candidates[:limit]]
+
+        allowed = set(candidates)
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, int] = defaultdict(int)
+        for word in words:
+            best: Dict[int, float] = {}
+            for term, quality in self._expand(word):
+                postings = self._postings[term]
+                idf = math.log(1 + len(self.jobs) / len(postings))
+                for doc, weight in postings.items():
+                    if doc in allowed:
+                        best[doc] = max(best.get(doc, 0.0), quality * weight * idf)
+            for doc, score in best.items():
+                scores[doc] += score
+                matched[doc] += 1
+
+        ranked = sorted(
+            scores, key=lambda doc: (matched[doc], scores[doc], -doc), reverse=True
+        )
+        return [self.jobs[doc] for doc in ranked[:limit]]
+
+
+JOB_INDEX = JobIndex()
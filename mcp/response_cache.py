@@ -0,0 +1,163 @@
+import os
+import time
+import httpx
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# The job board changes a few times a day: answer from memory for a few minutes, then serve
+# the cached response while it is refreshed in the background for up to an hour
+CACHE_TTL_SECONDS = float(os.getenv("JOB_CACHE_TTL_SECONDS", "300"))
+CACHE_STALE_SECONDS = float(os.getenv("JOB_CACHE_STALE_SECONDS", "3600"))
+MAX_CACHE_ENTRIES = 1000
+
+
+class CacheEntry(NamedTuple):
+    data: Any
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ResponseCache:
+    """
+    Stale-while-revalidate cache of JSON GET responses, keyed by request path.
+
+    Fresh entries (younger than `ttl`) are returned without a request. Stale entries (younger
+    than `ttl + stale_ttl`) are returned right away while one background request refreshes
+    them. Anything older is fetched before returning. Refreshes send If-None-Match and
+    If-Modified-Since when the API gave an ETag or Last-Modified, so an unchanged resource
+    costs a 304 without a body. Concurrent misses of one path share a single request.
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL_SECONDS,
+        stale_ttl: float = CACHE_STALE_SECONDS,
+        max_entries: int = MAX_CACHE_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._revalidations: Set[asyncio.Task] = set()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, tool: str, event: str):
+        stats = self._stats.setdefault(
+            tool,
+            {"hits": 0, "stale_hits": 0, "misses": 0, "not_modified": 0, "errors": 0},
+        )
+        stats[event] += 1
+
+    async def _fetch(
+        self, client: httpx.AsyncClient, path: str, tool: str
+    ) -> CacheEntry:
+        entry = self._entries.get(path)
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        response = await client.get(path, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self._count(tool, "not_modified")
+            entry = entry._replace(fetched_at=time.monotonic())
+        else:
+            response.raise_for_status()
+            entry = CacheEntry(
+                response.json(),
+                time.monotonic(),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _request(
+        self, client: httpx.AsyncClient, path: str, tool: str
+    ) -> asyncio.Future:
+        if path not in self._in_flight:
+            self._in_flight[path] = asyncio.ensure_future(
+                self._fetch(client, path, tool)
+            )
+            self._in_flight[path].add_done_callback(
+                lambda _: self._in_flight.pop(path, None)
+            )
+        return self._in_flight[path]
+
+    async def _revalidate(self, client: httpx.AsyncClient, path: str, tool: str):
+        try:
+            await self._request(client, path, tool)
+        except Exception as e:
+            # The stale entry stays until it expires, the next request tries again
+            self._count(tool, "errors")
+            logger.warning(f"Refreshing {path} failed: {e!r}")
+
+    async def get_json(self, client: httpx.AsyncClient, path: str, tool: str) -> Any:
+        """
+        The JSON body of GET `path`. The caller must not modify it, it is shared by every caller.
+        """
+
+        entry = self._entries.get(path)
+        age = time.monotonic() - entry.fetched_at if entry is not None else None
+
+        if age is not None and age < self.ttl:
+            self._count(tool, "hits")
+            self._entries.move_to_end(path)
+            return entry.data
+
+        if age is not None and age < self.ttl + self.stale_ttl:
+            self._count(tool, "stale_hits")
+            if path not in self._in_flight:
+                task = asyncio.create_task(self._revalidate(client, path, tool))
+                self._revalidations.add(task)
+                task.add_done_callback(self._revalidations.discard)
+            return entry.data
+
+        self._count(tool, "misses")
+        try:
+            # shield: a cancelled tool call must not cancel the request other callers wait on
+            return (await asyncio.shield(self._request(client, path, tool))).data
+        except Exception:
+            self._count(tool, "errors")
+            raise
+
+    def invalidate(self, path: Optional[str] = None):
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path, None)
+
+    async def aclose(self):
+        """
+        Cancel background refreshes, before the client they use is closed.
+        """
+
+        for task in list(self._revalidations):
+            task.cancel()
+        await asyncio.gather(*self._revalidations, return_exceptions=True)
+
+    def stats(self) -> Dict[str, dict]:
+        result = {}
+        for tool, stats in self._stats.items():
+            total = stats["hits"] + stats["stale_hits"] + stats["misses"]
+            result[tool] = {
+                **stats,
+                "hit_rate": (
+                    (stats["hits"] + stats["stale_hits"]) / total if total else 0.0
+                ),
+            }
+        return {"entries": len(self._entries), "tools": result}
+
+
+JOB_CACHE = ResponseCache()
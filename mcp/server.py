@@ -1,17 +1,221 @@
+import os
+import math
+import time
 import httpx
+import random
+import asyncio
+import hashlib
 import logging
-import requests
-from typing import List, Union
-from pydantic import BaseModel, Field
-from mcp.server.fastmcp import FastMCP
-
-mcp = FastMCP("Cogentlabs-Hirestream")
-BASE_URL = "https://cogent-labs.hirestream.io/api/v1"
+import secrets
+import importlib.util
+from job_index import JOB_INDEX
+from response_cache import JOB_CACHE
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel, Field, ValidationError
+from urllib.parse import parse_qsl, urlencode, urlparse
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+BASE_URL = os.getenv("HIRESTREAM_BASE_URL", "https://cogent-labs.hirestream.io/api/v1")
+HTTP_TIMEOUT = httpx.Timeout(
+    float(os.getenv("HIRESTREAM_TIMEOUT_SECONDS", "15")), connect=5.0
+)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=60
+)
+# HTTP/2 needs the optional h2 package (httpx[http2]), otherwise HTTP/1.1 keep-alive
+HTTP2 = importlib.util.find_spec("h2") is not None
+GET_RETRIES = int(os.getenv("HIRESTREAM_GET_RETRIES", "3"))
+RETRY_BACKOFF_SECONDS = 0.5
+MAX_RETRY_BACKOFF_SECONDS = 8.0
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+# upload_resume only reads files below this directory
+RESUME_DIR = os.getenv("RESUME_DIR", os.path.dirname(os.path.abspath(__file__)))
+RESUME_PATH = os.getenv("RESUME_PATH", "testing_resume.pdf")
+UPLOAD_CHUNK_SIZE = 64 * 1024
+PUBLISHED_JOBS_PATH = "/jobs/published-jobs/"
+PAGE_CONCURRENCY = int(os.getenv("HIRESTREAM_PAGE_CONCURRENCY", "4"))
+MAX_SEARCH_RESULTS = 50
+MAX_BULK_APPLICATIONS = 20
+APPLY_CONCURRENCY = int(os.getenv("HIRESTREAM_APPLY_CONCURRENCY", "4"))
+UPLOAD_CACHE_TTL_SECONDS = float(
+    os.getenv("UPLOAD_CACHE_TTL_SECONDS", str(24 * 60 * 60))
+)
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG)
 
 
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Retries idempotent requests on connection errors and on 429/502/503/504, with exponential
+    backoff and jitter. Other requests (e.g. submitting an application) are sent exactly once.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        retries: int = GET_RETRIES,
+        backoff: float = RETRY_BACKOFF_SECONDS,
+    ):
+        self.transport = transport
+        self.retries = retries
+        self.backoff = backoff
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = (
+            response.headers.get("Retry-After", "") if response is not None else ""
+        )
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_BACKOFF_SECONDS)
+        return min(
+            self.backoff * 2**attempt, MAX_RETRY_BACKOFF_SECONDS
+        ) * random.uniform(0.5, 1.0)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in IDEMPOTENT_METHODS:
+            return await self.transport.handle_async_request(request)
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if attempt == self.retries:
+                    raise
+                delay = self._delay(attempt)
+                logger.warning(
+                    f"{request.method} {request.url} failed ({e!r}), retrying in {delay:.2f}s"
+                )
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or attempt == self.retries
+                ):
+                    return response
+                delay = self._delay(attempt, response)
+                await response.aclose()
+                logger.warning(
+                    f"{request.method} {request.url} returned {response.status_code}, retrying in {delay:.2f}s"
+                )
+
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def create_http_client(
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """
+    The pooled Hirestream client. `transport` replaces the network, e.g. with httpx.MockTransport.
+    """
+
+    transport = transport or httpx.AsyncHTTPTransport(http2=HTTP2, limits=HTTP_LIMITS)
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        transport=RetryTransport(transport),
+        timeout=HTTP_TIMEOUT,
+        headers={"Accept": "application/json"},
+    )
+
+
+@dataclass
+class AppContext:
+    http: httpx.AsyncClient
+    # Content hash of an uploaded resume -> (expiry, upload response)
+    uploads: Dict[str, Tuple[float, dict]] = field(default_factory=dict)
+    uploads_in_flight: Dict[str, asyncio.Future] = field(default_factory=dict)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
+    """
+    One client per server process: list -> detail -> requirements -> apply reuse warm connections.
+    """
+
+    async with create_http_client() as http:
+        logger.info(f"Hirestream client ready (http2={HTTP2})")
+        try:
+            yield AppContext(http=http)
+        finally:
+            await JOB_CACHE.aclose()
+            logger.info(f"Job cache stats: {JOB_CACHE.stats()}")
+
+
+def get_http_client(ctx: Context) -> httpx.AsyncClient:
+    return ctx.request_context.lifespan_context.http
+
+
+def resolve_resume_path(path: str) -> str:
+    resume_dir = os.path.realpath(RESUME_DIR)
+    resolved = os.path.realpath(os.path.join(resume_dir, path))
+    if os.path.commonpath([resolved, resume_dir]) != resume_dir:
+        raise ValueError(f"{path} is outside of the resume directory")
+    return resolved
+
+
+async def file_sha256(path: str) -> str:
+    def digest() -> str:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+                sha256.update(block)
+        return sha256.hexdigest()
+
+    return await asyncio.to_thread(digest)
+
+
+def multipart_file_body(
+    path: str, fields: Dict[str, str], content_type: str = "application/pdf"
+) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    """
+    Headers and body of a multipart/form-data upload of `path` as "file", next to `fields`.
+
+    The file is read in chunks off the event loop while it is sent, so neither the whole file
+    is held in memory nor other tool calls wait for the disk. The length is known up front,
+    so the body is sent with a Content-Length rather than chunked.
+    """
+
+    boundary = secrets.token_hex(16)
+    filename = os.path.basename(path).replace('"', "")
+    head = b"".join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    )
+    head += (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        with open(path, "rb") as f:
+            while chunk := await asyncio.to_thread(f.read, UPLOAD_CHUNK_SIZE):
+                yield chunk
+        yield tail
+
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(len(head) + os.path.getsize(path) + len(tail)),
+    }
+    return headers, body()
+
+
+async def _upload_resume(client: httpx.AsyncClient, path: str) -> dict:
+    headers, body = multipart_file_body(path, {"type": "cv"})
+    response = await client.post("/workflows/upload/", content=body, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+mcp = FastMCP("Cogentlabs-Hirestream", lifespan=lifespan)
+
+
 class Job(BaseModel):
     id: int = Field(description="ID of the job")
     uuid: str = Field(description="UUID of the job")
@@ -73,35 +277,181 @@ class ApplyForJob(BaseModel):
     source_value: str = ""
 
 
+class JobFilters(BaseModel):
+    department: Optional[str] = Field(
+        default=None, description="Only jobs whose department contains this text"
+    )
+    location: Optional[str] = Field(
+        default=None, description="Only jobs whose location contains this text"
+    )
+
+
+class JobReference(BaseModel):
+    id: int = Field(description="ID of the job")
+    uuid: str = Field(description="UUID of the job")
+
+
+class ApplicationResult(BaseModel):
+    uuid: str = Field(description="UUID of the job")
+    applied: bool = Field(description="Whether the application was submitted")
+    error: Optional[str] = Field(default=None, description="Why the application failed")
+
+
 class ErrorResponse(BaseModel):
     error: str = Field(description="Error message")
 
 
+def page_paths(
+    path: str, first_page: dict, limit: Optional[int] = None
+) -> Optional[List[str]]:
+    """
+    Paths of the remaining pages of a paginated listing ({"count", "next", "results"}), worked
+    out from the first page so they can be fetched concurrently. Supports page number and
+    limit/offset pagination. Returns None when the `next` link follows neither scheme, or the
+    page has no `count` to work out the last page from.
+    """
+
+    results = first_page.get("results") or []
+    next_url = first_page.get("next")
+    if not next_url or not results:
+        return []
+
+    total = first_page.get("count")
+    if not isinstance(total, int) or isinstance(total, bool):
+        return None
+
+    query = dict(parse_qsl(urlparse(next_url).query))
+    if limit is not None:
+        total = min(total, limit)
+
+    if "page" in query:
+        pages = math.ceil(total / len(results))
+        return [
+            f"{path}?{urlencode({**query, 'page': page})}"
+            for page in range(2, pages + 1)
+        ]
+    if "offset" in query:
+        page_size = int(query.get("limit", len(results)))
+        return [
+            f"{path}?{urlencode({**query, 'offset': offset})}"
+            for offset in range(int(query["offset"]), total, page_size)
+        ]
+    return None
+
+
+def validate_jobs(results: List[dict]) -> Iterator[Job]:
+    for result in results:
+        try:
+            yield Job(**result)
+        except ValidationError as e:
+            logger.warning(f"Skipping invalid job {result.get('uuid')}: {e}")
+
+
+async def iter_published_jobs(
+    client: httpx.AsyncClient, limit: Optional[int] = None
+) -> AsyncIterator[Job]:
+    """
+    Yield every published job in listing order, validating each page as it arrives.
+
+    Once the first page gives the count, the other pages are fetched concurrently (at most
+    PAGE_CONCURRENCY at a time) and only as many as `limit` needs. Pages not reached when the
+    caller stops are cancelled.
+    """
+
+    async def fetch(page_path: str) -> dict:
+        async with semaphore:
+            return await JOB_CACHE.get_json(client, page_path, "get_published_jobs")
+
+    semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+    page = await fetch(PUBLISHED_JOBS_PATH)
+    paths = page_paths(PUBLISHED_JOBS_PATH, page, limit)
+    pages = [asyncio.ensure_future(fetch(path)) for path in paths or []]
+    count = 0
+
+    try:
+        for index in range(len(pages) + 1):
+            if index > 0:
+                page = await pages[index - 1]
+
+            for job in validate_jobs(page.get("results") or []):
+                if limit is not None and count >= limit:
+                    return
+                count += 1
+                yield job
+
+        # Unknown pagination scheme: follow the next links one by one instead
+        next_url = page.get("next") if paths is None else None
+        while next_url and (limit is None or count < limit):
+            page = await fetch(next_url)
+            next_url = page.get("next")
+            for job in validate_jobs(page.get("results") or []):
+                if limit is not None and count >= limit:
+                    return
+                count += 1
+                yield job
+    finally:
+        for pending in pages:
+            pending.cancel()
+
+
 @mcp.tool()
-async def get_published_jobs() -> List[Job] | ErrorResponse:
+async def get_published_jobs(
+    ctx: Context, limit: Optional[int] = None
+) -> List[Job] | ErrorResponse:
     """
     Fetch all published jobs from Hirestream API.
 
+    Args:
+        limit (Optional[int]): Return at most this many jobs. All jobs if not given.
+
     Returns:
         List[Job]: List of job summaries if successful.
         ErrorResponse: Error details if the request fails.
     """
 
+    if limit is not None and limit < 1:
+        return ErrorResponse(error="limit must be at least 1")
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{BASE_URL}/jobs/published-jobs/")
-            data = response.json()
+        return [job async for job in iter_published_jobs(get_http_client(ctx), limit)]
+    except Exception as e:
+        return ErrorResponse(error=f"Unexpected error: {str(e)}")
+
+
+@mcp.tool()
+async def search_jobs(
+    ctx: Context, query: str, filters: Optional[JobFilters] = None, limit: int = 10
+) -> List[Job] | ErrorResponse:
+    """
+    Search published jobs by title, department and location, best matches first.
+    Use it instead of get_published_jobs to find specific jobs.
+
+    Args:
+        query (str): What to look for, e.g. "backend engineer lahore". Typos are tolerated.
+        filters (Optional[JobFilters]): Department and location the jobs must match.
+        limit (int): Maximum number of jobs to return.
+
+    Returns:
+        List[Job]: Matching jobs, best first.
+        ErrorResponse: Error details if the request fails.
+    """
+
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        return ErrorResponse(error=f"limit must be between 1 and {MAX_SEARCH_RESULTS}")
 
-            results = data.get("results", [])
-            jobs = [Job(**job) for job in results]
+    async def load_jobs() -> List[Job]:
+        return [job async for job in iter_published_jobs(client)]
 
-            return jobs
+    try:
+        client = get_http_client(ctx)
+        await JOB_INDEX.refresh(load_jobs)
+        return JOB_INDEX.search(query, filters.model_dump() if filters else None, limit)
     except Exception as e:
         return ErrorResponse(error=f"Unexpected error: {str(e)}")
 
 
 @mcp.tool()
-async def get_published_job_detail(uuid: str) -> Job | ErrorResponse:
+async def get_published_job_detail(uuid: str, ctx: Context) -> Job | ErrorResponse:
     """
     Fetch detailed information of published job.
 
@@ -114,47 +464,120 @@ async def get_published_job_detail(uuid: str) -> Job | ErrorResponse:
     """
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{BASE_URL}/jobs/{uuid}/view-job/")
-            data = response.json()
+        data = await JOB_CACHE.get_json(
+            get_http_client(ctx), f"/jobs/{uuid}/view-job/", "get_published_job_detail"
+        )
 
-            deptartment = data.get("department")
-            if isinstance(deptartment, dict):
-                data["department"] = deptartment.get("title", "")
+        # Copied: the cached response is shared with later calls
+        data = dict(data)
+        deptartment = data.get("department")
+        if isinstance(deptartment, dict):
+            data["department"] = deptartment.get("title", "")
 
-            return JobDetail(**data)
+        return JobDetail(**data)
     except Exception as e:
         return ErrorResponse(error=f"Unexpected error: {str(e)}")
 
 
+@mcp.resource("hirestream://cache-stats", mime_type="application/json")
+def cache_stats() -> dict:
+    """
+    Hit, stale hit and miss counts of the job cache per tool.
+    """
+
+    return JOB_CACHE.stats()
+
+
 @mcp.tool()
-async def upload_resume() -> dict | ErrorResponse:
+async def upload_resume(ctx: Context, path: str = RESUME_PATH) -> dict | ErrorResponse:
     """
-    Upload a resume to the Hirestream.
+    Upload a resume to the Hirestream. A file that was already uploaded is not sent again,
+    the earlier upload is returned instead.
+
+    Args:
+        path (str): Path of the resume PDF, relative to the resume directory.
 
     Returns:
         dict: API response after uploading the resume.
-        ErrorResponse: Error details if download or upload fails.
+        ErrorResponse: Error details if reading or uploading the file fails.
     """
 
     try:
-        resume_path = "testing_resume.pdf"
-        with open(resume_path, "rb") as f:
-            data = {"type": "cv"}
-            files = {"file": (resume_path, f, "application/pdf")}
-
-            response = requests.post(
-                f"{BASE_URL}/workflows/upload/", data=data, files=files
-            )
-
-            data = response.json()
-            return data
+        app = ctx.request_context.lifespan_context
+        resume_path = resolve_resume_path(path)
+        digest = await file_sha256(resume_path)
+
+        cached = app.uploads.get(digest)
+        if cached is not None and cached[0] > time.monotonic():
+            logger.info(f"{path} was already uploaded, reusing the upload")
+            return dict(cached[1])
+
+        # Concurrent uploads of the same file share one request
+        if digest not in app.uploads_in_flight:
+            upload = asyncio.ensure_future(_upload_resume(app.http, resume_path))
+            upload.add_done_callback(lambda _: app.uploads_in_flight.pop(digest, None))
+            app.uploads_in_flight[digest] = upload
+        data = await asyncio.shield(app.uploads_in_flight[digest])
+
+        now = time.monotonic()
+        for key in [key for key, (expiry, _) in app.uploads.items() if expiry <= now]:
+            del app.uploads[key]
+        app.uploads[digest] = (now + UPLOAD_CACHE_TTL_SECONDS, data)
+        return dict(data)
     except Exception as e:
         return ErrorResponse(error=f"Unexpected error: {str(e)}")
 
 
+# Kind of requirement value answering each type of job requirement
+REQUIREMENT_VALUE_TYPES = {"employment": WorkExperience, "education": Education}
+
+
+def map_requirements(payload: ApplyForJob, requirements: List[dict]) -> ApplyForJob:
+    """
+    Copy of `payload` whose requirement values point at the job's requirements. Each value
+    gets the first requirement of its type, values of types the job doesn't ask for are kept.
+    """
+
+    requirement_ids = {}
+    for req in requirements:
+        value_type = REQUIREMENT_VALUE_TYPES.get(req.get("type"))
+        if value_type is not None:
+            requirement_ids.setdefault(value_type, req["id"])
+
+    values = []
+    for value in payload.requirement_values:
+        requirement = requirement_ids.get(type(value), value.requirement)
+        values.append(value.model_copy(update={"requirement": requirement}))
+    return payload.model_copy(update={"requirement_values": values})
+
+
+async def _apply_for_job(
+    client: httpx.AsyncClient, payload: ApplyForJob, uuid: str
+) -> Optional[ErrorResponse]:
+    try:
+        # Requirement schemas rarely change, they are cached per job like the job details
+        data = await JOB_CACHE.get_json(
+            client, f"/jobs/{uuid}/view-job-requirements/", "apply_for_job"
+        )
+    except httpx.HTTPStatusError as e:
+        return ErrorResponse(error=f"Failed to apply for a job: {e.response.text}")
+
+    payload = map_requirements(payload, data.get("requirements", []))
+    logger.info(f"Applying with detail =>: {payload.model_dump()}")
+
+    response = await client.post(
+        "/workflows/job-applications/", json=payload.model_dump()
+    )
+    if response.status_code != 200:
+        return ErrorResponse(error=f"Failed to apply for a job: {response.text}")
+
+    return None
+
+
 @mcp.tool()
-async def apply_for_job(payload: ApplyForJob, uuid: str) -> None | ErrorResponse:
+async def apply_for_job(
+    payload: ApplyForJob, uuid: str, ctx: Context
+) -> None | ErrorResponse:
     """
     Apply for a user requested job on Hirestream.
 
@@ -168,41 +591,51 @@ async def apply_for_job(payload: ApplyForJob, uuid: str) -> None | ErrorResponse
     """
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{BASE_URL}/jobs/{uuid}/view-job-requirements/"
-            )
-            if response.status_code != 200:
-                return ErrorResponse(
-                    error=f"Failed to apply for a job: {response.text}"
-                )
+        return await _apply_for_job(get_http_client(ctx), payload, uuid)
+    except Exception as e:
+        return ErrorResponse(error=f"Unexpected error: {str(e)}")
+
+
+@mcp.tool()
+async def apply_for_jobs(
+    payload: ApplyForJob, jobs: List[JobReference], ctx: Context
+) -> List[ApplicationResult] | ErrorResponse:
+    """
+    Apply one candidate to several jobs on Hirestream at once. Prefer it over calling
+    apply_for_job once per job.
 
-            data = response.json()
-            requirements = data.get("requirements", [])
+    Args:
+        payload (ApplyForJob): Application data, its `job` is replaced by each job's ID.
+        jobs (List[JobReference]): ID and UUID of every job to apply for.
 
-            for req in requirements:
-                for idx, value in enumerate(payload.requirement_values):
-                    if req["type"] == "employment" and isinstance(
-                        value, WorkExperience
-                    ):
-                        payload.requirement_values[idx].requirement = req["id"]
+    Returns:
+        List[ApplicationResult]: Outcome of each application, in the order of `jobs`.
+        ErrorResponse: Error details if the request is invalid.
+    """
 
-                    elif req["type"] == "education" and isinstance(value, Education):
-                        payload.requirement_values[idx].requirement = req["id"]
+    if not 1 <= len(jobs) <= MAX_BULK_APPLICATIONS:
+        return ErrorResponse(
+            error=f"Between 1 and {MAX_BULK_APPLICATIONS} jobs can be applied for at once"
+        )
 
-            logger.info(f"Applying with detail =>: {payload.model_dump()}")
+    client = get_http_client(ctx)
+    semaphore = asyncio.Semaphore(APPLY_CONCURRENCY)
 
-            response = await client.post(
-                f"{BASE_URL}/workflows/job-applications/", json=payload.model_dump()
-            )
-            if response.status_code != 200:
-                return ErrorResponse(
-                    error=f"Failed to apply for a job: {response.text}"
+    async def apply(job: JobReference) -> ApplicationResult:
+        async with semaphore:
+            try:
+                error = await _apply_for_job(
+                    client, payload.model_copy(update={"job": job.id}), job.uuid
                 )
+            except Exception as e:
+                error = ErrorResponse(error=f"Unexpected error: {str(e)}")
 
-            return None
-    except Exception as e:
-        return ErrorResponse(error=f"Unexpected error: {str(e)}")
+        if error is not None:
+            logger.warning(f"Applying for {job.uuid} failed: {error.error}")
+            return ApplicationResult(uuid=job.uuid, applied=False, error=error.error)
+        return ApplicationResult(uuid=job.uuid, applied=True)
+
+    return list(await asyncio.gather(*(apply(job) for job in jobs)))
 
 
 if __name__ == "__main__":
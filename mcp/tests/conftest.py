@@ -0,0 +1,22 @@
+import pytest
+import server
+from job_index import JobIndex
+from response_cache import ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def job_cache(monkeypatch):
+    """A fresh job cache per test, the server's one lives as long as the process."""
+
+    cache = ResponseCache()
+    monkeypatch.setattr(server, "JOB_CACHE", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def job_index(monkeypatch):
+    """A fresh, empty search index per test."""
+
+    index = JobIndex()
+    monkeypatch.setattr(server, "JOB_INDEX", index)
+    return index
@@ -0,0 +1,148 @@
+import json
+import httpx
+import pytest
+import server
+import asyncio
+from mcp.shared.memory import create_connected_server_and_client_session
+
+REQUIREMENTS = {
+    "requirements": [
+        {"id": 10, "type": "employment"},
+        {"id": 11, "type": "education"},
+        {"id": 12, "type": "employment"},
+        {"id": 13, "type": "portfolio"},
+    ]
+}
+PAYLOAD = {
+    "candidate": {
+        "first_name": "Ali",
+        "last_name": "Khan",
+        "email": "ali@example.com",
+        "phone": "0300",
+        "address": "Street 1",
+        "city": "Lahore",
+        "gender": "male",
+        "linkedin": "https://linkedin.com/in/ali",
+        "skills": [{"id": 1, "title": "Python"}],
+    },
+    "job": 0,
+    "cv": "https://files.example.com/resume.pdf",
+    "requirement_values": [
+        {
+            "requirement": 0,
+            "employer": "Cogent Labs",
+            "title": "Engineer",
+            "start": "2020",
+            "end": "2024",
+        },
+        {
+            "requirement": 0,
+            "school": "LUMS",
+            "major": "CS",
+            "start": "2016",
+            "end": "2020",
+        },
+    ],
+}
+
+
+class HirestreamApi:
+    """Mocked requirement and application endpoints, rejecting applications to job 3."""
+
+    def __init__(self):
+        self.requirement_requests = 0
+        self.applications = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/view-job-requirements/"):
+            self.requirement_requests += 1
+            return httpx.Response(200, json=REQUIREMENTS)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+
+        application = json.loads(request.content)
+        self.applications.append(application)
+        if application["job"] == 3:
+            return httpx.Response(400, text="Job is closed")
+        return httpx.Response(200, json={})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handler), base_url=server.BASE_URL
+        )
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = HirestreamApi()
+    monkeypatch.setattr(server, "create_http_client", api.client)
+    return api
+
+
+class TestMapRequirements:
+    """Requirement values are matched to the job's requirements by type."""
+
+    def test_first_requirement_of_each_type_is_used(self):
+        """Work experience gets the first employment requirement, not the last."""
+
+        payload = server.ApplyForJob(**PAYLOAD)
+        mapped = server.map_requirements(payload, REQUIREMENTS["requirements"])
+
+        assert [value.requirement for value in mapped.requirement_values] == [10, 11]
+        assert [value.requirement for value in payload.requirement_values] == [0, 0]
+
+
+class TestApplyForJobs:
+    """Applying one candidate to many jobs."""
+
+    @pytest.mark.asyncio
+    async def test_requirements_are_cached(self, api):
+        """Applying twice to a job fetches its requirements once."""
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            for _ in range(2):
+                result = await session.call_tool(
+                    "apply_for_job", {"payload": PAYLOAD, "uuid": "job-1"}
+                )
+                assert not result.isError
+
+        assert api.requirement_requests == 1
+        assert api.applications[0]["requirement_values"][0]["requirement"] == 10
+
+    @pytest.mark.asyncio
+    async def test_bulk_apply_reports_each_job(self, api, monkeypatch):
+        """Applications run concurrently up to the cap, a failure doesn't stop the others."""
+
+        monkeypatch.setattr(server, "APPLY_CONCURRENCY", 3)
+        jobs = [{"id": i, "uuid": f"job-{i}"} for i in range(1, 11)]
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            result = await session.call_tool(
+                "apply_for_jobs", {"payload": PAYLOAD, "jobs": jobs}
+            )
+
+        results = result.structuredContent["result"]
+        assert [r["uuid"] for r in results] == [job["uuid"] for job in jobs]
+        assert [r["applied"] for r in results].count(False) == 1
+        assert "Job is closed" in results[2]["error"]
+        assert sorted(a["job"] for a in api.applications) == list(range(1, 11))
+        assert api.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_too_many_jobs(self, api):
+        """More jobs than the cap is an error and nothing is submitted."""
+
+        jobs = [{"id": i, "uuid": f"job-{i}"} for i in range(50)]
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            result = await session.call_tool(
+                "apply_for_jobs", {"payload": PAYLOAD, "jobs": jobs}
+            )
+
+        assert "Between 1 and 20 jobs" in result.content[0].text
+        assert api.applications == []
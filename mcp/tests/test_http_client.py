@@ -0,0 +1,99 @@
+import httpx
+import pytest
+import server
+from mcp.shared.memory import create_connected_server_and_client_session
+
+JOB = {
+    "id": 1,
+    "uuid": "job-1",
+    "title": "Backend Engineer",
+    "department": {"title": "Engineering"},
+    "location": "Lahore",
+    "description": "Build APIs",
+    "organization_name": "Cogent Labs",
+}
+
+
+def _mock_transport(requests, responses=None):
+    """MockTransport answering from `responses` (status codes, in order), then with jobs."""
+
+    responses = list(responses or [])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if responses:
+            return httpx.Response(responses.pop(0))
+        if request.url.path.endswith("/view-job/"):
+            return httpx.Response(200, json=JOB)
+        return httpx.Response(
+            200, json={"count": 1, "results": [{**JOB, "department": "Engineering"}]}
+        )
+
+    return httpx.MockTransport(handler)
+
+
+class TestRetryTransport:
+    """Retries of idempotent requests."""
+
+    @pytest.mark.asyncio
+    async def test_get_is_retried(self):
+        """A GET answered with 503 is retried until it succeeds."""
+
+        requests = []
+        transport = server.RetryTransport(
+            _mock_transport(requests, [503, 503]), retries=3, backoff=0
+        )
+        async with httpx.AsyncClient(
+            transport=transport, base_url=server.BASE_URL
+        ) as client:
+            response = await client.get("/jobs/published-jobs/")
+
+        assert response.status_code == 200
+        assert len(requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried(self):
+        """A POST is sent once, whatever the response."""
+
+        requests = []
+        transport = server.RetryTransport(
+            _mock_transport(requests, [503]), retries=3, backoff=0
+        )
+        async with httpx.AsyncClient(
+            transport=transport, base_url=server.BASE_URL
+        ) as client:
+            response = await client.post("/workflows/job-applications/", json={})
+
+        assert response.status_code == 503
+        assert len(requests) == 1
+
+
+class TestLifespanClient:
+    """The tools share the client created in the server lifespan."""
+
+    @pytest.mark.asyncio
+    async def test_tools_share_one_client(self, monkeypatch):
+        """Listing and detail calls go through a single pooled client."""
+
+        requests, clients = [], []
+        create_http_client = server.create_http_client
+
+        def create_mock_client():
+            clients.append(create_http_client(_mock_transport(requests)))
+            return clients[-1]
+
+        monkeypatch.setattr(server, "create_http_client", create_mock_client)
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            jobs = await session.call_tool("get_published_jobs", {})
+            detail = await session.call_tool(
+                "get_published_job_detail", {"uuid": "job-1"}
+            )
+
+        assert not jobs.isError and not detail.isError
+        assert "Backend Engineer" in detail.content[0].text
+        assert len(clients) == 1 and clients[0].is_closed
+        assert [request.url.path for request in requests] == [
+            "/api/v1/jobs/published-jobs/",
+            "/api/v1/jobs/job-1/view-job/",
+        ]
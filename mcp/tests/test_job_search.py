@@ -0,0 +1,108 @@
+import pytest
+import server
+from job_index import JobIndex
+from test_pagination import PaginatedApi
+from mcp.shared.memory import create_connected_server_and_client_session
+
+JOBS = [
+    {
+        "id": 1,
+        "uuid": "job-1",
+        "title": "Backend Engineer",
+        "department": "Engineering",
+        "location": "Lahore",
+    },
+    {
+        "id": 2,
+        "uuid": "job-2",
+        "title": "Frontend Engineer",
+        "department": "Engineering",
+        "location": "Lahore",
+    },
+    {
+        "id": 3,
+        "uuid": "job-3",
+        "title": "Backend Developer",
+        "department": "Engineering",
+        "location": "Karachi",
+    },
+    {
+        "id": 4,
+        "uuid": "job-4",
+        "title": "Sales Manager",
+        "department": "Sales",
+        "location": "Lahore",
+    },
+    {
+        "id": 5,
+        "uuid": "job-5",
+        "title": "Data Scientist",
+        "department": "Research",
+        "location": "Islamabad",
+    },
+]
+
+
+@pytest.fixture
+def index():
+    index = JobIndex()
+    index.build([server.Job(**job) for job in JOBS])
+    return index
+
+
+class TestJobIndex:
+    """Ranked matching over title, department and location."""
+
+    def test_jobs_matching_every_word_rank_first(self, index):
+        """Backend roles in Lahore come before backend roles elsewhere and other Lahore roles."""
+
+        ids = [job.id for job in index.search("backend roles in Lahore")]
+
+        assert ids[:2] == [1, 3]
+        assert set(ids[2:]) == {2, 4}
+
+    def test_prefix_and_typo_match(self, index):
+        """ "dev" matches developer and "scientst" matches scientist."""
+
+        assert [job.id for job in index.search("dev")] == [3]
+        assert [job.id for job in index.search("data scientst")] == [5]
+
+    def test_filters_and_limit(self, index):
+        """Filters drop non-matching jobs before ranking, the limit caps the result."""
+
+        jobs = index.search("engineer", {"location": "lahore", "department": None})
+        assert [job.id for job in jobs] == [1, 2]
+        assert len(index.search("", {"department": "engineering"}, limit=2)) == 2
+
+
+class TestSearchTool:
+    """The search_jobs tool over the published listing."""
+
+    @pytest.mark.asyncio
+    async def test_index_is_built_once_per_ttl(self, monkeypatch):
+        """Searches within the TTL reuse the index instead of reading the listing again."""
+
+        api = PaginatedApi("page", JOBS)
+        monkeypatch.setattr(server, "create_http_client", api.client)
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            first = await session.call_tool("search_jobs", {"query": "backend lahore"})
+            second = await session.call_tool(
+                "search_jobs",
+                {"query": "engineer", "filters": {"location": "Karachi"}, "limit": 5},
+            )
+
+        assert first.structuredContent["result"][0]["uuid"] == "job-1"
+        assert [job["id"] for job in second.structuredContent["result"]] == [3]
+        assert len(api.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_out_of_range(self):
+        """A limit above the cap is an error."""
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            result = await session.call_tool(
+                "search_jobs", {"query": "engineer", "limit": 500}
+            )
+
+        assert "limit must be between 1 and 50" in result.content[0].text
@@ -0,0 +1,153 @@
+import httpx
+import pytest
+import server
+import asyncio
+from urllib.parse import parse_qs
+from mcp.shared.memory import create_connected_server_and_client_session
+
+JOBS = [
+    {
+        "id": i,
+        "uuid": f"job-{i}",
+        "title": f"Engineer {i}",
+        "department": "Engineering",
+        "location": "Lahore",
+    }
+    for i in range(95)
+]
+PAGE_SIZE = 10
+
+
+class PaginatedApi:
+    """Mocked /jobs/published-jobs/ paginated by page number, limit/offset or cursor."""
+
+    def __init__(self, scheme: str, jobs: list = JOBS, with_count: bool = True):
+        self.scheme = scheme
+        self.jobs = jobs
+        self.with_count = with_count
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _page(self, query: dict) -> dict:
+        if self.scheme == "page":
+            start = (int(query.get("page", 1)) - 1) * PAGE_SIZE
+            next_query = f"page={start // PAGE_SIZE + 2}"
+        elif self.scheme == "offset":
+            start = int(query.get("offset", 0))
+            next_query = f"limit={PAGE_SIZE}&offset={start + PAGE_SIZE}"
+        else:
+            start = int(query.get("cursor", 0))
+            next_query = f"cursor={start + PAGE_SIZE}"
+
+        more = start + PAGE_SIZE < len(self.jobs)
+        page = {
+            "next": (
+                f"{server.BASE_URL}/jobs/published-jobs/?{next_query}" if more else None
+            ),
+            "results": self.jobs[start : start + PAGE_SIZE],
+        }
+        if self.with_count:
+            page["count"] = len(self.jobs)
+        return page
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        query = {
+            key: values[0]
+            for key, values in parse_qs(request.url.query.decode()).items()
+        }
+        return httpx.Response(200, json=self._page(query))
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handler), base_url=server.BASE_URL
+        )
+
+
+class TestPagination:
+    """Every page of the job listing is read."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheme", ["page", "offset", "cursor"])
+    async def test_all_pages_are_read_in_order(self, scheme):
+        """All 95 jobs come back in listing order, whatever the pagination scheme."""
+
+        api = PaginatedApi(scheme)
+        jobs = [job async for job in server.iter_published_jobs(api.client())]
+
+        assert [job.id for job in jobs] == list(range(95))
+        assert len(api.requests) == 10
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scheme", ["page", "offset"])
+    async def test_listing_without_count_follows_next_links(self, scheme):
+        """Without a count the last page is unknown, so the next links are followed instead."""
+
+        api = PaginatedApi(scheme, with_count=False)
+        jobs = [job async for job in server.iter_published_jobs(api.client())]
+
+        assert [job.id for job in jobs] == list(range(95))
+        assert len(api.requests) == 10
+
+    def test_page_paths_without_count(self):
+        """A missing or non-integer count means the remaining pages can't be listed up front."""
+
+        first_page = {
+            "next": "/jobs/published-jobs/?page=2",
+            "results": JOBS[:PAGE_SIZE],
+        }
+
+        assert server.page_paths("/jobs/published-jobs/", first_page) is None
+        assert (
+            server.page_paths("/jobs/published-jobs/", {**first_page, "count": "95"})
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_pages_are_fetched_concurrently(self, monkeypatch):
+        """After the first page, pages are fetched in parallel up to the cap."""
+
+        monkeypatch.setattr(server, "PAGE_CONCURRENCY", 3)
+        api = PaginatedApi("page")
+        jobs = [job async for job in server.iter_published_jobs(api.client())]
+
+        assert len(jobs) == 95
+        assert api.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_limit_fetches_only_needed_pages(self):
+        """A limit of 15 reads two pages."""
+
+        api = PaginatedApi("page")
+        jobs = [job async for job in server.iter_published_jobs(api.client(), 15)]
+
+        assert [job.id for job in jobs] == list(range(15))
+        assert len(api.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_jobs_are_skipped(self):
+        """A job failing validation is left out instead of failing the listing."""
+
+        jobs = JOBS[:3] + [{"id": 3, "uuid": "job-3"}] + JOBS[4:]
+        api = PaginatedApi("page", jobs)
+        jobs = [job async for job in server.iter_published_jobs(api.client())]
+
+        assert len(jobs) == 94 and 3 not in [job.id for job in jobs]
+
+    @pytest.mark.asyncio
+    async def test_tool_limit(self, monkeypatch):
+        """The tool passes its limit through."""
+
+        api = PaginatedApi("page")
+        monkeypatch.setattr(server, "create_http_client", api.client)
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            result = await session.call_tool("get_published_jobs", {"limit": 12})
+
+        assert len(result.structuredContent["result"]) == 12
@@ -0,0 +1,108 @@
+import json
+import httpx
+import pytest
+import server
+import asyncio
+from response_cache import ResponseCache
+from mcp.shared.memory import create_connected_server_and_client_session
+
+JOB = {
+    "id": 1,
+    "uuid": "job-1",
+    "title": "Backend Engineer",
+    "department": {"title": "Engineering"},
+    "location": "Lahore",
+    "description": "Build APIs",
+    "organization_name": "Cogent Labs",
+}
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def client(requests):
+    """Client of a mocked API that sends an ETag and answers 304 when it matches."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=JOB, headers={"ETag": '"v1"'})
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url=server.BASE_URL
+    )
+
+
+class TestResponseCache:
+    """Stale-while-revalidate caching of job responses."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_from_memory(self, client, requests):
+        """A fresh entry answers without a request."""
+
+        cache = ResponseCache(ttl=60, stale_ttl=60)
+        first = await cache.get_json(client, "/jobs/job-1/view-job/", "detail")
+        second = await cache.get_json(client, "/jobs/job-1/view-job/", "detail")
+
+        assert first == second == JOB
+        assert len(requests) == 1
+        assert cache.stats()["tools"]["detail"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated_in_background(self, client, requests):
+        """A stale entry is returned at once and refreshed with a conditional request."""
+
+        cache = ResponseCache(ttl=0, stale_ttl=60)
+        await cache.get_json(client, "/jobs/job-1/view-job/", "detail")
+        stale = await cache.get_json(client, "/jobs/job-1/view-job/", "detail")
+        await asyncio.sleep(0.01)
+
+        stats = cache.stats()["tools"]["detail"]
+        assert stale == JOB
+        assert len(requests) == 2
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert stats["stale_hits"] == 1 and stats["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_request(self, client, requests):
+        """Callers missing the same path at once wait on a single request."""
+
+        cache = ResponseCache()
+        results = await asyncio.gather(
+            *(
+                cache.get_json(client, "/jobs/job-1/view-job/", "detail")
+                for _ in range(5)
+            )
+        )
+
+        assert results == [JOB] * 5
+        assert len(requests) == 1
+
+
+class TestCachedTools:
+    """The job tools read through the cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_detail_lookups_hit_the_cache(
+        self, client, requests, monkeypatch
+    ):
+        """Repeated detail lookups send one request and show up in the cache stats."""
+
+        monkeypatch.setattr(server, "create_http_client", lambda: client)
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            for _ in range(3):
+                result = await session.call_tool(
+                    "get_published_job_detail", {"uuid": "job-1"}
+                )
+                assert json.loads(result.content[0].text)["department"] == "Engineering"
+
+            stats = await session.read_resource("hirestream://cache-stats")
+
+        tool_stats = json.loads(stats.contents[0].text)["tools"]
+        assert len(requests) == 1
+        assert tool_stats["get_published_job_detail"]["hits"] == 2
@@ -0,0 +1,87 @@
+import json
+import time
+import httpx
+import pytest
+import server
+import asyncio
+from mcp.shared.memory import create_connected_server_and_client_session
+
+UPLOAD = {"url": "https://files.example.com/resume.pdf"}
+
+
+@pytest.fixture
+def resume_dir(tmp_path, monkeypatch):
+    """Resume directory holding a 300 KB resume.pdf."""
+
+    (tmp_path / "resume.pdf").write_bytes(b"%PDF-1.4\n" + bytes(range(256)) * 1200)
+    monkeypatch.setattr(server, "RESUME_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Uploads received by the mocked Hirestream API, which answers each after 0.2s."""
+
+    received = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/workflows/upload/"):
+            await asyncio.sleep(0.2)
+            received.append(await request.aread())
+            assert int(request.headers["Content-Length"]) == len(received[-1])
+            return httpx.Response(200, json=UPLOAD)
+        return httpx.Response(200, json={"count": 0, "results": []})
+
+    create_http_client = server.create_http_client
+    monkeypatch.setattr(
+        server,
+        "create_http_client",
+        lambda: create_http_client(httpx.MockTransport(handler)),
+    )
+    return received
+
+
+class TestUploadResume:
+    """Streaming upload of a resume from disk."""
+
+    @pytest.mark.asyncio
+    async def test_upload_is_deduplicated(self, resume_dir, uploads):
+        """The file is streamed once, uploading it again returns the cached upload."""
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            first = await session.call_tool("upload_resume", {"path": "resume.pdf"})
+            second = await session.call_tool("upload_resume", {"path": "resume.pdf"})
+
+        assert json.loads(first.content[0].text) == UPLOAD
+        assert json.loads(second.content[0].text) == UPLOAD
+        assert len(uploads) == 1
+        assert (resume_dir / "resume.pdf").read_bytes() in uploads[0]
+        assert b'name="type"\r\n\r\ncv\r\n' in uploads[0]
+
+    @pytest.mark.asyncio
+    async def test_other_tools_run_during_upload(self, resume_dir, uploads):
+        """A tool call made during an upload doesn't wait for it."""
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            finished = {}
+
+            async def call(name, arguments):
+                await session.call_tool(name, arguments)
+                finished[name] = time.perf_counter()
+
+            await asyncio.gather(
+                call("upload_resume", {"path": "resume.pdf"}),
+                call("get_published_jobs", {}),
+            )
+
+        assert finished["get_published_jobs"] < finished["upload_resume"]
+
+    @pytest.mark.asyncio
+    async def test_path_outside_resume_dir_is_rejected(self, resume_dir, uploads):
+        """Only files below the resume directory can be uploaded."""
+
+        async with create_connected_server_and_client_session(server.mcp) as session:
+            result = await session.call_tool("upload_resume", {"path": "../secret.pdf"})
+
+        assert "outside of the resume directory" in result.content[0].text
+        assert uploads == []
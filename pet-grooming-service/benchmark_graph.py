@@ -0,0 +1,71 @@
+"""
+Offline benchmark of the lead graph: a fake chat model with fixed latency and an in-memory
+stand-in for the Google Sheet, so the numbers show the overhead of the graph itself and runs on
+different commits can be compared.
+
+    python benchmark_graph.py --sessions 64 --concurrency 8 --model-latency 0.05 --service-latency 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import types
+
+# Nothing below reaches a provider, the key only has to pass the import-time check
+os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+# google_sheet authorizes against Google at import time, replace it before the nodes import it
+sheet = types.ModuleType("google_sheet")
+sheet.latency = 0.0
+sheet.rows = []
+
+
+def append_row(sheet_name: str, new_row: list):
+    time.sleep(sheet.latency)
+    sheet.rows.append((sheet_name, new_row))
+
+
+sheet.append_row = append_row
+sys.modules["google_sheet"] = sheet
+
+import nodes
+import paths
+from graph import graph
+from models import QualifyLead
+from prompts import qualify_lead_prompt
+from langchain_core.runnables import RunnableLambda
+from common.benchmark_harness import LatencyFakeChatModel, benchmark, benchmark_parser
+
+BREEDS = ["golden retriever", "poodle", "shih tzu", "labrador", "persian cat", "beagle"]
+
+
+def fake_reply(prompt: str) -> str:
+    breed = next((breed for breed in BREEDS if breed in prompt), BREEDS[0])
+    return json.dumps({
+        "customer": {"name": "Sara", "phone": "0300-1234567", "city": "Lahore"},
+        "pet": {"breed": breed, "weight": "12kg", "age": 3, "coat": "long", "notes": "nervous around dryers"},
+    })
+
+
+def install_fakes(args):
+    model = LatencyFakeChatModel(reply=fake_reply, latency=args.model_latency, token_latency=args.token_latency)
+    nodes.QUALIFY_LEAD_CHAIN = qualify_lead_prompt | model | RunnableLambda(lambda message: QualifyLead.model_validate_json(message.content))
+    sheet.latency = args.service_latency
+
+
+def run_session(i: int):
+    query = f"Hi, I'm Sara from Lahore, 0300-1234567. My 3 year old {BREEDS[i % len(BREEDS)]} needs a full groom."
+    state = graph.invoke({"query": query})
+    assert state["qualify_lead"] is not None, state
+
+
+if __name__ == "__main__":
+    parser = benchmark_parser("Offline benchmark of the pet grooming lead graph.")
+    parser.add_argument("--service-latency", type=float, default=0.1, help="latency of the stand-in Google Sheet")
+    args = parser.parse_args()
+
+    install_fakes(args)
+    report = benchmark("pet_grooming", args, run_session)
+    report["sheet_rows"] = len(sheet.rows)
+    print(json.dumps(report, indent=2))
@@ -1,16 +1,23 @@
+import paths
 from models import GlobalState
+from common.instrumentation import instrument
 from nodes import initiate_lead, qualify_lead
 from langgraph.graph import StateGraph, START, END
 
 
-graph = StateGraph(GlobalState)
+graph_builder = StateGraph(GlobalState)
 
-graph.add_node("initiate_lead", initiate_lead)
-graph.add_node("qualify_lead", qualify_lead)
+graph_builder.add_node("initiate_lead", initiate_lead)
+graph_builder.add_node("qualify_lead", qualify_lead)
 
-graph.add_edge(START, "initiate_lead")
-graph.add_edge("initiate_lead", "qualify_lead")
-graph.add_edge("qualify_lead", END)
+graph_builder.add_edge(START, "initiate_lead")
+graph_builder.add_edge("initiate_lead", "qualify_lead")
+graph_builder.add_edge("qualify_lead", END)
 
-query = input("What you want to ask?")
-graph.invoke({"query": query})
+graph = instrument(graph_builder.compile(), "pet_grooming")
+
+
+if __name__ == "__main__":
+    query = input("What you want to ask?")
+    result = graph.invoke({"query": query})
+    print(result["qualify_lead"])
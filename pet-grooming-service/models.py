@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -22,4 +23,4 @@ class QualifyLead(BaseModel):
 
 class GlobalState(BaseModel):
     query: str
-    qualify_lead: QualifyLead
+    qualify_lead: Optional[QualifyLead] = None
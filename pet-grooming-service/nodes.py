@@ -8,7 +8,7 @@ from chains import QUALIFY_LEAD_CHAIN
 
 def initiate_lead(state: GlobalState):
     lead_id = "LEAD" + uuid.uuid4().hex[:6].upper()
-    created_at = datetime.now().isoformat()
+    created_at = datetime.datetime.now().isoformat()
 
     new_row = [
         lead_id,
@@ -26,8 +26,7 @@ def initiate_lead(state: GlobalState):
 
 
 def qualify_lead(state: GlobalState):
-    result = QUALIFY_LEAD_CHAIN.invoke({"query": state.query})
-    print(result)
+    state.qualify_lead = QUALIFY_LEAD_CHAIN.invoke({"query": state.query})
 
     # Update status to LeadStatus.QUALIFIED
     return state
@@ -0,0 +1,102 @@
+"""
+Run the offline graph benchmarks of every app and merge their reports into one JSON document,
+tagged with the current commit so results can be compared across commits.
+
+    python run_benchmarks.py --sessions 64 --concurrency 8 --output benchmarks/$(git rev-parse --short HEAD).json
+    python run_benchmarks.py --compare benchmarks/base.json
+
+Each app runs in its own process from its own directory: the apps share module names (main,
+nodes, ...), and a separate process gives each app its own peak memory figure. No network
+access or API keys are needed.
+"""
+
+import os
+import sys
+import json
+import platform
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APPS = {
+    "pdf_rag": "Day_3",
+    "travel_planner": "Day_4",
+    "pet_grooming": "pet-grooming-service",
+}
+SHARED_OPTIONS = ["sessions", "concurrency", "warmup", "model_latency", "token_latency", "embedding_latency"]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_app(app: str, options: list) -> dict:
+    process = subprocess.run(
+        [sys.executable, "benchmark_graph.py", *options],
+        cwd=os.path.join(ROOT, APPS[app]),
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{app} benchmark failed:\n{process.stderr}")
+    return json.loads(process.stdout)
+
+
+def compare(current: dict, baseline: dict):
+    """
+    Print throughput and per-node p95 of `current` relative to `baseline`.
+    """
+
+    print(f"baseline {baseline['commit'][:10]} -> current {current['commit'][:10]}", file=sys.stderr)
+    for app, report in current["apps"].items():
+        base = baseline["apps"].get(app)
+        if base is None:
+            continue
+
+        ratio = report["sessions_per_s"] / base["sessions_per_s"]
+        print(f"{app}: {report['sessions_per_s']:.2f} sessions/s ({ratio - 1:+.1%})", file=sys.stderr)
+        for node, summary in report["nodes"].items():
+            base_summary = base["nodes"].get(node)
+            if base_summary and base_summary["p95"]:
+                change = summary["p95"] / base_summary["p95"] - 1
+                print(f"    {node}: p95 {summary['p95'] * 1000:.1f}ms ({change:+.1%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks of every graph.")
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--model-latency", type=float, default=0.05)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--embedding-latency", type=float, default=0.01)
+    parser.add_argument("--output", help="also write the report to this file")
+    parser.add_argument("--compare", help="report of an earlier run to compare against")
+    args = parser.parse_args()
+
+    options = []
+    for option in SHARED_OPTIONS:
+        options += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "apps": {app: run_app(app, options) for app in args.apps},
+    }
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+    print(json.dumps(report, indent=2))